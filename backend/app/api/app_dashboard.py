@@ -3,70 +3,192 @@ API endpoints for App Dashboard feature.
 Manages app templates and executes commands for dashboard blocks.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.routing import ORJSONRoute, json_body, json_body_openapi
 from app.api.deps import get_current_user, get_current_admin_user
-from app.models import User, Tab, AppTemplate, BUILTIN_TEMPLATES
+from app.models import (
+    User, Tab, AppTemplate, BUILTIN_TEMPLATE_SLUGS, get_builtin_templates, get_builtin_template_bytes,
+    get_builtin_template_etag,
+)
+from app.models.app_template import template_etag, template_list_etag
 from app.schemas.app_dashboard import (
-    AppTemplateResponse, AppTemplateListItem, AppTemplateCreate, AppTemplateUpdate,
+    AppTemplateResponse, AppTemplateListItem, AppTemplateListPage, AppTemplateCreate, AppTemplateUpdate,
     ExecuteCommandRequest, ExecuteActionRequest, CommandResultResponse,
-    BlockDataRequest, BlockDataResponse, CreateAppDashboardTab, UpdateAppDashboardTab,
-    AppDashboardContent, DashboardBlock
+    BlockDataRequest, BlockDataBatchRequest, BlockDataResponse, CreateAppDashboardTab, UpdateAppDashboardTab,
+    AppDashboardContent, DashboardBlock, DASHBOARD_BLOCKS, validate_block_configs,
+    get_dashboard_schemas_json,
+)
+from app.services.command_executor import (
+    CommandExecutor, CommandResult, CommandResultCache, command_result_cache, execute_dashboard_command,
 )
-from app.services.command_executor import CommandExecutor, execute_dashboard_command
+from app.services.cache_service import cache_service
+from app.services.http_block_fetcher import fetch_http_block
+from app.services.template_service import (
+    query_templates, query_template_list, record_template_download, get_pending_template_downloads,
+    validate_builtin_templates
+)
+
+logger = logging.getLogger(__name__)
+
+# Block data / command requests carry whole blocks and variables: bodies are parsed with orjson
+router = APIRouter(prefix="/app-dashboard", tags=["App Dashboard"], route_class=ORJSONRoute)
 
-router = APIRouter(prefix="/app-dashboard", tags=["App Dashboard"])
+# Commands of a batch run concurrently over one SSH connection, one channel each;
+# stay under sshd's MaxSessions (10 by default)
+MAX_CONCURRENT_BLOCK_COMMANDS = 8
+
+
+@router.get("/schema")
+async def get_dashboard_schema(current_user: User = Depends(get_current_user)):
+    """JSON Schemas of the template/block definition models (computed once per process)."""
+    return Response(content=get_dashboard_schemas_json(), media_type="application/json")
 
 
 # ============== Templates ==============
 
-@router.get("/templates", response_model=List[AppTemplateListItem])
+@router.get("/templates", response_model=AppTemplateListPage)
 async def list_templates(
+    request: Request,
+    response: Response,
+    block_type: Optional[str] = Query(None, description="Only templates containing a block of this type"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (all templates if omitted)"),
+    cursor: Optional[int] = Query(None, description="Keyset cursor: next_cursor of the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    List all available app templates.
+    List all available app templates, newest first.
     Includes built-in and community templates.
+    Pagination is keyset-based on the template id, which never changes, so pages
+    neither skip nor repeat rows while download counts move (no OFFSET either).
+    Supports If-None-Match (304), checked against an aggregate before loading the rows.
     """
     # Ensure built-in templates exist in database
     await ensure_builtin_templates(db)
 
-    templates = db.query(AppTemplate).filter(
-        (AppTemplate.is_public == True) | (AppTemplate.is_builtin == True)
-    ).all()
+    filters = [(AppTemplate.is_public == True) | (AppTemplate.is_builtin == True)]
+    if block_type:
+        filters.append(AppTemplate.has_block_type(block_type))
+    if cursor is not None:
+        filters.append(AppTemplate.id < cursor)
+
+    # Add downloads counted in Redis but not flushed yet
+    pending = await get_pending_template_downloads()
+
+    count, max_id, last_updated_at, downloads = db.query(
+        func.count(AppTemplate.id), func.max(AppTemplate.id),
+        func.max(AppTemplate.updated_at), func.sum(AppTemplate.downloads),
+    ).filter(*filters).one()
+    etag = template_list_etag(count, max_id, last_updated_at, downloads, pending)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    query = query_template_list(db).filter(*filters).order_by(AppTemplate.id.desc())
+    if limit:
+        query = query.limit(limit)
 
-    return templates
+    items = []
+    for template in query.all():
+        item = AppTemplateListItem.model_validate(template)
+        item.downloads += pending.get(template.id, 0)
+        items.append(item)
+
+    next_cursor = items[-1].id if limit and len(items) == limit else None
+    return AppTemplateListPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/templates/builtin/{slug}")
+async def get_builtin_template_definition(
+    slug: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the raw definition of a built-in template.
+    Served from pre-serialized bytes, without touching the database. Supports If-None-Match (304).
+    """
+    if slug not in BUILTIN_TEMPLATE_SLUGS:
+        raise HTTPException(status_code=404, detail="Template not found")
+    etag = get_builtin_template_etag(slug)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(
+        content=get_builtin_template_bytes(slug),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/templates/{template_id}", response_model=AppTemplateResponse)
 async def get_template(
     template_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a specific template by ID."""
-    template = db.query(AppTemplate).filter(AppTemplate.id == template_id).first()
-    if not template:
+    """Get a specific template by ID. Supports If-None-Match (304)."""
+    row = db.query(AppTemplate.content_hash, AppTemplate.updated_at).filter(
+        AppTemplate.id == template_id
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Template not found")
+
+    etag = template_etag(row.content_hash, row.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    template = query_templates(db).filter(AppTemplate.id == template_id).first()
+    response.headers["ETag"] = etag
     return template
 
 
 @router.get("/templates/by-slug/{slug}", response_model=AppTemplateResponse)
 async def get_template_by_slug(
     slug: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a specific template by slug."""
-    template = db.query(AppTemplate).filter(AppTemplate.slug == slug).first()
-    if not template:
+    """
+    Get a specific template by slug. Supports If-None-Match (304).
+    Cached in Redis under (slug, updated_at), so only the version is read from the DB on a hit.
+    The download count isn't part of the cached blob: it's read live on every request.
+    """
+    row = db.query(
+        AppTemplate.id, AppTemplate.content_hash, AppTemplate.updated_at, AppTemplate.downloads
+    ).filter(AppTemplate.slug_filter(slug)).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Template not found")
-    return template
+
+    etag = template_etag(row.content_hash, row.updated_at)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    version = int(row.updated_at.timestamp() * 1_000_000) if row.updated_at else 0
+    data = await cache_service.get_app_template(slug, version)
+    if not data:
+        template = query_templates(db).filter(AppTemplate.slug_filter(slug)).first()
+        data = AppTemplateResponse.model_validate(template).model_dump(mode="json", exclude={"downloads"})
+        await cache_service.set_app_template(slug, version, data)
+
+    # Add downloads counted in Redis but not flushed yet
+    pending = await get_pending_template_downloads()
+    return {**data, "downloads": (row.downloads or 0) + pending.get(row.id, 0)}
 
 
 @router.post("/templates", response_model=AppTemplateResponse)
@@ -76,8 +198,17 @@ async def create_template(
     current_user: User = Depends(get_current_admin_user),
 ):
     """Create a new app template (admin only)."""
+    # The body is already an AppTemplateCreate: only the block configs are left to check
+    blocks = DASHBOARD_BLOCKS.dump_python(template_data.blocks)
+    try:
+        validate_block_configs(blocks)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
     # Check if slug exists
-    existing = db.query(AppTemplate).filter(AppTemplate.slug == template_data.slug).first()
+    existing = template_data.slug in BUILTIN_TEMPLATE_SLUGS or db.query(AppTemplate.id).filter(
+        AppTemplate.slug_filter(template_data.slug)
+    ).first()
     if existing:
         raise HTTPException(status_code=400, detail="Template with this slug already exists")
 
@@ -89,7 +220,7 @@ async def create_template(
         version=template_data.version,
         author=template_data.author or current_user.username,
         config_schema=template_data.config_schema,
-        blocks=[block.model_dump() for block in template_data.blocks],
+        blocks=blocks,
         is_public=template_data.is_public,
         is_builtin=False,
         is_community=True,
@@ -117,9 +248,8 @@ async def update_template(
     if template.is_builtin:
         raise HTTPException(status_code=400, detail="Cannot modify built-in templates")
 
+    # model_dump() already turns the blocks into plain dicts
     update_data = template_data.model_dump(exclude_unset=True)
-    if "blocks" in update_data and update_data["blocks"]:
-        update_data["blocks"] = [b.model_dump() if hasattr(b, 'model_dump') else b for b in update_data["blocks"]]
 
     for key, value in update_data.items():
         setattr(template, key, value)
@@ -127,6 +257,8 @@ async def update_template(
     db.commit()
     db.refresh(template)
 
+    await cache_service.invalidate_app_template(template.slug)
+
     return template
 
 
@@ -144,19 +276,25 @@ async def delete_template(
     if template.is_builtin:
         raise HTTPException(status_code=400, detail="Cannot delete built-in templates")
 
+    slug = template.slug
     db.delete(template)
     db.commit()
 
+    await cache_service.invalidate_app_template(slug)
+
     return {"message": "Template deleted"}
 
 
 # ============== Command Execution ==============
 
-@router.post("/execute", response_model=CommandResultResponse)
+@router.post(
+    "/execute", response_model=CommandResultResponse,
+    openapi_extra=json_body_openapi(ExecuteCommandRequest),
+)
 async def execute_command(
-    request: ExecuteCommandRequest,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    request: ExecuteCommandRequest = Depends(json_body(ExecuteCommandRequest)),
+    db: Session = Depends(get_db),
 ):
     """
     Execute a command on a server.
@@ -170,6 +308,8 @@ async def execute_command(
         parser=request.parser,
         row=request.row,
     )
+    # Row actions may change what the server's blocks show
+    command_result_cache.invalidate_server(request.server_id)
 
     return CommandResultResponse(
         success=result.success,
@@ -179,11 +319,14 @@ async def execute_command(
     )
 
 
-@router.post("/execute-action", response_model=CommandResultResponse)
+@router.post(
+    "/execute-action", response_model=CommandResultResponse,
+    openapi_extra=json_body_openapi(ExecuteActionRequest),
+)
 async def execute_action(
-    request: ExecuteActionRequest,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    request: ExecuteActionRequest = Depends(json_body(ExecuteActionRequest)),
+    db: Session = Depends(get_db),
 ):
     """
     Execute an action button command.
@@ -206,6 +349,7 @@ async def execute_action(
         variables=variables,
         parser="raw",
     )
+    command_result_cache.invalidate_server(request.server_id)
 
     return CommandResultResponse(
         success=result.success,
@@ -215,49 +359,139 @@ async def execute_action(
     )
 
 
-@router.post("/block-data", response_model=BlockDataResponse)
-async def fetch_block_data(
-    request: BlockDataRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+async def _fetch_block(
+    block: DashboardBlock,
+    server_id: int,
+    variables: dict,
+    run_command,
+    fetched_at: datetime,
+) -> BlockDataResponse:
     """
-    Fetch data for a specific dashboard block.
-    Executes the block's command and returns parsed data.
+    Fetch one block's data.
+    `run_command(command, parser)` executes shell commands, so callers decide
+    how the SSH connection is obtained. `fetched_at` is the request's timestamp,
+    shared by all the blocks of a batch.
+    Successful command results are reused for half the block's refresh interval.
     """
-    from datetime import datetime
-
-    block = request.block
     config = block.config
 
     command = config.get("command", "")
+    http_config = config.get("http")
     parser = config.get("parser", "raw")
 
-    if not command:
+    if http_config:
+        # Fetched in-process, without going through the server's shell
+        result = await fetch_http_block(
+            http_config, variables, parser,
+            cache_ttl=config.get("refresh_interval", 30),
+        )
+    elif command:
+        cache_key = CommandResultCache.make_key(server_id, command, parser, variables)
+        result = command_result_cache.get(cache_key)
+        if result is None:
+            result = await run_command(command, parser)
+            if result.success:
+                command_result_cache.set(cache_key, result, config.get("refresh_interval", 30) / 2)
+    else:
         return BlockDataResponse(
             block_id=block.id,
             success=False,
             error="Block has no command configured",
-            fetched_at=datetime.now(),
+            fetched_at=fetched_at,
         )
 
-    result = await execute_dashboard_command(
-        db=db,
-        server_id=request.server_id,
-        command=command,
-        variables=request.variables,
-        parser=parser,
-    )
-
     return BlockDataResponse(
         block_id=block.id,
         success=result.success,
         data=result.output,
         error=result.error,
-        fetched_at=datetime.now(),
+        fetched_at=fetched_at,
     )
 
 
+@router.post(
+    "/block-data", response_model=BlockDataResponse,
+    openapi_extra=json_body_openapi(BlockDataRequest),
+)
+async def fetch_block_data(
+    current_user: User = Depends(get_current_user),
+    request: BlockDataRequest = Depends(json_body(BlockDataRequest)),
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch data for a specific dashboard block.
+    Executes the block's command and returns parsed data.
+    """
+    async def run_command(command: str, parser: str):
+        return await execute_dashboard_command(
+            db=db,
+            server_id=request.server_id,
+            command=command,
+            variables=request.variables,
+            parser=parser,
+        )
+
+    return await _fetch_block(request.block, request.server_id, request.variables, run_command, datetime.now())
+
+
+@router.post(
+    "/block-data/batch", response_model=List[BlockDataResponse],
+    openapi_extra=json_body_openapi(BlockDataBatchRequest),
+)
+async def fetch_block_data_batch(
+    current_user: User = Depends(get_current_user),
+    request: BlockDataBatchRequest = Depends(json_body(BlockDataBatchRequest)),
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch data for several blocks of a dashboard in one call.
+    Blocks run concurrently; command blocks share a single SSH connection
+    instead of opening one each (none when all their results are cached), with at
+    most MAX_CONCURRENT_BLOCK_COMMANDS commands in flight on it.
+    Results are in the same order as the blocks; a failing block gets an error response.
+    """
+    # Opened by the first command block missing the result cache, then shared
+    executor_task = None
+    command_slots = asyncio.Semaphore(MAX_CONCURRENT_BLOCK_COMMANDS)
+
+    async def run_command(command: str, parser: str):
+        nonlocal executor_task
+        if executor_task is None:
+            executor_task = asyncio.ensure_future(CommandExecutor.from_server(db, request.server_id))
+        executor = await executor_task
+        if executor is None:
+            return CommandResult(
+                success=False,
+                output=None,
+                raw_output="",
+                error=f"Server {request.server_id} not found",
+                exit_code=-1,
+            )
+        async with command_slots:
+            return await executor.execute(command, request.variables, None, parser)
+
+    fetched_at = datetime.now()
+
+    async def fetch(block: DashboardBlock) -> BlockDataResponse:
+        # A failing block is reported in its own response, the others are still returned
+        try:
+            return await _fetch_block(block, request.server_id, request.variables, run_command, fetched_at)
+        except Exception as e:
+            logger.warning(f"Block {block.id} fetch failed on server {request.server_id}: {e}")
+            return BlockDataResponse(block_id=block.id, success=False, error=str(e), fetched_at=fetched_at)
+
+    try:
+        return await asyncio.gather(*(fetch(block) for block in request.blocks))
+    finally:
+        if executor_task is not None:
+            try:
+                executor = await executor_task
+            except Exception:
+                executor = None  # Connection failure, already reported by the blocks
+            if executor is not None:
+                await executor.close()
+
+
 # ============== Dashboard Tabs ==============
 
 @router.post("/tabs", response_model=dict)
@@ -281,14 +515,14 @@ async def create_app_dashboard_tab(
 
     # Get template blocks if template specified
     blocks = []
+    template = None
     if request.template_id:
         template = db.query(AppTemplate).filter(AppTemplate.id == request.template_id).first()
-        if template:
-            blocks = template.blocks
     elif request.template_slug:
-        template = db.query(AppTemplate).filter(AppTemplate.slug == request.template_slug).first()
-        if template:
-            blocks = template.blocks
+        template = db.query(AppTemplate).filter(AppTemplate.slug_filter(request.template_slug)).first()
+    if template:
+        blocks = template.blocks
+        await record_template_download(db, template)
 
     # Create tab content
     content = AppDashboardContent(
@@ -360,7 +594,7 @@ async def update_app_dashboard_tab(
     if request.variables is not None:
         content["variables"] = request.variables
     if request.blocks is not None:
-        content["blocks"] = [b.model_dump() if hasattr(b, 'model_dump') else b for b in request.blocks]
+        content["blocks"] = DASHBOARD_BLOCKS.dump_python(request.blocks)
     if request.layout is not None:
         content["layout"] = request.layout
 
@@ -406,7 +640,7 @@ async def get_app_dashboard_config(
         if template:
             content["blocks"] = template.blocks
     elif template_slug:
-        template = db.query(AppTemplate).filter(AppTemplate.slug == template_slug).first()
+        template = db.query(AppTemplate).filter(AppTemplate.slug_filter(template_slug)).first()
         if template:
             content["blocks"] = template.blocks
 
@@ -452,7 +686,7 @@ async def sync_tab_from_template(
     if template_id:
         template = db.query(AppTemplate).filter(AppTemplate.id == template_id).first()
     elif template_slug:
-        template = db.query(AppTemplate).filter(AppTemplate.slug == template_slug).first()
+        template = db.query(AppTemplate).filter(AppTemplate.slug_filter(template_slug)).first()
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found for this tab")
@@ -473,9 +707,10 @@ async def sync_tab_from_template(
 
 async def ensure_builtin_templates(db: Session):
     """Ensure built-in templates exist in the database and are up to date."""
-    for template_data in BUILTIN_TEMPLATES:
+    validate_builtin_templates()
+    for template_data in get_builtin_templates():
         existing = db.query(AppTemplate).filter(
-            AppTemplate.slug == template_data["slug"]
+            AppTemplate.slug_filter(template_data["slug"], is_builtin=True)
         ).first()
 
         if existing:
@@ -9,8 +9,9 @@ from sqlalchemy.orm import Session, joinedload
 from app.core.database import get_db
 from app.models import Application, Category
 from app.schemas import (
-    ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationWithCategory
+    ApplicationCreate, ApplicationUpdate, ApplicationResponse, ApplicationWithCategory, CategoryResponse
 )
+from app.schemas.base import construct_from_orm
 from app.api.deps import get_current_user, get_current_admin_user
 from app.services.npm_sync import sync_all_npm_instances
 from app.services.http_fingerprint import fingerprint_url, get_icon_url as fingerprint_get_icon_url, get_online_database_stats
@@ -20,6 +21,12 @@ from app.models import User
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
+def _application_with_category(app: Application) -> ApplicationWithCategory:
+    """Response for a loaded application row (with its joined category), without revalidation."""
+    category = construct_from_orm(CategoryResponse, app.category) if app.category else None
+    return construct_from_orm(ApplicationWithCategory, app, category=category)
+
+
 @router.get("", response_model=List[ApplicationWithCategory])
 async def list_applications(
     category: Optional[str] = Query(None, description="Filter by category slug"),
@@ -37,7 +44,7 @@ async def list_applications(
         query = query.join(Category).filter(Category.slug == category)
 
     applications = query.order_by(Application.display_order, Application.name).all()
-    return applications
+    return [_application_with_category(app) for app in applications]
 
 
 @router.get("/{app_id}", response_model=ApplicationWithCategory)
@@ -57,7 +64,7 @@ async def get_application(
             detail="Application non trouvée"
         )
 
-    return app
+    return _application_with_category(app)
 
 
 @router.post("", response_model=ApplicationResponse)
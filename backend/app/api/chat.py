@@ -22,6 +22,7 @@ from app.services.ollama_chat import (
 )
 from app.services.web_search import get_web_search_service
 from app.core.config import settings
+from app.schemas.base import ORM_CONFIG
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -598,8 +599,7 @@ class ConversationResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class ConversationListItem(BaseModel):
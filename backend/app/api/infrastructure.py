@@ -11,6 +11,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.database import get_db
 from app.models import Application, NpmInstance, Backend, User, SchemaLayout
@@ -19,7 +20,9 @@ from app.schemas.infrastructure import (
     ApplicationInSchema, NpmInstanceInSchema, InfrastructureSchema,
     SaveLayoutRequest, SaveLayoutResponse
 )
+from app.schemas.base import construct_from_orm
 from app.api.deps import get_current_user
+from app.services.cache_service import cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -84,9 +87,15 @@ def sync_backends_to_db(db: Session, detected_backends: Dict[str, Dict[str, Any]
     """
     result = []
 
+    # Load the known backends in one query instead of one per hostname
+    existing = {
+        backend.hostname: backend
+        for backend in db.query(Backend).filter(Backend.hostname.in_(list(detected_backends)))
+    }
+
     for hostname, info in detected_backends.items():
         # Check if backend exists
-        backend = db.query(Backend).filter(Backend.hostname == hostname).first()
+        backend = existing.get(hostname)
 
         if not backend:
             # Create new backend
@@ -110,19 +119,31 @@ def sync_backends_to_db(db: Session, detected_backends: Dict[str, Dict[str, Any]
     return result
 
 
-def get_saved_positions(db: Session, user_id: int) -> Dict[str, Dict[int, tuple]]:
+async def get_saved_positions(db: Session, user_id: int) -> Dict[str, Dict[int, tuple]]:
     """
-    Get all saved positions from the database.
+    Get all saved positions (read through the Redis cache).
     Returns a dict like: {'npm': {1: (x, y)}, 'backend': {2: (x, y)}, 'app': {3: (x, y)}}
     """
-    layouts = db.query(SchemaLayout).filter(
+    cached = await cache_service.get_schema_layout(user_id)
+    if cached is not None:
+        # JSON turned node ids into strings and tuples into lists
+        return {
+            node_type: {int(node_id): tuple(pos) for node_id, pos in nodes.items()}
+            for node_type, nodes in cached.items()
+        }
+
+    layouts = db.query(
+        SchemaLayout.node_type, SchemaLayout.node_id, SchemaLayout.position_x, SchemaLayout.position_y
+    ).filter(
         (SchemaLayout.user_id == user_id) | (SchemaLayout.user_id == None)
-    ).all()
+    ).order_by(SchemaLayout.user_id.nullsfirst()).all()
 
+    # Shared (user-less) positions come first, so the user's own ones override them
     positions: Dict[str, Dict[int, tuple]] = {'npm': {}, 'backend': {}, 'app': {}}
     for layout in layouts:
         positions[layout.node_type][layout.node_id] = (layout.position_x, layout.position_y)
 
+    await cache_service.set_schema_layout(user_id, positions)
     return positions
 
 
@@ -136,7 +157,7 @@ async def get_infrastructure_schema(
     Shows NPM instances, backends, and applications relationships.
     """
     # Get saved positions
-    saved_positions = get_saved_positions(db, current_user.id)
+    saved_positions = await get_saved_positions(db, current_user.id)
 
     # Get all active NPM instances
     npm_instances = db.query(NpmInstance).filter(
@@ -158,16 +179,20 @@ async def get_infrastructure_schema(
     # Extract backends from applications
     detected_backends = extract_backends_from_applications(db)
 
-    # Sync to database
+    # Sync to database, then reload the backends in one query (the commit expired them)
     sync_backends_to_db(db, detected_backends)
+    backends_by_host = {
+        backend.hostname: backend
+        for backend in db.query(Backend).filter(Backend.hostname.in_(list(detected_backends)))
+    }
 
     # Build response with applications grouped by backend
     backends_response: List[BackendWithApps] = []
     links: Dict[int, List[str]] = defaultdict(list)
 
     for hostname, info in detected_backends.items():
-        # Get backend from DB for metadata
-        backend = db.query(Backend).filter(Backend.hostname == hostname).first()
+        # Backend from DB for metadata
+        backend = backends_by_host.get(hostname)
 
         # Build apps list with saved positions
         apps_list = []
@@ -245,7 +270,7 @@ async def list_backends(
 ):
     """List all detected backends."""
     backends = db.query(Backend).order_by(Backend.hostname).all()
-    return backends
+    return [construct_from_orm(BackendResponse, backend) for backend in backends]
 
 
 @router.patch("/backends/{backend_id}", response_model=BackendResponse)
@@ -322,35 +347,33 @@ async def save_layout(
     Save the positions of all nodes in the schema.
     This allows users to customize their infrastructure layout.
     """
-    saved_count = 0
-
-    for pos in data.positions:
-        # Find existing layout or create new
-        layout = db.query(SchemaLayout).filter(
-            SchemaLayout.node_type == pos.node_type,
-            SchemaLayout.node_id == pos.node_id,
-            (SchemaLayout.user_id == current_user.id) | (SchemaLayout.user_id == None)
-        ).first()
-
-        if layout:
-            # Update existing
-            layout.position_x = pos.position_x
-            layout.position_y = pos.position_y
-            layout.user_id = current_user.id
-        else:
-            # Create new
-            layout = SchemaLayout(
-                node_type=pos.node_type,
-                node_id=pos.node_id,
-                position_x=pos.position_x,
-                position_y=pos.position_y,
-                user_id=current_user.id
-            )
-            db.add(layout)
-
-        saved_count += 1
-
-    db.commit()
+    # One row per node (the last position wins if a node is sent twice)
+    rows = {
+        (pos.node_type, pos.node_id): {
+            "user_id": current_user.id,
+            "node_type": pos.node_type,
+            "node_id": pos.node_id,
+            "position_x": pos.position_x,
+            "position_y": pos.position_y,
+        }
+        for pos in data.positions
+    }
+    saved_count = len(rows)
+
+    if rows:
+        # Upsert the user's own rows; shared (user-less) positions are never taken over
+        stmt = insert(SchemaLayout).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SchemaLayout.user_id, SchemaLayout.node_type, SchemaLayout.node_id],
+            set_={
+                "position_x": stmt.excluded.position_x,
+                "position_y": stmt.excluded.position_y,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+    await cache_service.invalidate_schema_layout(current_user.id)
 
     return SaveLayoutResponse(
         saved_count=saved_count,
@@ -371,6 +394,7 @@ async def reset_layout(
     ).delete()
 
     db.commit()
+    await cache_service.invalidate_schema_layout(current_user.id)
 
     return {
         "message": f"{deleted} position(s) supprimée(s)",
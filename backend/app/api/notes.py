@@ -15,6 +15,7 @@ from app.models.user import User
 from app.models.widget import Widget
 from app.models.note import Note
 from app.services.notes_service import NotesService, NextcloudNotesService
+from app.schemas.base import ORM_CONFIG
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
@@ -53,8 +54,7 @@ class NoteResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class NotesCountResponse(BaseModel):
@@ -5,7 +5,7 @@ API endpoints for notifications and alerts.
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
@@ -24,7 +24,7 @@ from app.schemas.notification import (
     AlertResponse, AlertListItem, AlertAcknowledge, AlertResolve,
     NotificationLogResponse, NotificationStats,
     SMTPConfig, TelegramConfig, TestNotificationRequest, TestNotificationResponse,
-    RULE_TYPE_INFO, RuleTypeInfo
+    RULE_TYPE_INFO, RuleTypeInfo, get_rule_types_json
 )
 from app.services.notification_service import NotificationService
 
@@ -189,11 +189,8 @@ async def list_rules(
 async def list_rule_types(
     current_user: User = Depends(get_current_user),
 ):
-    """List available alert rule types."""
-    return [
-        RuleTypeInfo(key=key, **info)
-        for key, info in RULE_TYPE_INFO.items()
-    ]
+    """List available alert rule types (pre-serialized)."""
+    return Response(content=get_rule_types_json(), media_type="application/json")
 
 
 @router.post("/rules", response_model=AlertRuleResponse, status_code=status.HTTP_201_CREATED)
@@ -456,8 +453,19 @@ async def list_notification_logs(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List notification logs for the current user."""
-    query = db.query(NotificationLog).filter(
+    """List notification logs for the current user (rows of the response columns, no ORM instances)."""
+    query = db.query(
+        NotificationLog.id,
+        NotificationLog.channel_id,
+        NotificationLog.alert_id,
+        NotificationLog.channel_type,
+        NotificationLog.recipient,
+        NotificationLog.title,
+        NotificationLog.message,
+        NotificationLog.success,
+        NotificationLog.error_message,
+        NotificationLog.sent_at,
+    ).filter(
         NotificationLog.user_id == current_user.id
     )
 
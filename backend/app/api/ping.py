@@ -12,7 +12,7 @@ from pydantic import BaseModel
 from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models import User, Widget, PingHistory
-from app.services.ping_service import PingService, PingHistoryService, PingResult
+from app.services.ping_service import PingService, PingHistoryService, PingResult, ping_schedule
 
 router = APIRouter(prefix="/ping", tags=["ping"])
 
@@ -179,6 +179,7 @@ async def get_widget_ping_data(
     names_str = config.get("target_names", "")
     history_hours = config.get("history_hours", 24)
     ping_count = config.get("ping_count", 5)
+    ping_interval = config.get("ping_interval", 60)
     ping_timeout = config.get("ping_timeout", 5)
 
     # Parse targets
@@ -194,23 +195,35 @@ async def get_widget_ping_data(
         name = names[i] if i < len(names) and names[i] else target
         target_list.append({"target": target, "name": name})
 
-    # Perform fresh pings
     ping_service = PingService()
     history_service = PingHistoryService(db)
 
+    # Forget targets removed from the widget config
+    ping_schedule.prune(widget_id, targets)
+
+    # Measure the targets whose adaptive interval has elapsed, concurrently,
+    # and save all new measurements with a single insert
+    current = {
+        item["target"]: ping_schedule.get_fresh((item["target"], widget_id), ping_interval)
+        for item in target_list
+    }
+    due = [target for target, result in current.items() if result is None]
+    if due:
+        measured = await ping_service.ping_multiple(due, count=ping_count, timeout=ping_timeout)
+        history_service.record_results(
+            measured,
+            {item["target"]: item["name"] for item in target_list},
+            widget_id,
+        )
+        for result in measured:
+            ping_schedule.record((result.target, widget_id), result)
+            current[result.target] = result
+
     results = []
     for item in target_list:
         target = item["target"]
         name = item["name"]
-
-        # Perform ping and record
-        result = await history_service.perform_and_record_ping(
-            target=target,
-            target_name=name,
-            widget_id=widget_id,
-            count=ping_count,
-            timeout=ping_timeout,
-        )
+        result = current[target]
 
         # Get history
         history = history_service.get_history(
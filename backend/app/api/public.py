@@ -3,6 +3,7 @@ Public API routes - No authentication required.
 Provides read-only access to public data for integrations.
 """
 
+from collections import Counter
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session, joinedload
@@ -11,6 +12,7 @@ from pydantic import BaseModel
 
 from app.core.database import get_db
 from app.models import Application, Category, Server, Backend, NpmInstance, Widget
+from app.schemas.base import ORM_CONFIG
 
 router = APIRouter(prefix="/public", tags=["Public API"])
 
@@ -30,8 +32,7 @@ class PublicApplicationResponse(BaseModel):
     forward_host: Optional[str] = None
     forward_port: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class PublicCategoryResponse(BaseModel):
@@ -43,8 +44,7 @@ class PublicCategoryResponse(BaseModel):
     order: int
     app_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class InfraNodeResponse(BaseModel):
@@ -300,6 +300,10 @@ async def get_infrastructure_map(
     # Build links: NPM -> Backend (based on forward_host matching)
     backend_hosts = {b.hostname.lower(): b.id for b in backends}
     backend_ips = {b.ip_address: b.id for b in backends if b.ip_address}
+    host_app_counts = Counter(
+        (app.npm_instance_id, app.forward_host.lower()) for app in applications if app.forward_host
+    )
+    existing_links = {(l.source, l.target) for l in links}
 
     for app in applications:
         npm_node_id = f"npm-{app.npm_instance_id}"
@@ -317,16 +321,14 @@ async def get_infrastructure_map(
             backend_node_id = f"backend-{backend_id}"
             # Avoid duplicate links
             link_key = (npm_node_id, backend_node_id)
-            existing_links = {(l.source, l.target) for l in links}
             if link_key not in existing_links:
+                existing_links.add(link_key)
                 links.append(InfraLinkResponse(
                     source=npm_node_id,
                     target=backend_node_id,
                     type="proxy",
                     metadata={
-                        "app_count": len([a for a in applications
-                                         if a.npm_instance_id == app.npm_instance_id
-                                         and a.forward_host and a.forward_host.lower() == forward_host])
+                        "app_count": host_app_counts[(app.npm_instance_id, forward_host)]
                     }
                 ))
 
@@ -2,7 +2,8 @@
 RSS API endpoints for managing RSS feeds and articles.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
@@ -11,8 +12,8 @@ from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.widget import Widget
-from app.models.rss_article import RssArticle
 from app.services.rss_service import RssService
+from app.schemas.base import ORM_CONFIG
 
 router = APIRouter(prefix="/rss", tags=["rss"])
 
@@ -45,8 +46,7 @@ class ArticleResponse(BaseModel):
     read_at: Optional[str]
     is_archived: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class FetchResponse(BaseModel):
@@ -151,31 +151,16 @@ async def get_widget_articles(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get articles for a widget."""
+    """
+    Get articles for a widget.
+    Articles are trusted DB rows: serialized by orjson without ArticleResponse validation.
+    """
     if include_archived:
         articles = RssService.get_archived_articles(db, widget_id, limit, offset)
     else:
         articles = RssService.get_unread_articles(db, widget_id, limit)
 
-    return [
-        ArticleResponse(
-            id=a.id,
-            widget_id=a.widget_id,
-            feed_url=a.feed_url,
-            article_guid=a.article_guid,
-            article_url=a.article_url,
-            title=a.title,
-            summary=a.summary,
-            author=a.author,
-            image_url=a.image_url,
-            published_at=a.published_at.isoformat() if a.published_at else None,
-            fetched_at=a.fetched_at.isoformat() if a.fetched_at else None,
-            is_read=a.is_read,
-            read_at=a.read_at.isoformat() if a.read_at else None,
-            is_archived=a.is_archived
-        )
-        for a in articles
-    ]
+    return Response(orjson.dumps(articles), media_type="application/json")
 
 
 @router.get("/widget/{widget_id}/count", response_model=CountResponse)
@@ -195,8 +180,7 @@ async def mark_article_read(
     current_user: User = Depends(get_current_user)
 ):
     """Mark an article as read and archive it."""
-    article = RssService.mark_as_read(db, article_id)
-    if not article:
+    if not RssService.mark_as_read(db, article_id):
         raise HTTPException(status_code=404, detail="Article not found")
 
     return {"success": True, "article_id": article_id}
@@ -270,13 +254,13 @@ async def get_widget_data(
     # Get counts
     counts = RssService.get_article_count(db, widget_id)
 
-    return {
+    return Response(orjson.dumps({
         "widget_id": widget_id,
         "widget_type": "rss_feed",
         "data": {
-            "articles": [a.to_dict() for a in articles],
+            "articles": articles,
             "counts": counts,
             "fetch_stats": fetch_stats,
             "feed_urls": feed_urls
         }
-    }
+    }), media_type="application/json")
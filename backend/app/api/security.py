@@ -9,7 +9,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, UploadFile, File
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, undefer
 from sqlalchemy import func, and_
 
 from app.core.database import get_db
@@ -47,7 +47,9 @@ async def list_audit_logs(
     current_user: User = Depends(get_current_admin_user),
 ):
     """List audit logs (admin only)."""
-    query = db.query(AuditLog).join(User, AuditLog.user_id == User.id, isouter=True)
+    query = db.query(AuditLog).join(User, AuditLog.user_id == User.id, isouter=True).options(
+        joinedload(AuditLog.user_agent_string)
+    )
 
     if user_id:
         query = query.filter(AuditLog.user_id == user_id)
@@ -246,7 +248,8 @@ async def export_config(
 
     # Export applications
     if config.include_applications:
-        apps = db.query(Application).all()
+        # Categories loaded with the applications (only their slug is exported)
+        apps = db.query(Application).options(joinedload(Application.category)).all()
         data["applications"] = [
             {
                 "name": a.name,
@@ -299,7 +302,7 @@ async def export_config(
 
     # Export tabs
     if config.include_tabs:
-        tabs = db.query(Tab).filter(Tab.owner_id == current_user.id).all()
+        tabs = db.query(Tab).options(undefer(Tab.content)).filter(Tab.owner_id == current_user.id).all()
         data["tabs"] = [
             {
                 "name": t.name,
@@ -363,10 +366,10 @@ async def export_config(
         data["notification_channels"] = [
             {
                 "name": c.name,
-                "channel_type": c.channel_type.value,
+                "channel_type": c.channel_type,
                 "is_enabled": c.is_enabled,
                 "is_default": c.is_default,
-                "min_severity": c.min_severity.value,
+                "min_severity": c.min_severity,
                 # Note: Config may contain sensitive data, export carefully
                 "config": {k: v for k, v in (c.config or {}).items() if k not in ["bot_token", "password"]},
             }
@@ -384,7 +387,7 @@ async def export_config(
                 "is_enabled": r.is_enabled,
                 "rule_type": r.rule_type,
                 "source_config": r.source_config,
-                "severity": r.severity.value,
+                "severity": r.severity,
                 "cooldown_minutes": r.cooldown_minutes,
                 "title_template": r.title_template,
                 "message_template": r.message_template,
@@ -12,6 +12,7 @@ import asyncssh
 from app.core.database import get_db
 from app.models import Server
 from app.schemas import ServerCreate, ServerUpdate, ServerResponse, ServerTestResult
+from app.schemas.base import construct_from_orm
 from app.api.deps import get_current_admin_user
 
 router = APIRouter(prefix="/servers", tags=["Servers"])
@@ -88,7 +89,7 @@ async def list_servers(
 ):
     """List all servers (admin only)."""
     servers = db.query(Server).order_by(Server.name).all()
-    return servers
+    return [construct_from_orm(ServerResponse, server) for server in servers]
 
 
 @router.post("", response_model=ServerResponse)
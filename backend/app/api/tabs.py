@@ -11,7 +11,7 @@ Tab visibility rules:
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defaultload, joinedload, raiseload, undefer
 from sqlalchemy import or_, and_
 import re
 
@@ -166,7 +166,7 @@ async def list_tabs(
 
     # Build query for visible tabs (system tabs + user tabs + subscribed tabs)
     if subscribed_ids:
-        tabs = db.query(Tab).filter(
+        tabs = db.query(Tab).options(undefer(Tab.content), raiseload('*')).filter(
             Tab.is_visible == True,
             or_(
                 Tab.tab_type.in_(["default", "infrastructure", "chat"]),
@@ -176,7 +176,7 @@ async def list_tabs(
             )
         ).order_by(Tab.position).all()
     else:
-        tabs = db.query(Tab).filter(
+        tabs = db.query(Tab).options(undefer(Tab.content), raiseload('*')).filter(
             Tab.is_visible == True,
             or_(
                 Tab.tab_type.in_(["default", "infrastructure", "chat"]),
@@ -199,11 +199,11 @@ async def list_all_tabs(
     Regular user: sees their own tabs + subscribed tabs + default tabs
     """
     if current_user.is_admin:
-        tabs = db.query(Tab).order_by(Tab.position).all()
+        tabs = db.query(Tab).options(undefer(Tab.content), raiseload('*')).order_by(Tab.position).all()
     else:
         subscribed_ids = get_user_subscribed_tab_ids(db, current_user.id)
         if subscribed_ids:
-            tabs = db.query(Tab).filter(
+            tabs = db.query(Tab).options(undefer(Tab.content), raiseload('*')).filter(
                 or_(
                     Tab.tab_type == "default",
                     Tab.owner_id == None,
@@ -212,7 +212,7 @@ async def list_all_tabs(
                 )
             ).order_by(Tab.position).all()
         else:
-            tabs = db.query(Tab).filter(
+            tabs = db.query(Tab).options(undefer(Tab.content), raiseload('*')).filter(
                 or_(
                     Tab.tab_type == "default",
                     Tab.owner_id == None,
@@ -242,7 +242,7 @@ async def list_shared_tabs(
 
     # Get public tabs from other users that the user hasn't subscribed to
     if subscribed_ids:
-        tabs = db.query(Tab).filter(
+        tabs = db.query(Tab).options(joinedload(Tab.owner), raiseload('*')).filter(
             Tab.is_visible == True,
             Tab.is_public == True,
             Tab.owner_id != None,
@@ -250,14 +250,14 @@ async def list_shared_tabs(
             ~Tab.id.in_(subscribed_ids)
         ).order_by(Tab.position).all()
     else:
-        tabs = db.query(Tab).filter(
+        tabs = db.query(Tab).options(joinedload(Tab.owner), raiseload('*')).filter(
             Tab.is_visible == True,
             Tab.is_public == True,
             Tab.owner_id != None,
             Tab.owner_id != current_user.id
         ).order_by(Tab.position).all()
 
-    # Add owner info to response
+    # Add owner info to response (content isn't needed to pick a tab to subscribe to)
     result = []
     for tab in tabs:
         # Convert to dict first to avoid Pydantic validation issues with SQLAlchemy relationships
@@ -268,7 +268,8 @@ async def list_shared_tabs(
             "icon": tab.icon,
             "position": tab.position,
             "tab_type": tab.tab_type,
-            "content": tab.content,
+            "content": None,
+            "widget_count": tab.widget_count,
             "is_visible": tab.is_visible,
             "is_public": tab.is_public,
             "owner_id": tab.owner_id,
@@ -289,7 +290,9 @@ async def list_subscribed_tabs(
     """
     List tabs the current user is subscribed to.
     """
-    subscriptions = db.query(TabSubscription).filter(
+    subscriptions = db.query(TabSubscription).options(
+        defaultload(TabSubscription.tab).undefer(Tab.content)
+    ).filter(
         TabSubscription.user_id == current_user.id
     ).all()
 
@@ -306,6 +309,7 @@ async def list_subscribed_tabs(
                 "position": tab.position,
                 "tab_type": tab.tab_type,
                 "content": tab.content,
+                "widget_count": tab.widget_count,
                 "is_visible": tab.is_visible,
                 "is_public": tab.is_public,
                 "owner_id": tab.owner_id,
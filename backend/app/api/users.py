@@ -4,11 +4,11 @@ User management API routes (admin only).
 
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.core.database import get_db
 from app.core.security import get_password_hash
-from app.models import User
+from app.models import User, Tab
 from app.schemas import UserResponse, UserUpdate, UserCreateByAdmin
 from app.api.deps import get_current_user, get_current_admin_user
 
@@ -21,7 +21,7 @@ async def list_users(
     db: Session = Depends(get_db)
 ):
     """List all users (admin only)."""
-    users = db.query(User).order_by(User.created_at.desc()).all()
+    users = db.query(User).options(raiseload('*')).order_by(User.created_at.desc()).all()
     return users
 
 
@@ -165,6 +165,8 @@ async def delete_user(
             detail="Vous ne pouvez pas supprimer votre propre compte"
         )
 
+    # Their tabs become system tabs (tabs.owner_id has no ON DELETE action)
+    db.query(Tab).filter(Tab.owner_id == user.id).update({Tab.owner_id: None})
     db.delete(user)
     db.commit()
 
@@ -8,7 +8,8 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Body
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy import func
 
 from app.core.database import get_db
@@ -18,7 +19,7 @@ from app.models.webhook import Webhook, WebhookEvent, WEBHOOK_TEMPLATES
 from app.schemas.webhook import (
     WebhookCreate, WebhookUpdate, WebhookResponse, WebhookListResponse,
     WebhookWithSecret, WebhookEventResponse, WebhookEventList,
-    WebhookTemplateResponse, WebhookStats, WebhookTestPayload
+    WebhookTemplateResponse, WebhookStats, WebhookTestPayload, INCOMING_WEBHOOK_PAYLOAD
 )
 from app.services.webhook_service import WebhookService
 from app.services.audit_service import AuditService
@@ -65,7 +66,7 @@ async def list_webhooks(
     current_user: User = Depends(get_current_user),
 ):
     """List all webhooks for current user (or all for admin)."""
-    query = db.query(Webhook)
+    query = db.query(Webhook).options(raiseload('*'))
     if not current_user.is_admin:
         query = query.filter(Webhook.user_id == current_user.id)
 
@@ -427,13 +428,10 @@ async def receive_webhook(
     # Get raw body for signature verification
     raw_body = await request.body()
 
-    # Parse payload
+    # Parse payload (non-JSON bodies and non-object JSON are kept as raw text)
     try:
-        if raw_body:
-            payload = await request.json()
-        else:
-            payload = {}
-    except Exception:
+        payload = INCOMING_WEBHOOK_PAYLOAD.validate_json(raw_body) if raw_body else {}
+    except ValidationError:
         payload = {"raw": raw_body.decode("utf-8", errors="replace")}
 
     # Get headers (lowercase keys)
@@ -4,49 +4,93 @@ Supports server_id for centralized SSH connection management.
 Includes Redis caching and WebSocket broadcasting.
 """
 
+import asyncio
+import orjson
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.orm import Session, Query as OrmQuery
 
-from app.core.database import get_db
-from app.models import Widget, WIDGET_TYPES
+from app.core.database import get_db, ScopedSession
+from app.models import Widget, get_widget_types, get_widget_types_json, get_widget_types_etag, get_widget_config_fields
 from app.schemas import WidgetCreate, WidgetUpdate, WidgetResponse, WidgetDataResponse
 from app.api.deps import get_current_user, get_current_admin_user
 from app.services.widget_data import fetch_widget_data
 from app.services.server_connection import merge_server_config
 from app.services.cache_service import cache_service, get_widget_ttl
 from app.services.websocket_service import ws_manager
+from app.services.ping_service import ping_schedule
 
 router = APIRouter(prefix="/widgets", tags=["Widgets"])
 
+# Columns returned by the list endpoints (same shape as WidgetResponse)
+WIDGET_LIST_COLUMNS = (
+    Widget.id, Widget.widget_type, Widget.title, Widget.position, Widget.column,
+    Widget.size, Widget.col_span, Widget.row_span, Widget.config,
+    Widget.is_visible, Widget.is_public, Widget.created_at, Widget.updated_at,
+)
+
+
+def _widget_rows_response(query: OrmQuery) -> Response:
+    """
+    Serialize widget rows straight from the DB tuples.
+    Rows are trusted, so Pydantic validation of WidgetResponse is skipped.
+    """
+    widgets = []
+    for row in query.all():
+        widget = row._asdict()
+        widget["config"] = widget["config"] or {}
+        widgets.append(widget)
+    return Response(orjson.dumps(widgets), media_type="application/json")
+
+
+def _check_widget_config(widget_type: str, config: Optional[Dict[str, Any]]) -> None:
+    """
+    Reject values outside the options of the type's select fields.
+    Keys without a schema entry are kept as-is (the frontend stores display settings there).
+    """
+    fields = get_widget_config_fields()
+    for key, value in (config or {}).items():
+        field = fields.get((widget_type, key))
+        if field is not None and field.get("options") and value not in field["options"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Valeur invalide pour '{key}'. Valeurs possibles: {field['options']}"
+            )
+
 
 @router.get("/types")
-async def get_widget_types():
-    """Get all available widget types and their configuration schemas."""
-    return WIDGET_TYPES
+async def list_widget_types(request: Request):
+    """
+    Get all available widget types and their configuration schemas (pre-serialized).
+    Supports If-None-Match (304).
+    """
+    etag = get_widget_types_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=get_widget_types_json(), media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("", response_model=List[WidgetResponse])
-async def list_widgets(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
-):
+async def list_widgets(current_user=Depends(get_current_user)):
     """List all widgets for the dashboard."""
-    widgets = db.query(Widget).filter(
-        Widget.is_visible == True
-    ).order_by(Widget.column, Widget.position).all()
-    return widgets
+    db = ScopedSession()
+    return _widget_rows_response(
+        db.query(*WIDGET_LIST_COLUMNS).filter(
+            Widget.is_visible == True
+        ).order_by(Widget.column, Widget.position)
+    )
 
 
 @router.get("/public", response_model=List[WidgetResponse])
 async def list_public_widgets(db: Session = Depends(get_db)):
     """List public widgets (no auth required)."""
-    widgets = db.query(Widget).filter(
-        Widget.is_visible == True,
-        Widget.is_public == True
-    ).order_by(Widget.column, Widget.position).all()
-    return widgets
+    return _widget_rows_response(
+        db.query(*WIDGET_LIST_COLUMNS).filter(
+            Widget.is_visible == True,
+            Widget.is_public == True
+        ).order_by(Widget.column, Widget.position)
+    )
 
 
 @router.get("/all", response_model=List[WidgetResponse])
@@ -55,8 +99,9 @@ async def list_all_widgets(
     current_user=Depends(get_current_admin_user)
 ):
     """List all widgets including hidden (admin only)."""
-    widgets = db.query(Widget).order_by(Widget.column, Widget.position).all()
-    return widgets
+    return _widget_rows_response(
+        db.query(*WIDGET_LIST_COLUMNS).order_by(Widget.column, Widget.position)
+    )
 
 
 @router.post("", response_model=WidgetResponse)
@@ -66,11 +111,12 @@ async def create_widget(
     current_user=Depends(get_current_admin_user)
 ):
     """Create a new widget (admin only)."""
-    if data.widget_type not in WIDGET_TYPES:
+    if data.widget_type not in get_widget_types():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Type de widget invalide. Types disponibles: {list(WIDGET_TYPES.keys())}"
+            detail=f"Type de widget invalide. Types disponibles: {list(get_widget_types().keys())}"
         )
+    _check_widget_config(data.widget_type, data.config)
 
     widget = Widget(
         widget_type=data.widget_type,
@@ -125,11 +171,13 @@ async def update_widget(
 
     update_data = data.model_dump(exclude_unset=True)
 
-    if "widget_type" in update_data and update_data["widget_type"] not in WIDGET_TYPES:
+    if "widget_type" in update_data and update_data["widget_type"] not in get_widget_types():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Type de widget invalide"
         )
+    if "config" in update_data:
+        _check_widget_config(update_data.get("widget_type", widget.widget_type), update_data["config"])
 
     for field, value in update_data.items():
         setattr(widget, field, value)
@@ -159,6 +207,7 @@ async def delete_widget(
 
     db.delete(widget)
     db.commit()
+    ping_schedule.prune(widget_id)
 
     return {"message": "Widget supprimé"}
 
@@ -168,7 +217,6 @@ async def get_widget_data(
     widget_id: int,
     skip_cache: bool = Query(False, description="Skip cache and fetch fresh data"),
     broadcast: bool = Query(True, description="Broadcast update to WebSocket clients"),
-    db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
     """
@@ -176,6 +224,7 @@ async def get_widget_data(
     Supports server_id for centralized credentials.
     Uses Redis cache when available.
     """
+    db = ScopedSession()
     widget = db.query(Widget).filter(Widget.id == widget_id).first()
     if not widget:
         raise HTTPException(
@@ -199,24 +248,27 @@ async def get_widget_data(
         config = merge_server_config(db, widget.config or {})
         data = await fetch_widget_data(widget.widget_type, config)
 
-        # Cache the result
+        # Cache the result and broadcast to WebSocket clients concurrently
+        pending = []
         ttl = get_widget_ttl(widget.widget_type)
         if ttl > 0:
-            await cache_service.set_widget_data(widget_id, data, ttl)
+            pending.append(cache_service.set_widget_data(widget_id, data, ttl))
 
-        # Broadcast to WebSocket clients
         if broadcast and not data.get("error"):
-            await ws_manager.broadcast_widget_update(
+            pending.append(ws_manager.broadcast_widget_update(
                 widget_id=widget_id,
                 widget_type=widget.widget_type,
                 data=data
-            )
+            ))
         elif broadcast and data.get("error"):
-            await ws_manager.broadcast_widget_error(
+            pending.append(ws_manager.broadcast_widget_error(
                 widget_id=widget_id,
                 widget_type=widget.widget_type,
                 error=data.get("error")
-            )
+            ))
+
+        if pending:
+            await asyncio.gather(*pending)
 
     response = WidgetDataResponse(
         widget_id=widget_id,
@@ -236,7 +288,6 @@ async def get_widget_data(
 @router.post("/fetch-data")
 async def fetch_widget_data_direct(
     data: Dict[str, Any],
-    db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
     """
@@ -258,7 +309,7 @@ async def fetch_widget_data_direct(
         )
 
     # Merge server credentials if server_id is present in config
-    config = merge_server_config(db, config)
+    config = merge_server_config(ScopedSession(), config)
     result = await fetch_widget_data(widget_type, config)
 
     return {
@@ -1,5 +1,5 @@
 from app.core.config import settings
-from app.core.database import Base, get_db, get_npm_db, engine
+from app.core.database import Base, get_db, get_npm_db, engine, ScopedSession
 from app.core.security import (
     verify_password, get_password_hash, create_access_token,
     decode_token, generate_totp_secret, get_totp_uri, verify_totp,
@@ -7,7 +7,7 @@ from app.core.security import (
 )
 
 __all__ = [
-    "settings", "Base", "get_db", "get_npm_db", "engine",
+    "settings", "Base", "get_db", "get_npm_db", "engine", "ScopedSession",
     "verify_password", "get_password_hash", "create_access_token",
     "decode_token", "generate_totp_secret", "get_totp_uri", "verify_totp",
     "generate_qr_code_base64"
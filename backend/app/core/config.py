@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     # Webhooks
     WEBHOOK_BASE_URL: Optional[str] = None  # Base URL for webhook callbacks (e.g., https://api.example.com)
 
+    # HTTP dashboard blocks
+    HTTP_BLOCK_ALLOW_PRIVATE: bool = False  # Allow http blocks to fetch private/loopback addresses (LAN services)
+
     # Application
     APP_NAME: str = "Dashboard Auto"
     APP_VERSION: str = "1.0.0"
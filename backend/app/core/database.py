@@ -1,20 +1,59 @@
-from sqlalchemy import create_engine
+import itertools
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import CheckConstraint, create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
 
 from app.core.config import settings
 
+
+def _json_serializer(value: Any) -> str:
+    # Non-str keys are stringified, as the stdlib json module does
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Main database (ProxyDash)
 # Increase pool size to handle concurrent widget requests
+# Connections are recycled before server/proxy idle timeouts drop them, and the
+# compiled statement cache is sized for the number of distinct queries the app issues
+# JSON/JSONB columns are encoded and decoded with orjson
 engine = create_engine(
     settings.DATABASE_URL,
     pool_size=40,
     max_overflow=60,
     pool_timeout=60,
     pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request-scoped session, shared by get_db and the hot endpoints that skip Depends(get_db),
+# so a request opens a single session. The scope is a per-request id held in a ContextVar rather than the thread:
+# async endpoints all share the event loop thread.
+_request_scope: ContextVar[Optional[int]] = ContextVar("db_request_scope", default=None)
+_request_ids = itertools.count(1)
+ScopedSession = scoped_session(SessionLocal, scopefunc=_request_scope.get)
+
+
+def begin_request_scope():
+    """Open a new ScopedSession scope for the current request."""
+    return _request_scope.set(next(_request_ids))
+
+
+def end_request_scope(token):
+    """Close the current request's ScopedSession and restore the previous scope."""
+    try:
+        ScopedSession.remove()
+    finally:
+        _request_scope.reset(token)
+
+
 # NPM database (read-only)
 npm_engine = create_engine(
     settings.NPM_DATABASE_URL,
@@ -28,7 +67,17 @@ NPMSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=npm_engin
 Base = declarative_base()
 
 
+def enum_check_constraint(column: str, enum_cls, name: str) -> CheckConstraint:
+    """CHECK constraint restricting a plain string column to the values of a str Enum."""
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
+
+
 def get_db():
+    if _request_scope.get() is not None:
+        # Inside an HTTP request: the db_session_scope middleware closes it
+        yield ScopedSession()
+        return
     db = SessionLocal()
     try:
         yield db
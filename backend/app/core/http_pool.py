@@ -0,0 +1,32 @@
+"""
+Shared httpx client for outgoing requests to user-configured URLs.
+Widgets and dashboard blocks refreshing every few seconds reuse kept-alive
+connections instead of paying DNS + TCP + TLS on every request.
+One client serves every origin: httpx keeps a connection pool per origin inside
+it, bounded by HTTP_POOL_LIMITS, and drops idle connections after keepalive_expiry.
+"""
+
+from typing import Optional
+
+import httpx
+
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+HTTP_POOL_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client (created on first use)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=HTTP_POOL_LIMITS, timeout=HTTP_POOL_TIMEOUT)
+    return _client
+
+
+async def close_http_clients():
+    """Close the shared client (called on application shutdown)."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
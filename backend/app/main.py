@@ -3,13 +3,15 @@ ProxyDash - Automatic Dashboard for Nginx Proxy Manager
 """
 
 import logging
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import re
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.core.config import settings
-from app.core.database import engine, Base, SessionLocal
+from app.core.database import engine, Base, SessionLocal, begin_request_scope, end_request_scope
+from app.core.http_pool import close_http_clients
 from app.models import Category, DEFAULT_CATEGORIES
 from app.api import api_router
 from app.services.npm_sync import sync_all_npm_instances
@@ -18,6 +20,8 @@ from app.services.cache_service import cache_service
 from app.services.websocket_service import ws_manager
 from app.services.database_updater import run_nightly_update
 from app.services.alert_service import run_alert_check
+from app.services.template_service import flush_template_downloads
+from app.services.ping_service import PingHistoryService
 
 # Configure logging
 logging.basicConfig(
@@ -74,56 +78,584 @@ async def nightly_database_update():
         logger.error(f"Nightly database update failed: {e}")
 
 
+async def rollup_ping_history():
+    """Background task aggregating raw ping measurements into hourly buckets."""
+    try:
+        db = SessionLocal()
+        try:
+            buckets = PingHistoryService(db).rollup_hourly()
+            logger.info(f"Ping history rollup completed: {buckets} hourly buckets written")
+        finally:
+            db.close()
+    except Exception as e:
+        logger.error(f"Ping history rollup failed: {e}")
+
+
 def init_categories(db):
     """Initialize default categories if they don't exist."""
+    existing = {slug for (slug,) in db.query(Category.slug)}
     for cat_data in DEFAULT_CATEGORIES:
-        existing = db.query(Category).filter(Category.slug == cat_data["slug"]).first()
-        if not existing:
-            category = Category(**cat_data)
+        if cat_data.slug not in existing:
+            category = Category(**cat_data._asdict())
             db.add(category)
-            logger.info(f"Created category: {cat_data['name']}")
+            logger.info(f"Created category: {cat_data.name}")
     db.commit()
 
 
+@contextmanager
+def migration_step(db, name: str):
+    """
+    Run one migration step: a failure is logged with the step name and rolled back,
+    without skipping the steps after it.
+    """
+    try:
+        yield
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Migration step failed ({name}): {e}")
+
+
 def run_migrations(db):
     """Run manual migrations for existing databases."""
-    from sqlalchemy import text, inspect
+    from sqlalchemy import text, inspect, CheckConstraint, Enum as SQLEnum, REAL, LargeBinary
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.schema import AddConstraint
+    from app.models.audit_log import AuditAction
+    from app.models.notification import ChannelType, AlertSeverity, AlertStatus
+    from app.models.app_template import compute_content_hash
 
     inspector = inspect(engine)
 
     # Migration: Add owner_id and is_public to tabs table
-    if 'tabs' in inspector.get_table_names():
-        columns = [col['name'] for col in inspector.get_columns('tabs')]
+    with migration_step(db, "tabs owner_id/is_public"):
+        if 'tabs' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('tabs')]
 
-        if 'owner_id' not in columns:
-            logger.info("Migration: Adding owner_id column to tabs table")
-            db.execute(text("ALTER TABLE tabs ADD COLUMN owner_id INTEGER REFERENCES users(id)"))
-            db.commit()
+            if 'owner_id' not in columns:
+                logger.info("Migration: Adding owner_id column to tabs table")
+                db.execute(text("ALTER TABLE tabs ADD COLUMN owner_id INTEGER REFERENCES users(id)"))
+                db.commit()
 
-        if 'is_public' not in columns:
-            logger.info("Migration: Adding is_public column to tabs table")
-            db.execute(text("ALTER TABLE tabs ADD COLUMN is_public BOOLEAN DEFAULT FALSE"))
-            db.commit()
+            if 'is_public' not in columns:
+                logger.info("Migration: Adding is_public column to tabs table")
+                db.execute(text("ALTER TABLE tabs ADD COLUMN is_public BOOLEAN DEFAULT FALSE"))
+                db.commit()
 
     # Migration: Add forward_* columns to applications table
-    if 'applications' in inspector.get_table_names():
-        columns = [col['name'] for col in inspector.get_columns('applications')]
-
-        if 'forward_host' not in columns:
-            logger.info("Migration: Adding forward_host column to applications table")
-            db.execute(text("ALTER TABLE applications ADD COLUMN forward_host VARCHAR(255)"))
+    with migration_step(db, "applications forward_* columns"):
+        if 'applications' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('applications')]
+
+            if 'forward_host' not in columns:
+                logger.info("Migration: Adding forward_host column to applications table")
+                db.execute(text("ALTER TABLE applications ADD COLUMN forward_host VARCHAR(255)"))
+                db.commit()
+
+            if 'forward_port' not in columns:
+                logger.info("Migration: Adding forward_port column to applications table")
+                db.execute(text("ALTER TABLE applications ADD COLUMN forward_port INTEGER"))
+                db.commit()
+
+            if 'forward_scheme' not in columns:
+                logger.info("Migration: Adding forward_scheme column to applications table")
+                db.execute(text("ALTER TABLE applications ADD COLUMN forward_scheme VARCHAR(10)"))
+                db.commit()
+
+    # Migration: Convert app_templates JSON columns to JSONB
+    with migration_step(db, "app_templates JSONB columns"):
+        if 'app_templates' in inspector.get_table_names():
+            columns = {col['name']: col for col in inspector.get_columns('app_templates')}
+
+            for column_name in ('blocks', 'config_schema'):
+                column = columns.get(column_name)
+                if column is not None and not isinstance(column['type'], JSONB):
+                    logger.info(f"Migration: Converting app_templates.{column_name} to JSONB")
+                    db.execute(text(
+                        f"ALTER TABLE app_templates ALTER COLUMN {column_name} "
+                        f"TYPE JSONB USING {column_name}::jsonb"
+                    ))
+                    db.commit()
+
+            # SQL-side defaults instead of Python-side default=list / default=dict
+            for column_name, default in (('blocks', "'[]'::jsonb"), ('config_schema', "'{}'::jsonb")):
+                column = columns.get(column_name)
+                if column is not None and not column.get('default'):
+                    logger.info(f"Migration: Setting server default on app_templates.{column_name}")
+                    db.execute(text(
+                        f"ALTER TABLE app_templates ALTER COLUMN {column_name} SET DEFAULT {default}"
+                    ))
+                    db.commit()
+
+            if 'block_types' not in columns:
+                logger.info("Migration: Adding block_types column to app_templates table")
+                db.execute(text(
+                    "ALTER TABLE app_templates ADD COLUMN block_types VARCHAR(50)[] NOT NULL DEFAULT '{}'"
+                ))
+                db.execute(text(
+                    "UPDATE app_templates SET block_types = ARRAY("
+                    "SELECT DISTINCT b->>'type' FROM jsonb_array_elements(blocks) b "
+                    "WHERE b->>'type' IS NOT NULL ORDER BY 1)"
+                ))
+                db.commit()
+
+    # Migration: Shrink app_templates.description from TEXT to VARCHAR(500)
+    with migration_step(db, "app_templates.description VARCHAR(500)"):
+        if 'app_templates' in inspector.get_table_names():
+            columns = {col['name']: col for col in inspector.get_columns('app_templates')}
+            description = columns.get('description')
+            if description is not None and getattr(description['type'], 'length', None) != 500:
+                too_long = db.execute(text(
+                    "SELECT count(*) FROM app_templates WHERE char_length(description) > 500"
+                )).scalar()
+                if too_long:
+                    # Never truncate user data: keep TEXT, new writes are capped by the API schemas
+                    logger.warning(
+                        f"Migration: {too_long} app_templates descriptions exceed 500 characters, "
+                        "keeping description as TEXT until they are shortened"
+                    )
+                else:
+                    logger.info("Migration: Converting app_templates.description to VARCHAR(500)")
+                    db.execute(text("ALTER TABLE app_templates ALTER COLUMN description TYPE VARCHAR(500)"))
+                    db.commit()
+
+    # Migration: Add content_hash column to app_templates
+    with migration_step(db, "app_templates.content_hash"):
+        if 'app_templates' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('app_templates')]
+
+            if 'content_hash' not in columns:
+                logger.info("Migration: Adding content_hash column to app_templates table")
+                db.execute(text("ALTER TABLE app_templates ADD COLUMN content_hash VARCHAR(64)"))
+                db.commit()
+
+                rows = db.execute(text("SELECT id, blocks, config_schema FROM app_templates")).all()
+                for row in rows:
+                    db.execute(
+                        text("UPDATE app_templates SET content_hash = :hash WHERE id = :id"),
+                        {"hash": compute_content_hash(row.blocks, row.config_schema), "id": row.id},
+                    )
+                db.commit()
+
+    # Migration: Replace the global unique slug index on app_templates with partial indexes
+    with migration_step(db, "app_templates partial slug indexes"):
+        if 'app_templates' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('app_templates')]
+            if 'ix_app_templates_slug' in indexes:
+                logger.info("Migration: Dropping ix_app_templates_slug (replaced by partial indexes)")
+                db.execute(text("DROP INDEX IF EXISTS ix_app_templates_slug"))
+                db.commit()
+
+    # Migration: Maintain app_templates.updated_at with a trigger (only on content changes,
+    # so the downloads counter doesn't bump it)
+    with migration_step(db, "app_templates updated_at trigger"):
+        if 'app_templates' in inspector.get_table_names():
+            db.execute(text(
+                "CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$ "
+                "BEGIN NEW.updated_at := now(); RETURN NEW; END; $$ LANGUAGE plpgsql"
+            ))
+            db.execute(text("DROP TRIGGER IF EXISTS app_templates_touch_updated_at ON app_templates"))
+            db.execute(text(
+                "CREATE TRIGGER app_templates_touch_updated_at "
+                "BEFORE UPDATE OF name, slug, description, icon, version, author, "
+                "config_schema, blocks, block_types, is_public ON app_templates "
+                "FOR EACH ROW EXECUTE FUNCTION touch_updated_at()"
+            ))
             db.commit()
 
-        if 'forward_port' not in columns:
-            logger.info("Migration: Adding forward_port column to applications table")
-            db.execute(text("ALTER TABLE applications ADD COLUMN forward_port INTEGER"))
+    # Migration: Compress app_templates.blocks with lz4 (PostgreSQL 14+).
+    # Large blocks values are TOASTed out of line, so list queries (which don't
+    # select blocks) never read them; lz4 makes the detail read cheaper to decompress.
+    with migration_step(db, "app_templates.blocks lz4 compression"):
+        if 'app_templates' in inspector.get_table_names():
+            server_version = db.execute(text("SHOW server_version_num")).scalar()
+            if int(server_version) >= 140000:
+                compression = db.execute(text(
+                    "SELECT attcompression FROM pg_attribute "
+                    "WHERE attrelid = 'app_templates'::regclass AND attname = 'blocks'"
+                )).scalar()
+                if compression != 'l':
+                    logger.info("Migration: Setting lz4 compression on app_templates.blocks")
+                    db.execute(text("ALTER TABLE app_templates ALTER COLUMN blocks SET COMPRESSION lz4"))
+                    db.commit()
+
+    # Migration: Convert audit/notification/webhook/tab JSON columns to JSONB
+    with migration_step(db, "JSONB audit/notification/webhook/tab columns"):
+        table_names = inspector.get_table_names()
+        for table_name, column_name in (
+            ('audit_logs', 'details'),
+            ('alerts', 'context'),
+            ('notification_channels', 'config'),
+            ('webhook_events', 'headers'),
+            ('webhook_events', 'payload'),
+            ('tabs', 'content'),
+        ):
+            if table_name not in table_names:
+                continue
+            columns = {col['name']: col for col in inspector.get_columns(table_name)}
+            column = columns.get(column_name)
+            if column is not None and not isinstance(column['type'], JSONB):
+                logger.info(f"Migration: Converting {table_name}.{column_name} to JSONB")
+                db.execute(text(
+                    f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                    f"TYPE JSONB USING {column_name}::jsonb"
+                ))
+                db.commit()
+
+    # Migration: Move audit_logs.user_agent to the deduplicated user_agent_strings table
+    with migration_step(db, "audit_logs user_agent_strings"):
+        if 'audit_logs' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('audit_logs')]
+            if 'user_agent' in columns:
+                logger.info("Migration: Moving audit_logs.user_agent to user_agent_strings")
+                if 'user_agent_id' not in columns:
+                    db.execute(text(
+                        "ALTER TABLE audit_logs ADD COLUMN user_agent_id INTEGER "
+                        "REFERENCES user_agent_strings(id)"
+                    ))
+                # Same key as AuditService: first 16 bytes of SHA-256
+                db.execute(text(
+                    "INSERT INTO user_agent_strings (sha, value) "
+                    "SELECT DISTINCT substring(sha256(convert_to(user_agent, 'UTF8')) FROM 1 FOR 16), user_agent "
+                    "FROM audit_logs WHERE user_agent IS NOT NULL "
+                    "ON CONFLICT (sha) DO NOTHING"
+                ))
+                db.execute(text(
+                    "UPDATE audit_logs SET user_agent_id = s.id FROM user_agent_strings s "
+                    "WHERE audit_logs.user_agent IS NOT NULL "
+                    "AND s.sha = substring(sha256(convert_to(audit_logs.user_agent, 'UTF8')) FROM 1 FOR 16)"
+                ))
+                db.execute(text("ALTER TABLE audit_logs DROP COLUMN user_agent"))
+                db.commit()
+
+    # Migration: Python-side utcnow timestamps become timestamptz with a server-side default
+    with migration_step(db, "timestamptz server-side defaults"):
+        table_names = inspector.get_table_names()
+        for table_name, column_name in (
+            ('audit_logs', 'created_at'),
+            ('rss_articles', 'fetched_at'),
+            ('user_sessions', 'last_activity'),
+            ('user_sessions', 'created_at'),
+        ):
+            if table_name not in table_names:
+                continue
+            columns = {col['name']: col for col in inspector.get_columns(table_name)}
+            column = columns.get(column_name)
+            if column is not None and not getattr(column['type'], 'timezone', False):
+                logger.info(f"Migration: Converting {table_name}.{column_name} to TIMESTAMPTZ with DEFAULT now()")
+                # Existing values were written with datetime.utcnow()
+                db.execute(text(
+                    f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                    f"TYPE TIMESTAMP WITH TIME ZONE USING {column_name} AT TIME ZONE 'UTC', "
+                    f"ALTER COLUMN {column_name} SET DEFAULT now()"
+                ))
+                db.commit()
+
+    # Migration: Convert native enum columns to plain strings (enum values)
+    enum_columns = [
+        ('audit_logs', 'action', AuditAction, 32),
+        ('notification_channels', 'channel_type', ChannelType, 20),
+        ('notification_channels', 'min_severity', AlertSeverity, 20),
+        ('alert_rules', 'severity', AlertSeverity, 20),
+        ('alerts', 'severity', AlertSeverity, 20),
+        ('alerts', 'status', AlertStatus, 20),
+        ('notification_logs', 'channel_type', ChannelType, 20),
+    ]
+    with migration_step(db, "enum columns to strings"):
+        table_names = inspector.get_table_names()
+        enum_types = set()
+        for table_name, column_name, enum_cls, length in enum_columns:
+            if table_name not in table_names:
+                continue
+            columns = {col['name']: col for col in inspector.get_columns(table_name)}
+            column = columns.get(column_name)
+            if column is None or not isinstance(column['type'], SQLEnum):
+                continue
+
+            logger.info(f"Migration: Converting {table_name}.{column_name} from enum to VARCHAR({length})")
+            enum_types.add(column['type'].name)
+            db.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} DROP DEFAULT, "
+                f"ALTER COLUMN {column_name} TYPE VARCHAR({length}) USING {column_name}::text"
+            ))
+            # SQLAlchemy's Enum stored member names; store the values instead
+            for member in enum_cls:
+                if member.name != member.value:
+                    db.execute(
+                        text(f"UPDATE {table_name} SET {column_name} = :value WHERE {column_name} = :name"),
+                        {"value": member.value, "name": member.name},
+                    )
             db.commit()
 
-        if 'forward_scheme' not in columns:
-            logger.info("Migration: Adding forward_scheme column to applications table")
-            db.execute(text("ALTER TABLE applications ADD COLUMN forward_scheme VARCHAR(10)"))
+        for enum_type in enum_types:
+            db.execute(text(f"DROP TYPE IF EXISTS {enum_type}"))
+        db.commit()
+
+    # Migration: Create the enum CHECK constraints, and recreate them when the enum's
+    # values changed (a member added to AuditAction, ChannelType, ...)
+    with migration_step(db, "enum CHECK constraints"):
+        table_names = inspector.get_table_names()
+        for table_name in {table_name for table_name, *_ in enum_columns}:
+            if table_name not in table_names:
+                continue
+            existing_checks = {ck['name']: ck['sqltext'] for ck in inspector.get_check_constraints(table_name)}
+            table = Base.metadata.tables[table_name]
+            for constraint in table.constraints:
+                if not isinstance(constraint, CheckConstraint):
+                    continue
+                # The allowed values are the quoted literals of the definition
+                expected = set(re.findall(r"'([^']*)'", str(constraint.sqltext)))
+                current = existing_checks.get(constraint.name)
+                if current is not None:
+                    if set(re.findall(r"'([^']*)'", current)) == expected:
+                        continue
+                    logger.info(f"Migration: Recreating constraint {constraint.name} on {table_name} (values changed)")
+                    db.execute(text(f"ALTER TABLE {table_name} DROP CONSTRAINT {constraint.name}"))
+                else:
+                    logger.info(f"Migration: Adding constraint {constraint.name} on {table_name}")
+                db.execute(AddConstraint(constraint))
+                db.commit()
+
+    # Migration: Replace the btree index on ping_history.timestamp with a BRIN index
+    with migration_step(db, "ping_history BRIN timestamp index"):
+        if 'ping_history' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('ping_history')]
+            if 'ix_ping_history_timestamp' in indexes:
+                logger.info(
+                    "Migration: Dropping ix_ping_history_timestamp (replaced by brin_ping_history_timestamp)"
+                )
+                db.execute(text("DROP INDEX IF EXISTS ix_ping_history_timestamp"))
+                db.commit()
+
+    # Migration: Store ping_history latency/loss metrics as REAL (float4) instead of double precision
+    with migration_step(db, "ping_history REAL metrics"):
+        if 'ping_history' in inspector.get_table_names():
+            columns = {col['name']: col for col in inspector.get_columns('ping_history')}
+            metrics = [
+                name for name in (
+                    'latency_min', 'latency_avg', 'latency_max', 'latency_mdev', 'jitter', 'packet_loss_percent'
+                )
+                if name in columns and not isinstance(columns[name]['type'], REAL)
+            ]
+            if metrics:
+                logger.info(f"Migration: Converting ping_history.{', '.join(metrics)} to REAL")
+                db.execute(text(
+                    "ALTER TABLE ping_history "
+                    + ", ".join(f"ALTER COLUMN {name} TYPE REAL" for name in metrics)
+                ))
+                db.commit()
+
+    # Migration: Replace ix_rss_articles_unread with the partial ix_rss_articles_unread_partial
+    with migration_step(db, "ix_rss_articles_unread_partial"):
+        if 'rss_articles' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('rss_articles')]
+            if 'ix_rss_articles_unread' in indexes:
+                logger.info("Migration: Dropping ix_rss_articles_unread (replaced by a partial index)")
+                db.execute(text("DROP INDEX IF EXISTS ix_rss_articles_unread"))
+                db.commit()
+
+    # Migration: Deduplicate schema_layouts before its unique lookup index is created,
+    # and drop the single-column indexes it replaces
+    with migration_step(db, "schema_layouts deduplication"):
+        if 'schema_layouts' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('schema_layouts')]
+            if 'ix_schema_layout_lookup' not in indexes:
+                logger.info("Migration: Removing duplicate schema_layouts rows")
+                db.execute(text("""
+                    DELETE FROM schema_layouts a USING schema_layouts b
+                    WHERE a.user_id = b.user_id AND a.node_type = b.node_type
+                      AND a.node_id = b.node_id AND a.id < b.id
+                """))
+                db.commit()
+            # NULLs are distinct in the unique index, so shared (user-less) duplicates
+            # are never rejected: keep the newest one per node
+            result = db.execute(text("""
+                DELETE FROM schema_layouts a USING schema_layouts b
+                WHERE a.user_id IS NULL AND b.user_id IS NULL AND a.node_type = b.node_type
+                  AND a.node_id = b.node_id AND a.id < b.id
+            """))
+            db.commit()
+            if result.rowcount:
+                logger.info(f"Migration: Removed {result.rowcount} duplicate shared schema_layouts rows")
+            for index_name in ('ix_schema_layouts_node_type', 'ix_schema_layouts_node_id'):
+                if index_name in indexes:
+                    logger.info(f"Migration: Dropping {index_name} (replaced by ix_schema_layout_lookup)")
+                    db.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                    db.commit()
+
+    # Migration: Store servers.ssh_key out of line (uncompressed TOAST), keeping server rows narrow
+    with migration_step(db, "servers.ssh_key storage"):
+        if 'servers' in inspector.get_table_names():
+            storage = db.execute(text(
+                "SELECT attstorage FROM pg_attribute "
+                "WHERE attrelid = 'servers'::regclass AND attname = 'ssh_key'"
+            )).scalar()
+            if storage is not None and storage != 'e':
+                logger.info("Migration: Moving servers.ssh_key to out-of-line storage")
+                db.execute(text("ALTER TABLE servers ALTER COLUMN ssh_key SET STORAGE EXTERNAL"))
+                # Toast any value once the row passes 128 bytes (instead of ~2 kB)
+                db.execute(text("ALTER TABLE servers SET (toast_tuple_target = 128)"))
+                # Rewrite existing rows so their keys move out of line too
+                db.execute(text("UPDATE servers SET ssh_key = ssh_key || '' WHERE ssh_key IS NOT NULL"))
+                db.commit()
+
+    # Migration: Collapse rss_articles.is_read/is_archived into a single status column
+    with migration_step(db, "rss_articles.status"):
+        if 'rss_articles' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('rss_articles')]
+            if 'status' not in columns and 'is_read' in columns:
+                logger.info("Migration: Converting rss_articles.is_read/is_archived to status")
+                db.execute(text("ALTER TABLE rss_articles ADD COLUMN status SMALLINT NOT NULL DEFAULT 0"))
+                db.execute(text(
+                    "UPDATE rss_articles SET status = CASE "
+                    "WHEN is_archived THEN 2 WHEN is_read THEN 1 ELSE 0 END "
+                    "WHERE is_read OR is_archived"
+                ))
+                # Also drops the indexes on these columns; the status ones are created below
+                db.execute(text("ALTER TABLE rss_articles DROP COLUMN is_read, DROP COLUMN is_archived"))
+                db.commit()
+                inspector = inspect(engine)
+
+    # Migration: Keep widgets.rss_unread_count/rss_archived_count in sync with rss_articles
+    # (statement-level triggers over transition tables: one UPDATE per statement, not per row)
+    with migration_step(db, "widgets RSS counters triggers"):
+        if 'rss_articles' in inspector.get_table_names() and 'widgets' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('widgets')]
+            if 'rss_unread_count' not in columns:
+                logger.info("Migration: Adding RSS article counters to widgets")
+                db.execute(text(
+                    "ALTER TABLE widgets ADD COLUMN rss_unread_count INTEGER NOT NULL DEFAULT 0, "
+                    "ADD COLUMN rss_archived_count INTEGER NOT NULL DEFAULT 0"
+                ))
+                db.execute(text("""
+                    UPDATE widgets w
+                    SET rss_unread_count = c.unread, rss_archived_count = c.archived
+                    FROM (
+                        SELECT widget_id,
+                               count(*) FILTER (WHERE status = 0) AS unread,
+                               count(*) FILTER (WHERE status = 2) AS archived
+                        FROM rss_articles WHERE widget_id IS NOT NULL GROUP BY widget_id
+                    ) c
+                    WHERE w.id = c.widget_id
+                """))
+            db.execute(text("""
+                CREATE OR REPLACE FUNCTION rss_articles_update_widget_counts() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        UPDATE widgets w
+                        SET rss_unread_count = w.rss_unread_count - c.unread,
+                            rss_archived_count = w.rss_archived_count - c.archived
+                        FROM (
+                            SELECT widget_id,
+                                   count(*) FILTER (WHERE status = 0) AS unread,
+                                   count(*) FILTER (WHERE status = 2) AS archived
+                            FROM old_rows WHERE widget_id IS NOT NULL GROUP BY widget_id
+                        ) c
+                        WHERE w.id = c.widget_id;
+                    END IF;
+                    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+                        UPDATE widgets w
+                        SET rss_unread_count = w.rss_unread_count + c.unread,
+                            rss_archived_count = w.rss_archived_count + c.archived
+                        FROM (
+                            SELECT widget_id,
+                                   count(*) FILTER (WHERE status = 0) AS unread,
+                                   count(*) FILTER (WHERE status = 2) AS archived
+                            FROM new_rows WHERE widget_id IS NOT NULL GROUP BY widget_id
+                        ) c
+                        WHERE w.id = c.widget_id;
+                    END IF;
+                    RETURN NULL;
+                END; $$ LANGUAGE plpgsql
+            """))
+            for event, referencing in (
+                ('INSERT', 'NEW TABLE AS new_rows'),
+                ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+                ('DELETE', 'OLD TABLE AS old_rows'),
+            ):
+                trigger = f"rss_articles_widget_counts_{event.lower()}"
+                db.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON rss_articles"))
+                db.execute(text(
+                    f"CREATE TRIGGER {trigger} AFTER {event} ON rss_articles "
+                    f"REFERENCING {referencing} FOR EACH STATEMENT "
+                    f"EXECUTE FUNCTION rss_articles_update_widget_counts()"
+                ))
             db.commit()
 
+    # Migration: Store user_sessions.token_hash as the raw SHA256 digest instead of hex
+    with migration_step(db, "user_sessions.token_hash digest"):
+        if 'user_sessions' in inspector.get_table_names():
+            columns = {col['name']: col for col in inspector.get_columns('user_sessions')}
+            token_hash = columns.get('token_hash')
+            if token_hash is not None and not isinstance(token_hash['type'], LargeBinary):
+                logger.info("Migration: Converting user_sessions.token_hash to BYTEA")
+                db.execute(text(
+                    "ALTER TABLE user_sessions ALTER COLUMN token_hash "
+                    "TYPE BYTEA USING decode(token_hash, 'hex')"
+                ))
+                db.commit()
+
+    # Migration: Drop rss_articles widget indexes replaced by ix_rss_articles_widget_published
+    with migration_step(db, "rss_articles widget indexes"):
+        if 'rss_articles' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('rss_articles')]
+            for index_name in ('ix_rss_articles_widget_feed', 'ix_rss_articles_widget_id'):
+                if index_name in indexes:
+                    logger.info(f"Migration: Dropping {index_name} (replaced by ix_rss_articles_widget_published)")
+                    db.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                    db.commit()
+            # The index is on published_at: rename it from its earlier, misleading name
+            if 'ix_rss_articles_widget_fetched' in indexes and 'ix_rss_articles_widget_published' not in indexes:
+                logger.info("Migration: Renaming ix_rss_articles_widget_fetched to ..._widget_published")
+                db.execute(text(
+                    "ALTER INDEX ix_rss_articles_widget_fetched RENAME TO ix_rss_articles_widget_published"
+                ))
+                db.commit()
+
+    # Migration: Add tabs.widget_count, generated from content (needs content as JSONB)
+    with migration_step(db, "tabs.widget_count"):
+        if 'tabs' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('tabs')]
+            if 'widget_count' not in columns:
+                logger.info("Migration: Adding generated column widget_count to tabs")
+                db.execute(text(
+                    "ALTER TABLE tabs ADD COLUMN widget_count INTEGER GENERATED ALWAYS AS ("
+                    "CASE WHEN jsonb_typeof(content -> 'widgets') = 'array' "
+                    "THEN jsonb_array_length(content -> 'widgets') END) STORED"
+                ))
+                db.commit()
+
+    # Migration: Drop ix_app_templates_downloads_id (the template list pages on id now)
+    with migration_step(db, "ix_app_templates_downloads_id"):
+        if 'app_templates' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('app_templates')]
+            if 'ix_app_templates_downloads_id' in indexes:
+                logger.info("Migration: Dropping ix_app_templates_downloads_id (unused)")
+                db.execute(text("DROP INDEX IF EXISTS ix_app_templates_downloads_id"))
+                db.commit()
+
+    # Migration: Drop ix_app_templates_content_hash (content_hash is never filtered on)
+    with migration_step(db, "ix_app_templates_content_hash"):
+        if 'app_templates' in inspector.get_table_names():
+            indexes = [idx['name'] for idx in inspector.get_indexes('app_templates')]
+            if 'ix_app_templates_content_hash' in indexes:
+                logger.info("Migration: Dropping ix_app_templates_content_hash (unused)")
+                db.execute(text("DROP INDEX IF EXISTS ix_app_templates_content_hash"))
+                db.commit()
+
+    # Migration: Create indexes declared on models but missing from existing tables
+    # (create_all only creates indexes together with new tables). The inspector caches
+    # index lists read by earlier steps, so check again before creating.
+    table_names = inspector.get_table_names()
+    for table in Base.metadata.sorted_tables:
+        if table.name not in table_names:
+            continue
+        existing_indexes = {idx['name'] for idx in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                with migration_step(db, f"index {index.name}"):
+                    logger.info(f"Migration: Creating index {index.name} on {table.name}")
+                    index.create(bind=engine, checkfirst=True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -200,6 +732,24 @@ async def lifespan(app: FastAPI):
         replace_existing=True
     )
 
+    # Flush template download counters from Redis (every minute)
+    scheduler.add_job(
+        flush_template_downloads,
+        "interval",
+        minutes=1,
+        id="template_downloads_flush",
+        replace_existing=True
+    )
+
+    # Roll up ping history into hourly buckets (every hour, once the hour is complete)
+    scheduler.add_job(
+        rollup_ping_history,
+        "cron",
+        minute=5,
+        id="ping_history_rollup",
+        replace_existing=True
+    )
+
     scheduler.start()
     logger.info(
         f"Scheduler started (sync every {settings.SYNC_INTERVAL_MINUTES} minutes, "
@@ -218,6 +768,12 @@ async def lifespan(app: FastAPI):
     await ws_manager.stop()
     logger.info("WebSocket manager stopped")
 
+    # Close pooled HTTP connections
+    await close_http_clients()
+
+    # Flush pending template downloads before Redis goes away
+    await flush_template_downloads()
+
     # Disconnect Redis
     await cache_service.disconnect()
     logger.info("Redis cache disconnected")
@@ -231,7 +787,7 @@ app = FastAPI(
     title="ProxyDash",
     description="Automatic Dashboard for Nginx Proxy Manager",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -243,6 +799,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def db_session_scope(request: Request, call_next):
+    """Give each HTTP request its own ScopedSession and release it afterwards."""
+    token = begin_request_scope()
+    try:
+        return await call_next(request)
+    finally:
+        end_request_scope(token)
+
+
 # Include API routes
 app.include_router(api_router)
 
@@ -1,34 +1,39 @@
 from app.models.user import User
-from app.models.category import Category, DEFAULT_CATEGORIES
+from app.models.category import Category, CategoryDefault, DEFAULT_CATEGORIES
 from app.models.application import Application
 from app.models.npm_instance import NpmInstance
-from app.models.widget import Widget, WIDGET_TYPES
+from app.models.widget import Widget, get_widget_types, get_widget_types_json, get_widget_types_etag, get_widget_config_fields
 from app.models.tab import Tab
 from app.models.tab_subscription import TabSubscription
-from app.models.ping_history import PingHistory, PingTarget
+from app.models.ping_history import PingHistory, PingHistoryHourly, PingTarget
 from app.models.server import Server
-from app.models.rss_article import RssArticle
+from app.models.rss_article import RssArticle, RssArticleDTO
 from app.models.note import Note, NextcloudNotesConfig
 from app.models.backend import Backend
 from app.models.schema_layout import SchemaLayout
 from app.models.system_config import SystemConfig
 from app.models.chat_conversation import ChatConversation
-from app.models.app_template import AppTemplate, BUILTIN_TEMPLATES
+from app.models.app_template import (
+    AppTemplate, BUILTIN_TEMPLATE_SLUGS, get_builtin_template, get_builtin_templates,
+    get_builtin_template_bytes, get_builtin_template_etag
+)
 from app.models.notification import (
     NotificationChannel, AlertRule, Alert, NotificationLog,
-    ChannelType, AlertSeverity, AlertStatus, DEFAULT_ALERT_RULES
+    ChannelType, AlertSeverity, AlertStatus, AlertRuleDefault, DEFAULT_ALERT_RULES
 )
-from app.models.audit_log import AuditLog, AuditAction
+from app.models.audit_log import AuditLog, AuditAction, UserAgentString
 from app.models.user_session import UserSession
 from app.models.webhook import Webhook, WebhookEvent, WebhookEventType, WEBHOOK_TEMPLATES
 
 __all__ = [
-    "User", "Category", "Application", "NpmInstance", "Widget", "WIDGET_TYPES",
-    "DEFAULT_CATEGORIES", "Tab", "TabSubscription", "PingHistory", "PingTarget",
-    "Server", "RssArticle", "Note", "NextcloudNotesConfig", "Backend", "SchemaLayout",
-    "SystemConfig", "ChatConversation", "AppTemplate", "BUILTIN_TEMPLATES",
+    "User", "Category", "Application", "NpmInstance", "Widget", "get_widget_types", "get_widget_types_json", "get_widget_types_etag",
+    "get_widget_config_fields",
+    "CategoryDefault", "DEFAULT_CATEGORIES", "Tab", "TabSubscription", "PingHistory", "PingHistoryHourly", "PingTarget",
+    "Server", "RssArticle", "RssArticleDTO", "Note", "NextcloudNotesConfig", "Backend", "SchemaLayout",
+    "SystemConfig", "ChatConversation", "AppTemplate", "BUILTIN_TEMPLATE_SLUGS", "get_builtin_template", "get_builtin_templates",
+    "get_builtin_template_bytes", "get_builtin_template_etag",
     "NotificationChannel", "AlertRule", "Alert", "NotificationLog",
-    "ChannelType", "AlertSeverity", "AlertStatus", "DEFAULT_ALERT_RULES",
-    "AuditLog", "AuditAction", "UserSession",
+    "ChannelType", "AlertSeverity", "AlertStatus", "AlertRuleDefault", "DEFAULT_ALERT_RULES",
+    "AuditLog", "AuditAction", "UserAgentString", "UserSession",
     "Webhook", "WebhookEvent", "WebhookEventType", "WEBHOOK_TEMPLATES",
 ]
@@ -4,7 +4,16 @@ Templates define blocks, commands, and layouts for specific applications
 like CrowdSec, Pi-hole, Portainer, etc.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import orjson
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, FetchedValue, text, and_, or_
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -17,8 +26,8 @@ class AppTemplate(Base):
 
     # Template identification
     name = Column(String(100), nullable=False)  # e.g., "CrowdSec", "Pi-hole"
-    slug = Column(String(100), unique=True, nullable=False, index=True)  # e.g., "crowdsec"
-    description = Column(Text, nullable=True)
+    slug = Column(String(100), nullable=False)  # e.g., "crowdsec" (unique per is_builtin, see indexes)
+    description = Column(String(500), nullable=True)  # Short summary, kept inline in the row
     icon = Column(String(100), nullable=True)  # Icon name or URL
 
     # Version and authorship
@@ -27,9 +36,13 @@ class AppTemplate(Base):
 
     # Template content
     # Schema for configuration variables (container name, paths, etc.)
-    config_schema = Column(JSON, nullable=True, default=dict)
+    config_schema = Column(JSONB, nullable=True, server_default=text("'{}'::jsonb"))
     # Default blocks with their configurations
-    blocks = Column(JSON, nullable=False, default=list)
+    blocks = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    # Distinct block types found in blocks (denormalized for indexed search)
+    block_types = Column(ARRAY(String(50)), nullable=False, default=list)
+    # SHA-256 of blocks + config_schema, used for HTTP ETags
+    content_hash = Column(String(64), nullable=True)
 
     # Community features
     is_builtin = Column(Boolean, default=False)  # Built-in system template
@@ -39,710 +52,162 @@ class AppTemplate(Base):
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-
-
-# Default CrowdSec template
-CROWDSEC_TEMPLATE = {
-    "name": "CrowdSec",
-    "slug": "crowdsec",
-    "description": "Dashboard pour CrowdSec Security Engine - Visualisez les bans, alertes, allowlists et gérez les décisions",
-    "icon": "IconShield",
-    "version": "2.2.0",
-    "author": "System",
-    "is_builtin": True,
-    "config_schema": {
-        "container_name": {
-            "type": "string",
-            "label": "Nom du conteneur",
-            "required": True,
-            "default": "crowdsec",
-            "description": "Nom du conteneur Docker CrowdSec"
-        }
-    },
-    "blocks": [
-        # Row 1: Counters
-        {
-            "id": "counter-bans",
-            "type": "counter",
-            "title": "IPs Bannies",
-            "position": {"x": 0, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli decisions list -o json 2>/dev/null | jq 'length' || echo 0",
-                "parser": "number",
-                "icon": "IconBan",
-                "color": "red",
-                "refresh_interval": 30
-            }
-        },
-        {
-            "id": "counter-alerts",
-            "type": "counter",
-            "title": "Alertes (24h)",
-            "position": {"x": 2, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli alerts list -o json 2>/dev/null | jq 'length' || echo 0",
-                "parser": "number",
-                "icon": "IconAlertTriangle",
-                "color": "orange",
-                "refresh_interval": 30
-            }
-        },
-        {
-            "id": "counter-allowlists",
-            "type": "counter",
-            "title": "Allowlists",
-            "position": {"x": 4, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli allowlists list -o json 2>/dev/null | jq 'length' || echo 0",
-                "parser": "number",
-                "icon": "IconShieldCheck",
-                "color": "green",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-bouncers",
-            "type": "counter",
-            "title": "Bouncers",
-            "position": {"x": 6, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli bouncers list -o json 2>/dev/null | jq 'length' || echo 0",
-                "parser": "number",
-                "icon": "IconShieldOff",
-                "color": "blue",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-machines",
-            "type": "counter",
-            "title": "Machines",
-            "position": {"x": 8, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli machines list -o json 2>/dev/null | jq 'length' || echo 0",
-                "parser": "number",
-                "icon": "IconServer",
-                "color": "violet",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-collections",
-            "type": "counter",
-            "title": "Collections",
-            "position": {"x": 10, "y": 0, "w": 2, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} cscli collections list -o json 2>/dev/null | jq '[.[] | select(.status == \"enabled\")] | length' || echo 0",
-                "parser": "number",
-                "icon": "IconPackage",
-                "color": "cyan",
-                "refresh_interval": 120
-            }
-        },
-        # Row 2: Decisions table + Actions
-        {
-            "id": "table-decisions",
-            "type": "table",
-            "title": "Décisions Actives (Bans)",
-            "position": {"x": 0, "y": 2, "w": 8, "h": 5},
-            "config": {
-                "command": "docker exec {{container_name}} cscli decisions list -o json 2>/dev/null || echo '[]'",
-                "parser": "json",
-                "refresh_interval": 30,
-                "columns": [
-                    {"key": "source.ip", "label": "IP/Range", "width": "150px"},
-                    {"key": "scenario", "label": "Scénario", "width": "200px"},
-                    {"key": "decisions.0.origin", "label": "Origine", "width": "80px"},
-                    {"key": "source.scope", "label": "Scope", "width": "60px"},
-                    {"key": "decisions.0.duration", "label": "Durée restante", "width": "120px"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "unban",
-                        "label": "Débannir",
-                        "icon": "IconLockOpen",
-                        "color": "green",
-                        "command": "docker exec {{container_name}} cscli decisions delete --ip {{row.source.ip}}",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir débannir {{row.source.ip}} ?"
-                    }
-                ]
-            }
-        },
-        {
-            "id": "actions-main",
-            "type": "actions",
-            "title": "Actions",
-            "position": {"x": 8, "y": 2, "w": 4, "h": 5},
-            "config": {
-                "buttons": [
-                    {
-                        "id": "ban-ip",
-                        "label": "Bannir une IP",
-                        "icon": "IconBan",
-                        "color": "red",
-                        "command": "docker exec {{container_name}} cscli decisions add --ip {{input.ip}} --duration {{input.duration}} --reason '{{input.reason}}'",
-                        "inputs": [
-                            {"id": "ip", "label": "Adresse IP ou CIDR", "type": "text", "required": True, "placeholder": "192.168.1.100 ou 10.0.0.0/24"},
-                            {"id": "duration", "label": "Durée", "type": "select", "options": ["1h", "4h", "24h", "7d", "30d", "365d"], "default": "24h"},
-                            {"id": "reason", "label": "Raison", "type": "text", "default": "Manual ban"}
-                        ],
-                        "confirm": True
-                    },
-                    {
-                        "id": "create-allowlist",
-                        "label": "Créer une Allowlist",
-                        "icon": "IconShieldPlus",
-                        "color": "green",
-                        "command": "docker exec {{container_name}} cscli allowlists create '{{input.name}}' --description '{{input.description}}'",
-                        "inputs": [
-                            {"id": "name", "label": "Nom de l'allowlist", "type": "text", "required": True, "placeholder": "trusted-ips"},
-                            {"id": "description", "label": "Description", "type": "text", "default": "Liste d'IPs de confiance"}
-                        ],
-                        "confirm": True
-                    },
-                    {
-                        "id": "update-hub",
-                        "label": "Mettre à jour le hub",
-                        "icon": "IconRefresh",
-                        "color": "blue",
-                        "command": "docker exec {{container_name}} cscli hub update",
-                        "confirm": True,
-                        "confirm_message": "Voulez-vous mettre à jour le hub CrowdSec ?"
-                    },
-                    {
-                        "id": "upgrade-collections",
-                        "label": "Upgrade collections",
-                        "icon": "IconArrowUp",
-                        "color": "cyan",
-                        "command": "docker exec {{container_name}} cscli hub upgrade",
-                        "confirm": True
-                    }
-                ]
-            }
-        },
-        # Row 3: Allowlists table
-        {
-            "id": "table-allowlists",
-            "type": "table",
-            "title": "Allowlists (Groupes)",
-            "position": {"x": 0, "y": 7, "w": 6, "h": 5},
-            "config": {
-                "command": "docker exec {{container_name}} cscli allowlists list -o json 2>/dev/null | jq '[.[] | {name: .name, description: .description, items_count: (.items | length), created_at: .created_at}]' || echo '[]'",
-                "parser": "json",
-                "refresh_interval": 60,
-                "columns": [
-                    {"key": "name", "label": "Nom", "width": "150px"},
-                    {"key": "description", "label": "Description"},
-                    {"key": "items_count", "label": "IPs", "width": "60px"},
-                    {"key": "created_at", "label": "Créée le", "format": "datetime", "width": "140px"}
-                ],
-                "header_action": {
-                    "id": "create-allowlist",
-                    "label": "Créer un groupe",
-                    "icon": "IconPlus",
-                    "color": "green",
-                    "command": "docker exec {{container_name}} cscli allowlists create '{{input.name}}' -d '{{input.description}}'",
-                    "inputs": [
-                        {"id": "name", "label": "Nom du groupe", "type": "text", "required": True, "placeholder": "trusted-ips"},
-                        {"id": "description", "label": "Description", "type": "text", "default": "Liste d'IPs de confiance"}
-                    ],
-                    "confirm": True
-                },
-                "row_actions": [
-                    {
-                        "id": "add-to-allowlist",
-                        "label": "Ajouter une IP",
-                        "icon": "IconPlus",
-                        "color": "green",
-                        "command": "docker exec {{container_name}} cscli allowlists add '{{row.name}}' '{{input.ip}}' -d '{{input.comment}}'",
-                        "inputs": [
-                            {"id": "ip", "label": "IP ou CIDR", "type": "text", "required": True, "placeholder": "192.168.1.100 ou 10.0.0.0/24"},
-                            {"id": "comment", "label": "Commentaire", "type": "text", "default": "Ajout manuel"}
-                        ],
-                        "confirm": True
-                    },
-                    {
-                        "id": "delete-allowlist",
-                        "label": "Supprimer le groupe",
-                        "icon": "IconTrash",
-                        "color": "red",
-                        "command": "docker exec {{container_name}} cscli allowlists delete '{{row.name}}'",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir supprimer l'allowlist '{{row.name}}' et toutes ses IPs ?"
-                    }
-                ]
-            }
-        },
-        # Row 3b: Allowlist items (IPs whitelistées)
-        {
-            "id": "table-allowlist-items",
-            "type": "table",
-            "title": "IPs Whitelistées",
-            "position": {"x": 6, "y": 7, "w": 6, "h": 5},
-            "config": {
-                "command": "docker exec {{container_name}} cscli allowlists list -o json 2>/dev/null | jq '[.[] | .name as $list | (.items // [])[] | {allowlist: $list, value: .value, description: .description, created_at: .created_at}]' || echo '[]'",
-                "parser": "json",
-                "refresh_interval": 60,
-                "columns": [
-                    {"key": "allowlist", "label": "Groupe", "width": "120px"},
-                    {"key": "value", "label": "IP/CIDR", "width": "150px"},
-                    {"key": "description", "label": "Description"},
-                    {"key": "created_at", "label": "Ajoutée le", "format": "datetime", "width": "140px"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "remove-from-allowlist",
-                        "label": "Retirer de la liste",
-                        "icon": "IconTrash",
-                        "color": "red",
-                        "command": "docker exec {{container_name}} cscli allowlists remove '{{row.allowlist}}' '{{row.value}}'",
-                        "confirm": True,
-                        "confirm_message": "Retirer {{row.value}} de l'allowlist '{{row.allowlist}}' ?"
-                    }
-                ]
-            }
-        },
-        # Row 4: Alerts table
-        {
-            "id": "table-alerts",
-            "type": "table",
-            "title": "Alertes Récentes",
-            "position": {"x": 0, "y": 12, "w": 12, "h": 5},
-            "config": {
-                "command": "docker exec {{container_name}} cscli alerts list -o json -l 20 2>/dev/null || echo '[]'",
-                "parser": "json",
-                "refresh_interval": 30,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "60px"},
-                    {"key": "source.ip", "label": "Source IP", "width": "130px"},
-                    {"key": "scenario", "label": "Scénario"},
-                    {"key": "events_count", "label": "Événements", "width": "100px"},
-                    {"key": "created_at", "label": "Date", "format": "datetime", "width": "150px"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "ban-alert-ip",
-                        "label": "Bannir cette IP",
-                        "icon": "IconBan",
-                        "color": "red",
-                        "command": "docker exec {{container_name}} cscli decisions add --ip {{row.source.ip}} --duration 24h --reason 'Manual ban from alert #{{row.id}}'",
-                        "confirm": True,
-                        "confirm_message": "Bannir {{row.source.ip}} pour 24h ?"
-                    },
-                    {
-                        "id": "whitelist-alert-ip",
-                        "label": "Whitelist cette IP",
-                        "icon": "IconShieldCheck",
-                        "color": "green",
-                        "command": "docker exec {{container_name}} cscli allowlists add 'trusted' '{{row.source.ip}}' -d 'Whitelisted from alert #{{row.id}}'",
-                        "confirm": True,
-                        "confirm_message": "Ajouter {{row.source.ip}} à la whitelist 'trusted' ?"
-                    },
-                    {
-                        "id": "delete-alert",
-                        "label": "Supprimer l'alerte",
-                        "icon": "IconTrash",
-                        "color": "orange",
-                        "command": "docker exec {{container_name}} cscli alerts delete --id {{row.id}}",
-                        "confirm": True
-                    }
-                ]
-            }
-        },
-        # Row 5: Logs
-        {
-            "id": "logs-crowdsec",
-            "type": "logs",
-            "title": "Logs CrowdSec",
-            "position": {"x": 0, "y": 17, "w": 12, "h": 4},
-            "config": {
-                "command": "docker logs --tail 50 {{container_name}} 2>&1",
-                "refresh_interval": 10,
-                "max_lines": 100,
-                "highlight_patterns": [
-                    {"pattern": "error|Error|ERROR", "color": "red"},
-                    {"pattern": "warning|Warning|WARN", "color": "orange"},
-                    {"pattern": "info|INFO", "color": "blue"},
-                    {"pattern": "ban|Ban|BAN", "color": "red", "bold": True},
-                    {"pattern": "allow|Allow|whitelist|Whitelist", "color": "green", "bold": True}
-                ]
-            }
-        }
-    ]
-}
-
-# Pi-hole template
-PIHOLE_TEMPLATE = {
-    "name": "Pi-hole",
-    "slug": "pihole",
-    "description": "Dashboard pour Pi-hole DNS blocker - Statistiques de requêtes et gestion des listes",
-    "icon": "IconCircleDot",
-    "version": "1.0.0",
-    "author": "System",
-    "is_builtin": True,
-    "config_schema": {
-        "container_name": {
-            "type": "string",
-            "label": "Nom du conteneur",
-            "required": True,
-            "default": "pihole",
-        },
-        "api_token": {
-            "type": "password",
-            "label": "Token API Pi-hole",
-            "required": False,
-            "description": "Token pour les actions d'administration (optionnel)"
-        }
-    },
-    "blocks": [
-        {
-            "id": "counter-queries",
-            "type": "counter",
-            "title": "Requêtes (24h)",
-            "position": {"x": 0, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} pihole -c -j 2>/dev/null | jq '.dns_queries_today' || echo 0",
-                "parser": "number",
-                "icon": "IconSearch",
-                "color": "blue",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-blocked",
-            "type": "counter",
-            "title": "Bloquées (24h)",
-            "position": {"x": 3, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} pihole -c -j 2>/dev/null | jq '.ads_blocked_today' || echo 0",
-                "parser": "number",
-                "icon": "IconShieldOff",
-                "color": "red",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-percent",
-            "type": "counter",
-            "title": "% Bloqué",
-            "position": {"x": 6, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} pihole -c -j 2>/dev/null | jq '.ads_percentage_today' || echo 0",
-                "parser": "number",
-                "icon": "IconPercentage",
-                "color": "green",
-                "suffix": "%",
-                "refresh_interval": 60
-            }
-        },
-        {
-            "id": "counter-domains",
-            "type": "counter",
-            "title": "Domaines bloqués",
-            "position": {"x": 9, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "docker exec {{container_name}} pihole -c -j 2>/dev/null | jq '.domains_being_blocked' || echo 0",
-                "parser": "number",
-                "icon": "IconList",
-                "color": "violet",
-                "refresh_interval": 300
-            }
-        }
-    ]
-}
-
-# Headscale template (VPN mesh network coordinator)
-HEADSCALE_TEMPLATE = {
-    "name": "Headscale",
-    "slug": "headscale",
-    "description": "Dashboard pour Headscale - Coordinateur VPN mesh Tailscale auto-hébergé. Gérez les utilisateurs, nodes, routes et clés d'accès.",
-    "icon": "IconNetwork",
-    "version": "1.2.0",
-    "author": "System",
-    "is_builtin": True,
-    "config_schema": {
-        "headscale_url": {
-            "type": "string",
-            "label": "URL Headscale",
-            "required": True,
-            "default": "http://localhost:8080",
-            "description": "URL de l'API Headscale (ex: http://headscale:8080 sans slash final)"
-        },
-        "api_key": {
-            "type": "password",
-            "label": "Clé API",
-            "required": True,
-            "description": "Clé API Headscale pour l'authentification"
-        }
-    },
-    "blocks": [
-        # Counters row
-        {
-            "id": "counter-users",
-            "type": "counter",
-            "title": "Utilisateurs",
-            "position": {"x": 0, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/user' | jq -r 'if .users then (.users | length) else 0 end'",
-                "parser": "number",
-                "icon": "IconUsers",
-                "color": "blue",
-                "refresh_interval": 30
-            }
-        },
-        {
-            "id": "counter-nodes",
-            "type": "counter",
-            "title": "Nodes",
-            "position": {"x": 3, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/node' | jq -r 'if .nodes then (.nodes | length) else 0 end'",
-                "parser": "number",
-                "icon": "IconDevices",
-                "color": "green",
-                "refresh_interval": 30
-            }
-        },
-        {
-            "id": "counter-online",
-            "type": "counter",
-            "title": "Nodes en ligne",
-            "position": {"x": 6, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/node' | jq -r 'if .nodes then [.nodes[] | select(.online == true)] | length else 0 end'",
-                "parser": "number",
-                "icon": "IconWifi",
-                "color": "teal",
-                "refresh_interval": 30
-            }
-        },
-        {
-            "id": "counter-routes",
-            "type": "counter",
-            "title": "Routes actives",
-            "position": {"x": 9, "y": 0, "w": 3, "h": 2},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/routes' | jq -r 'if .routes then [.routes[] | select(.enabled == true)] | length else 0 end'",
-                "parser": "number",
-                "icon": "IconRoute",
-                "color": "violet",
-                "refresh_interval": 30
-            }
-        },
-        # Users table
-        {
-            "id": "table-users",
-            "type": "table",
-            "title": "Utilisateurs",
-            "position": {"x": 0, "y": 2, "w": 6, "h": 4},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/user' | jq -r 'if .users then .users else [] end'",
-                "parser": "json",
-                "refresh_interval": 30,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "60px"},
-                    {"key": "name", "label": "Nom"},
-                    {"key": "createdAt", "label": "Créé le", "format": "datetime"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "delete-user",
-                        "label": "Supprimer",
-                        "icon": "IconTrash",
-                        "color": "red",
-                        "command": "curl -s -X DELETE -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/user/{{row.name}}'",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir supprimer l'utilisateur {{row.name}} ?"
-                    }
-                ]
-            }
-        },
-        # Actions block
-        {
-            "id": "actions-main",
-            "type": "actions",
-            "title": "Actions",
-            "position": {"x": 6, "y": 2, "w": 6, "h": 4},
-            "config": {
-                "buttons": [
-                    {
-                        "id": "create-user",
-                        "label": "Créer un utilisateur",
-                        "icon": "IconUserPlus",
-                        "color": "blue",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' -H 'Content-Type: application/json' -d '{\"name\": \"{{input.username}}\"}' '{{headscale_url}}/api/v1/user'",
-                        "inputs": [
-                            {"id": "username", "label": "Nom d'utilisateur", "type": "text", "required": True, "placeholder": "john"}
-                        ]
-                    },
-                    {
-                        "id": "create-preauth",
-                        "label": "Créer clé pré-auth",
-                        "icon": "IconKey",
-                        "color": "green",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' -H 'Content-Type: application/json' -d '{\"user\": \"{{input.user}}\", \"reusable\": {{input.reusable}}, \"ephemeral\": {{input.ephemeral}}}' '{{headscale_url}}/api/v1/preauthkey'",
-                        "inputs": [
-                            {"id": "user", "label": "Utilisateur", "type": "text", "required": True, "placeholder": "john"},
-                            {"id": "reusable", "label": "Réutilisable", "type": "select", "options": ["true", "false"], "default": "false"},
-                            {"id": "ephemeral", "label": "Éphémère", "type": "select", "options": ["true", "false"], "default": "false"}
-                        ]
-                    },
-                    {
-                        "id": "create-apikey",
-                        "label": "Créer clé API",
-                        "icon": "IconApi",
-                        "color": "violet",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' -H 'Content-Type: application/json' -d '{}' '{{headscale_url}}/api/v1/apikey'",
-                        "inputs": []
-                    }
-                ]
-            }
-        },
-        # Nodes table
-        {
-            "id": "table-nodes",
-            "type": "table",
-            "title": "Nodes",
-            "position": {"x": 0, "y": 6, "w": 12, "h": 5},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/node' | jq -r 'if .nodes then .nodes else [] end'",
-                "parser": "json",
-                "refresh_interval": 30,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "50px"},
-                    {"key": "givenName", "label": "Nom"},
-                    {"key": "user.name", "label": "Utilisateur", "width": "100px"},
-                    {"key": "ipAddresses.0", "label": "IP", "width": "120px"},
-                    {"key": "online", "label": "En ligne", "width": "80px", "format": "boolean"},
-                    {"key": "lastSeen", "label": "Dernière connexion", "format": "datetime"},
-                    {"key": "expiry", "label": "Expiration", "format": "datetime"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "rename-node",
-                        "label": "Renommer",
-                        "icon": "IconEdit",
-                        "color": "blue",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/node/{{row.id}}/rename/{{input.newname}}'",
-                        "inputs": [
-                            {"id": "newname", "label": "Nouveau nom", "type": "text", "required": True}
-                        ]
-                    },
-                    {
-                        "id": "delete-node",
-                        "label": "Supprimer",
-                        "icon": "IconTrash",
-                        "color": "red",
-                        "command": "curl -s -X DELETE -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/node/{{row.id}}'",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir supprimer le node {{row.givenName}} ?"
-                    }
-                ]
-            }
-        },
-        # Routes table
-        {
-            "id": "table-routes",
-            "type": "table",
-            "title": "Routes",
-            "position": {"x": 0, "y": 11, "w": 8, "h": 4},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/routes' | jq -r 'if .routes then .routes else [] end'",
-                "parser": "json",
-                "refresh_interval": 30,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "50px"},
-                    {"key": "node.givenName", "label": "Node"},
-                    {"key": "prefix", "label": "Préfixe (CIDR)"},
-                    {"key": "advertised", "label": "Annoncée", "width": "80px", "format": "boolean"},
-                    {"key": "enabled", "label": "Active", "width": "80px", "format": "boolean"},
-                    {"key": "isPrimary", "label": "Primaire", "width": "80px", "format": "boolean"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "enable-route",
-                        "label": "Activer",
-                        "icon": "IconCheck",
-                        "color": "green",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/routes/{{row.id}}/enable'",
-                        "confirm": True
-                    },
-                    {
-                        "id": "disable-route",
-                        "label": "Désactiver",
-                        "icon": "IconX",
-                        "color": "orange",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/routes/{{row.id}}/disable'",
-                        "confirm": True
-                    }
-                ]
-            }
-        },
-        # API Keys table
-        {
-            "id": "table-apikeys",
-            "type": "table",
-            "title": "Clés API",
-            "position": {"x": 8, "y": 11, "w": 4, "h": 4},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/apikey' | jq -r 'if .apiKeys then .apiKeys else [] end'",
-                "parser": "json",
-                "refresh_interval": 60,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "50px"},
-                    {"key": "prefix", "label": "Préfixe"},
-                    {"key": "expiration", "label": "Expiration", "format": "datetime"},
-                    {"key": "createdAt", "label": "Créé le", "format": "datetime"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "expire-apikey",
-                        "label": "Expirer",
-                        "icon": "IconClock",
-                        "color": "red",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' -H 'Content-Type: application/json' -d '{\"prefix\": \"{{row.prefix}}\"}' '{{headscale_url}}/api/v1/apikey/expire'",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir expirer cette clé API ?"
-                    }
-                ]
-            }
-        },
-        # Pre-auth keys table
-        {
-            "id": "table-preauthkeys",
-            "type": "table",
-            "title": "Clés Pré-authentification",
-            "position": {"x": 0, "y": 15, "w": 12, "h": 4},
-            "config": {
-                "command": "curl -s -H 'Authorization: Bearer {{api_key}}' '{{headscale_url}}/api/v1/preauthkey?all=true' | jq -r 'if .preAuthKeys then .preAuthKeys else [] end'",
-                "parser": "json",
-                "refresh_interval": 60,
-                "columns": [
-                    {"key": "id", "label": "ID", "width": "50px"},
-                    {"key": "user", "label": "Utilisateur"},
-                    {"key": "key", "label": "Clé", "width": "200px"},
-                    {"key": "reusable", "label": "Réutilisable", "width": "100px", "format": "boolean"},
-                    {"key": "ephemeral", "label": "Éphémère", "width": "80px", "format": "boolean"},
-                    {"key": "used", "label": "Utilisée", "width": "80px", "format": "boolean"},
-                    {"key": "expiration", "label": "Expiration", "format": "datetime"}
-                ],
-                "row_actions": [
-                    {
-                        "id": "expire-preauth",
-                        "label": "Expirer",
-                        "icon": "IconClock",
-                        "color": "red",
-                        "command": "curl -s -X POST -H 'Authorization: Bearer {{api_key}}' -H 'Content-Type: application/json' -d '{\"user\": \"{{row.user}}\", \"key\": \"{{row.key}}\"}' '{{headscale_url}}/api/v1/preauthkey/expire'",
-                        "confirm": True,
-                        "confirm_message": "Êtes-vous sûr de vouloir expirer cette clé pré-auth ?"
-                    }
-                ]
-            }
-        }
-    ]
-}
-
-# All built-in templates
-BUILTIN_TEMPLATES = [CROWDSEC_TEMPLATE, PIHOLE_TEMPLATE, HEADSCALE_TEMPLATE]
+    # Set by the app_templates_touch_updated_at trigger when template content changes
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())
+
+    # GIN indexes so containment queries (blocks @> '[{"type": "logs"}]') use an index
+    __table_args__ = (
+        Index(
+            'ix_app_templates_blocks_gin', 'blocks',
+            postgresql_using='gin', postgresql_ops={'blocks': 'jsonb_path_ops'},
+        ),
+        Index(
+            'ix_app_templates_config_schema_gin', 'config_schema',
+            postgresql_using='gin', postgresql_ops={'config_schema': 'jsonb_path_ops'},
+        ),
+        Index('ix_app_templates_block_types_gin', 'block_types', postgresql_using='gin'),
+        # Slug uniqueness is split into partial indexes so user/community template
+        # lookups hit a small index that builtins don't bloat
+        Index(
+            'ix_app_templates_slug_user', 'slug', unique=True,
+            postgresql_where=text('is_builtin = false'),
+        ),
+        Index(
+            'ix_app_templates_slug_builtin', 'slug', unique=True,
+            postgresql_where=text('is_builtin = true'),
+        ),
+    )
+
+    @classmethod
+    def slug_filter(cls, slug: str, is_builtin: Optional[bool] = None):
+        """
+        Filter on slug with an is_builtin predicate, so PostgreSQL can use the matching
+        partial index. Without is_builtin, templates of both kinds match (one OR branch
+        per partial index).
+        """
+        if is_builtin is None:
+            return or_(cls.slug_filter(slug, True), cls.slug_filter(slug, False))
+        return and_(cls.slug == slug, cls.is_builtin == is_builtin)
+
+    @classmethod
+    def has_block_type(cls, block_type: str):
+        """
+        Filter on templates containing a block of the given type.
+        Uses array containment on block_types, served by ix_app_templates_block_types_gin.
+        """
+        return cls.block_types.contains([block_type])
+
+    @validates("blocks", "config_schema")
+    def _sync_derived_fields(self, key, value):
+        """Keep block_types and content_hash in sync whenever blocks or config_schema is assigned."""
+        blocks = value if key == "blocks" else self.blocks
+        config_schema = value if key == "config_schema" else self.config_schema
+        if key == "blocks":
+            self.block_types = sorted({
+                block["type"] for block in blocks or []
+                if isinstance(block, dict) and block.get("type")
+            })
+        self.content_hash = compute_content_hash(blocks, config_schema)
+        return value
+
+
+def compute_content_hash(blocks: Any, config_schema: Any) -> str:
+    """Stable SHA-256 of a template's content (key order independent)."""
+    payload = orjson.dumps(
+        {"blocks": blocks or [], "config_schema": config_schema or {}},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def template_etag(content_hash: str, updated_at) -> str:
+    """
+    Weak ETag from the content hash and updated_at.
+    updated_at covers metadata (name, description, ...) which isn't part of the hash.
+    """
+    version = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    return f'W/"{content_hash}.{version}"'
+
+
+def template_list_etag(
+    count: int, max_id: Optional[int], last_updated_at, downloads: int, pending_downloads: Dict[int, int],
+) -> str:
+    """
+    Weak ETag for a template listing, from an aggregate over the listed rows.
+    updated_at is only set on UPDATE, so max(id) catches a delete followed by an insert
+    that leaves the count unchanged. updated_at isn't touched by download counts either,
+    so their total (flushed + pending in Redis) is included.
+    """
+    version = int(last_updated_at.timestamp() * 1_000_000) if last_updated_at else 0
+    state = f"{count}.{max_id or 0}.{version}.{downloads or 0}.{sorted(pending_downloads.items())}"
+    return 'W/"%s"' % hashlib.blake2b(state.encode(), digest_size=8).hexdigest()
+
+
+# Built-in templates are stored as JSON files next to this module and only
+# parsed the first time they are requested.
+BUILTIN_TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+BUILTIN_TEMPLATE_SLUGS = ("crowdsec", "pihole", "headscale")
+
+
+def _intern_strings(value: Any) -> Any:
+    """
+    Recursively intern the strings of a parsed template.
+    Templates repeat the same values a lot ("docker exec {{container_name}} ...",
+    icon and color names, formats), so they end up sharing one object each.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern_strings(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v) for v in value]
+    return value
+
+
+def resolve_refs(template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace {"$ref": "<name>"} objects with the matching entry of the
+    template's top-level "fragments" registry (removed from the result).
+    Resolved fragments share one object, so the tree must be treated as read-only.
+    """
+    fragments = template.pop("fragments", None)
+    if not fragments:
+        return template
+
+    stack: List[Any] = [template]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, dict) and "$ref" in value:
+                ref = value["$ref"]
+                if ref not in fragments:
+                    raise ValueError(f"Unknown template fragment: {ref}")
+                node[key] = fragments[ref]
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return template
+
+
+@lru_cache(maxsize=None)
+def get_builtin_template(slug: str) -> Dict[str, Any]:
+    """Load a built-in template definition by slug, with fragment refs resolved (cached after first load)."""
+    with open(os.path.join(BUILTIN_TEMPLATES_DIR, f"{slug}.json"), "rb") as f:
+        return resolve_refs(_intern_strings(orjson.loads(f.read())))
+
+
+@lru_cache(maxsize=None)
+def get_builtin_template_bytes(slug: str) -> bytes:
+    """Get a built-in template pre-serialized as compact JSON bytes, refs resolved (computed once)."""
+    return orjson.dumps(get_builtin_template(slug))
+
+
+@lru_cache(maxsize=None)
+def get_builtin_template_etag(slug: str) -> str:
+    """ETag of a built-in template's served bytes (fixed for the life of the process)."""
+    return '"%s"' % hashlib.blake2b(get_builtin_template_bytes(slug), digest_size=8).hexdigest()
+
+
+def get_builtin_templates() -> List[Dict[str, Any]]:
+    """Get all built-in template definitions."""
+    return [get_builtin_template(slug) for slug in BUILTIN_TEMPLATE_SLUGS]
@@ -3,15 +3,19 @@ Audit Log model for tracking user actions.
 """
 
 import enum
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
-from app.core.database import Base
+from app.core.database import Base, enum_check_constraint
 
 
 class AuditAction(str, enum.Enum):
-    """Types of auditable actions."""
+    """
+    Types of auditable actions.
+    Stored as plain strings (the values) in audit_logs.action, restricted by a CHECK constraint.
+    """
     # Auth
     LOGIN = "login"
     LOGIN_FAILED = "login_failed"
@@ -67,23 +71,52 @@ class AuditAction(str, enum.Enum):
     SETTINGS_CHANGED = "settings_changed"
 
 
+class UserAgentString(Base):
+    """
+    Deduplicated User-Agent strings referenced by audit logs.
+    The same few browsers account for almost every audit row, so rows store
+    an id instead of repeating up to 500 characters.
+    """
+    __tablename__ = "user_agent_strings"
+
+    id = Column(Integer, primary_key=True)
+    sha = Column(LargeBinary(16), nullable=False, unique=True)  # First 16 bytes of SHA-256(value)
+    value = Column(Text, nullable=False)
+
+
 class AuditLog(Base):
     """Model for audit logs."""
     __tablename__ = "audit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    action = Column(Enum(AuditAction), nullable=False, index=True)
+    action = Column(String(32), nullable=False, index=True)
     resource_type = Column(String(50), nullable=True)  # user, server, app, etc.
     resource_id = Column(Integer, nullable=True)
     resource_name = Column(String(255), nullable=True)
-    details = Column(JSON, nullable=True)  # Additional context
+    details = Column(JSONB, nullable=True)  # Additional context
     ip_address = Column(String(45), nullable=True)
-    user_agent = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    user_agent_id = Column(Integer, ForeignKey("user_agent_strings.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     user = relationship("User", backref="audit_logs")
+    user_agent_string = relationship("UserAgentString")
+
+    __table_args__ = (
+        enum_check_constraint("action", AuditAction, "audit_action_valid"),
+        # "Recent actions of user X": range scan, already in created_at order
+        Index("ix_audit_user_created", user_id, created_at.desc()),
+        # Containment queries on details (details @> '{"ip": "..."}')
+        Index(
+            "ix_audit_details_gin", details,
+            postgresql_using="gin", postgresql_ops={"details": "jsonb_path_ops"},
+        ),
+    )
+
+    @property
+    def user_agent(self):
+        return self.user_agent_string.value if self.user_agent_string else None
 
     def __repr__(self):
         return f"<AuditLog {self.id}: {self.action} by user {self.user_id}>"
@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 from sqlalchemy import Column, Integer, String, Boolean
 from app.core.database import Base
 
@@ -14,16 +16,23 @@ class Category(Base):
 
 
 # Default categories
-DEFAULT_CATEGORIES = [
-    {"slug": "media", "name": "Media", "icon": "mdi:play-circle", "order": 1},
-    {"slug": "productivity", "name": "Productivité", "icon": "mdi:briefcase", "order": 2},
-    {"slug": "admin", "name": "Administration", "icon": "mdi:cog", "order": 3},
-    {"slug": "monitoring", "name": "Monitoring", "icon": "mdi:chart-line", "order": 4},
-    {"slug": "network", "name": "Réseau", "icon": "mdi:network", "order": 5},
-    {"slug": "storage", "name": "Stockage", "icon": "mdi:database", "order": 6},
-    {"slug": "security", "name": "Sécurité", "icon": "mdi:shield", "order": 7},
-    {"slug": "development", "name": "Développement", "icon": "mdi:code-braces", "order": 8},
-    {"slug": "home", "name": "Domotique", "icon": "mdi:home-automation", "order": 9},
-    {"slug": "communication", "name": "Communication", "icon": "mdi:message", "order": 10},
-    {"slug": "other", "name": "Autres", "icon": "mdi:apps", "order": 99},
-]
+class CategoryDefault(NamedTuple):
+    slug: str
+    name: str
+    icon: str
+    order: int
+
+
+DEFAULT_CATEGORIES = (
+    CategoryDefault("media", "Media", "mdi:play-circle", 1),
+    CategoryDefault("productivity", "Productivité", "mdi:briefcase", 2),
+    CategoryDefault("admin", "Administration", "mdi:cog", 3),
+    CategoryDefault("monitoring", "Monitoring", "mdi:chart-line", 4),
+    CategoryDefault("network", "Réseau", "mdi:network", 5),
+    CategoryDefault("storage", "Stockage", "mdi:database", 6),
+    CategoryDefault("security", "Sécurité", "mdi:shield", 7),
+    CategoryDefault("development", "Développement", "mdi:code-braces", 8),
+    CategoryDefault("home", "Domotique", "mdi:home-automation", 9),
+    CategoryDefault("communication", "Communication", "mdi:message", 10),
+    CategoryDefault("other", "Autres", "mdi:apps", 99),
+)
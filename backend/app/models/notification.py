@@ -3,14 +3,18 @@ Notification models for alerts and notifications.
 Supports multiple channels: Email, Telegram, Push notifications.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from typing import Any, Dict, List, NamedTuple
 
-from app.core.database import Base
+from app.core.database import Base, enum_check_constraint
 
 
+# The enums below are stored as plain strings (their values), restricted by CHECK constraints.
+
 class ChannelType(str, enum.Enum):
     """Supported notification channel types."""
     EMAIL = "email"
@@ -46,19 +50,19 @@ class NotificationChannel(Base):
 
     # Channel info
     name = Column(String(100), nullable=False)  # e.g., "Mon Email", "Telegram perso"
-    channel_type = Column(SQLEnum(ChannelType), nullable=False)
+    channel_type = Column(String(20), nullable=False)
     is_enabled = Column(Boolean, default=True)
     is_default = Column(Boolean, default=False)  # Default channel for this type
 
     # Channel-specific configuration (encrypted sensitive data)
-    config = Column(JSON, nullable=False, default=dict)
+    config = Column(JSONB, nullable=False, default=dict)
     # For email: {"address": "user@example.com"}
     # For telegram: {"chat_id": "123456789", "bot_token": "..."}
     # For push: {"subscription": {...}}
     # For webhook: {"url": "https://...", "headers": {...}}
 
     # Filtering options
-    min_severity = Column(SQLEnum(AlertSeverity), default=AlertSeverity.WARNING)
+    min_severity = Column(String(20), default=AlertSeverity.WARNING.value)
 
     # Stats
     last_used_at = Column(DateTime(timezone=True), nullable=True)
@@ -72,6 +76,13 @@ class NotificationChannel(Base):
     # Relationships
     user = relationship("User", back_populates="notification_channels")
 
+    __table_args__ = (
+        enum_check_constraint("channel_type", ChannelType, "notification_channel_type_valid"),
+        enum_check_constraint("min_severity", AlertSeverity, "notification_channel_min_severity_valid"),
+        # A user's enabled channels, by type (notification dispatch)
+        Index("ix_channels_enabled", "user_id", "channel_type", postgresql_where=text("is_enabled")),
+    )
+
 
 class AlertRule(Base):
     """
@@ -101,7 +112,7 @@ class AlertRule(Base):
     # For threshold: {"metric": "cpu", "condition": ">", "threshold": 80}
 
     # Alert configuration
-    severity = Column(SQLEnum(AlertSeverity), default=AlertSeverity.WARNING)
+    severity = Column(String(20), default=AlertSeverity.WARNING.value)
     cooldown_minutes = Column(Integer, default=15)  # Min time between alerts
 
     # Notification channels (list of channel IDs)
@@ -124,6 +135,12 @@ class AlertRule(Base):
     server = relationship("Server")
     alerts = relationship("Alert", back_populates="rule", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        enum_check_constraint("severity", AlertSeverity, "alert_rule_severity_valid"),
+        # Enabled rules only (scanned by the alert check job on every tick)
+        Index("ix_alert_rules_enabled", "user_id", "rule_type", postgresql_where=text("is_enabled")),
+    )
+
 
 class Alert(Base):
     """
@@ -138,15 +155,16 @@ class Alert(Base):
     # Alert details
     title = Column(String(500), nullable=False)
     message = Column(Text, nullable=False)
-    severity = Column(SQLEnum(AlertSeverity), nullable=False)
-    status = Column(SQLEnum(AlertStatus), default=AlertStatus.ACTIVE)
+    severity = Column(String(20), nullable=False)
+    status = Column(String(20), default=AlertStatus.ACTIVE.value)
 
     # Context data (for debugging and display)
-    context = Column(JSON, default=dict)
+    context = Column(JSONB, default=dict)
     # e.g., {"ip": "1.2.3.4", "reason": "brute-force", "server": "prod-1"}
 
-    # Notification tracking
-    notifications_sent = Column(JSON, default=list)
+    # Notification tracking: deliveries are appended to notification_logs (see
+    # notifications_sent below); this column only holds results of older alerts
+    legacy_notifications_sent = Column("notifications_sent", JSON, default=list)
     # [{"channel_id": 1, "sent_at": "...", "success": true}, ...]
 
     # Resolution
@@ -162,6 +180,31 @@ class Alert(Base):
     # Relationships
     rule = relationship("AlertRule", back_populates="alerts")
     user = relationship("User", foreign_keys=[user_id])
+    notification_logs = relationship(
+        "NotificationLog", viewonly=True, order_by="NotificationLog.sent_at"
+    )
+
+    @property
+    def notifications_sent(self) -> List[Dict[str, Any]]:
+        """Delivery results per channel, read from the notification log."""
+        if not self.notification_logs:
+            return self.legacy_notifications_sent or []
+        return [
+            {
+                "channel_id": log.channel_id,
+                "sent_at": log.sent_at.isoformat() if log.sent_at else None,
+                "success": log.success,
+            }
+            for log in self.notification_logs
+        ]
+
+    __table_args__ = (
+        enum_check_constraint("severity", AlertSeverity, "alert_severity_valid"),
+        enum_check_constraint("status", AlertStatus, "alert_status_valid"),
+        # Alert list (newest first), with and without the status filter
+        Index("ix_alerts_user_created", user_id, created_at.desc()),
+        Index("ix_alerts_user_status_created", user_id, status, created_at.desc()),
+    )
 
 
 class NotificationLog(Base):
@@ -176,7 +219,7 @@ class NotificationLog(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Notification details
-    channel_type = Column(SQLEnum(ChannelType), nullable=False)
+    channel_type = Column(String(20), nullable=False)
     recipient = Column(String(500), nullable=False)  # email address, chat_id, etc.
     title = Column(String(500), nullable=False)
     message = Column(Text, nullable=False)
@@ -188,31 +231,46 @@ class NotificationLog(Base):
     # Timestamps
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        enum_check_constraint("channel_type", ChannelType, "notification_log_channel_type_valid"),
+        # Deliveries of an alert, in order
+        Index("ix_notification_logs_alert_sent", "alert_id", "sent_at"),
+    )
+
 
 # Default alert rule templates
-DEFAULT_ALERT_RULES = [
-    {
-        "name": "CrowdSec - Nouvelle IP bannie",
-        "rule_type": "crowdsec_ban",
-        "severity": "warning",
-        "source_config": {"container_name": "crowdsec"},
-        "title_template": "🚫 IP Bannie: {{ip}}",
-        "message_template": "L'IP {{ip}} a été bannie par CrowdSec.\n\nRaison: {{reason}}\nDurée: {{duration}}\nServeur: {{server_name}}"
-    },
-    {
-        "name": "Serveur inaccessible",
-        "rule_type": "server_down",
-        "severity": "critical",
-        "source_config": {},
-        "title_template": "🔴 Serveur DOWN: {{server_name}}",
-        "message_template": "Le serveur {{server_name}} ({{server_host}}) est inaccessible.\n\nDernière vérification: {{last_check}}"
-    },
-    {
-        "name": "Conteneur arrêté",
-        "rule_type": "container_down",
-        "severity": "error",
-        "source_config": {"container_name": ""},
-        "title_template": "⚠️ Conteneur arrêté: {{container_name}}",
-        "message_template": "Le conteneur {{container_name}} s'est arrêté sur {{server_name}}.\n\nStatut: {{status}}"
-    }
-]
+class AlertRuleDefault(NamedTuple):
+    name: str
+    rule_type: str
+    severity: str
+    source_config: Dict[str, Any]
+    title_template: str
+    message_template: str
+
+
+DEFAULT_ALERT_RULES = (
+    AlertRuleDefault(
+        name="CrowdSec - Nouvelle IP bannie",
+        rule_type="crowdsec_ban",
+        severity="warning",
+        source_config={"container_name": "crowdsec"},
+        title_template="🚫 IP Bannie: {{ip}}",
+        message_template="L'IP {{ip}} a été bannie par CrowdSec.\n\nRaison: {{reason}}\nDurée: {{duration}}\nServeur: {{server_name}}",
+    ),
+    AlertRuleDefault(
+        name="Serveur inaccessible",
+        rule_type="server_down",
+        severity="critical",
+        source_config={},
+        title_template="🔴 Serveur DOWN: {{server_name}}",
+        message_template="Le serveur {{server_name}} ({{server_host}}) est inaccessible.\n\nDernière vérification: {{last_check}}",
+    ),
+    AlertRuleDefault(
+        name="Conteneur arrêté",
+        rule_type="container_down",
+        severity="error",
+        source_config={"container_name": ""},
+        title_template="⚠️ Conteneur arrêté: {{container_name}}",
+        message_template="Le conteneur {{container_name}} s'est arrêté sur {{server_name}}.\n\nStatut: {{status}}",
+    ),
+)
@@ -4,7 +4,7 @@ Stores individual ping measurements with detailed metrics (latency, jitter, pack
 Used by the Uptime/Ping widget for SmokePing-style visualization.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Index
+from sqlalchemy import Column, Integer, String, Float, REAL, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -24,22 +24,23 @@ class PingHistory(Base):
     target_name = Column(String(100), nullable=True)  # Friendly name
     widget_id = Column(Integer, nullable=True, index=True)  # Associated widget (optional)
 
-    # Timestamp of measurement
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Timestamp of measurement (append-only, so indexed with BRIN, see below)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
-    # Latency metrics (in milliseconds)
-    latency_min = Column(Float, nullable=True)   # Minimum RTT
-    latency_avg = Column(Float, nullable=True)   # Average RTT
-    latency_max = Column(Float, nullable=True)   # Maximum RTT
-    latency_mdev = Column(Float, nullable=True)  # Standard deviation (for jitter calculation)
+    # Latency metrics (in milliseconds). Stored as 4-byte REAL: ping output has
+    # 3 decimals at most, well within single precision, and the table is large.
+    latency_min = Column(REAL, nullable=True)   # Minimum RTT
+    latency_avg = Column(REAL, nullable=True)   # Average RTT
+    latency_max = Column(REAL, nullable=True)   # Maximum RTT
+    latency_mdev = Column(REAL, nullable=True)  # Standard deviation (for jitter calculation)
 
     # Jitter (variation in latency) - calculated as mdev or difference between max/min
-    jitter = Column(Float, nullable=True)
+    jitter = Column(REAL, nullable=True)
 
     # Packet loss statistics
     packets_sent = Column(Integer, default=5)
     packets_received = Column(Integer, default=5)
-    packet_loss_percent = Column(Float, default=0.0)  # 0-100%
+    packet_loss_percent = Column(REAL, default=0.0)  # 0-100%
 
     # Status
     is_reachable = Column(Boolean, default=True)
@@ -49,9 +50,38 @@ class PingHistory(Base):
     __table_args__ = (
         Index('ix_ping_history_target_timestamp', 'target', 'timestamp'),
         Index('ix_ping_history_widget_timestamp', 'widget_id', 'timestamp'),
+        # Rows are inserted in time order: a block-range index serves the
+        # retention cleanup and time-range scans at a fraction of a btree's size
+        Index(
+            'brin_ping_history_timestamp', 'timestamp',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
     )
 
 
+class PingHistoryHourly(Base):
+    """
+    Hourly rollup of ping_history (one row per target, widget and hour).
+    Filled by PingHistoryService.rollup_hourly; long history ranges are read
+    from here instead of scanning every raw measurement.
+    """
+    __tablename__ = "ping_history_hourly"
+
+    target = Column(String(255), primary_key=True)
+    widget_id = Column(Integer, primary_key=True, default=0)  # 0 when the raw rows have no widget
+    bucket = Column(DateTime(timezone=True), primary_key=True)  # Start of the hour
+
+    measurements = Column(Integer, nullable=False, default=0)
+    outages = Column(Integer, nullable=False, default=0)  # Unreachable measurements
+
+    latency_min = Column(Float, nullable=True)
+    latency_avg = Column(Float, nullable=True)
+    latency_max = Column(Float, nullable=True)
+    jitter = Column(Float, nullable=True)
+    packet_loss_percent = Column(Float, nullable=True)
+
+
 class PingTarget(Base):
     """
     Stores ping target configurations.
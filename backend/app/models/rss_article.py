@@ -3,8 +3,13 @@ RSS Article model for storing feed articles and their read status.
 Articles are kept for 6 months after being read (archived).
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
+from typing import List, Optional
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, DateTime, Index, text, update
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql import func
 from app.core.database import Base
 
 
@@ -20,7 +25,7 @@ class RssArticle(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     # Widget association (nullable for shared feeds across tabs)
-    widget_id = Column(Integer, nullable=True, index=True)
+    widget_id = Column(Integer, nullable=True)
 
     # Article identification
     feed_url = Column(String(1024), nullable=False, index=True)
@@ -35,48 +40,104 @@ class RssArticle(Base):
 
     # Dates
     published_at = Column(DateTime, nullable=True)  # From feed
-    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    # Read status
-    is_read = Column(Boolean, default=False, nullable=False, index=True)
+    # Read/archive status (see STATUS_*): reading an article archives it, so a
+    # single column replaces the is_read/is_archived pair
+    STATUS_UNREAD = 0
+    STATUS_READ = 1
+    STATUS_ARCHIVED = 2
+    status = Column(SmallInteger, default=STATUS_UNREAD, server_default="0", nullable=False)
     read_at = Column(DateTime, nullable=True)  # When marked as read
-
-    # Archive management
-    is_archived = Column(Boolean, default=False, nullable=False, index=True)
     archived_at = Column(DateTime, nullable=True)
 
     # Composite index for efficient queries
     __table_args__ = (
-        Index('ix_rss_articles_widget_feed', 'widget_id', 'feed_url'),
+        # A widget's articles by publication date (also serves plain widget_id lookups)
+        Index('ix_rss_articles_widget_published', widget_id, published_at.desc().nullslast()),
         Index('ix_rss_articles_guid_feed', 'feed_url', 'article_guid', unique=True),
-        Index('ix_rss_articles_unread', 'widget_id', 'is_read', 'is_archived'),
+        # Unread widget articles, newest first: only the (few) unread rows are indexed,
+        # in the order the widget reads them
+        Index(
+            'ix_rss_articles_unread_partial', widget_id, published_at.desc().nullslast(),
+            postgresql_where=text('status = 0'),
+        ),
+        # Purge of old archived articles (RssService.cleanup_old_archives)
+        Index(
+            'ix_rss_articles_archive_purge', archived_at,
+            postgresql_where=text('status = 2'),
+        ),
     )
 
     def __repr__(self):
         return f"<RssArticle {self.id}: {self.title[:50]}...>"
 
+    @hybrid_property
+    def is_read(self):
+        return self.status >= self.STATUS_READ
+
+    @hybrid_property
+    def is_archived(self):
+        return self.status == self.STATUS_ARCHIVED
+
+    @classmethod
+    def mark_read(cls, session: Session, ids: List[int]) -> int:
+        """
+        Mark articles as read (and archive them) with a single UPDATE, without
+        loading them. Returns the number of rows updated.
+        """
+        if not ids:
+            return 0
+        now = datetime.utcnow()
+        result = session.execute(
+            update(cls)
+            .where(cls.id.in_(ids))
+            .values(status=cls.STATUS_ARCHIVED, read_at=now, archived_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     def mark_as_read(self):
         """Mark article as read and set read timestamp."""
-        self.is_read = True
-        self.read_at = datetime.utcnow()
-        self.is_archived = True
-        self.archived_at = datetime.utcnow()
-
-    def to_dict(self):
-        """Convert to dictionary for API response."""
-        return {
-            "id": self.id,
-            "widget_id": self.widget_id,
-            "feed_url": self.feed_url,
-            "article_guid": self.article_guid,
-            "article_url": self.article_url,
-            "title": self.title,
-            "summary": self.summary,
-            "author": self.author,
-            "image_url": self.image_url,
-            "published_at": self.published_at.isoformat() if self.published_at else None,
-            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
-            "is_read": self.is_read,
-            "read_at": self.read_at.isoformat() if self.read_at else None,
-            "is_archived": self.is_archived,
-        }
+        session = object_session(self)
+        self.mark_read(session, [self.id])
+        session.expire(self, ["status", "read_at", "archived_at"])
+
+
+@dataclass(slots=True)
+class RssArticleDTO:
+    """
+    Article as returned by the API, built from a column row (RssArticleDTO.COLUMNS)
+    without instantiating RssArticle. Serialized by orjson, datetimes included.
+    """
+    id: int
+    widget_id: Optional[int]
+    feed_url: str
+    article_guid: str
+    article_url: Optional[str]
+    title: str
+    summary: Optional[str]
+    author: Optional[str]
+    image_url: Optional[str]
+    published_at: Optional[datetime]
+    fetched_at: datetime
+    is_read: bool
+    read_at: Optional[datetime]
+    is_archived: bool
+
+    COLUMNS = (
+        RssArticle.id, RssArticle.widget_id, RssArticle.feed_url, RssArticle.article_guid,
+        RssArticle.article_url, RssArticle.title, RssArticle.summary, RssArticle.author,
+        RssArticle.image_url, RssArticle.published_at, RssArticle.fetched_at,
+        RssArticle.status, RssArticle.read_at,
+    )
+
+    @classmethod
+    def from_row(cls, row) -> "RssArticleDTO":
+        (article_id, widget_id, feed_url, article_guid, article_url, title, summary, author,
+         image_url, published_at, fetched_at, status, read_at) = row
+        return cls(
+            article_id, widget_id, feed_url, article_guid, article_url, title, summary, author,
+            image_url, published_at, fetched_at,
+            status >= RssArticle.STATUS_READ, read_at, status == RssArticle.STATUS_ARCHIVED,
+        )
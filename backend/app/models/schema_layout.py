@@ -2,7 +2,7 @@
 Schema layout model for storing node positions in the infrastructure visualization.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -18,8 +18,8 @@ class SchemaLayout(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     # Node identification
-    node_type = Column(String(20), nullable=False, index=True)  # 'npm', 'backend', 'app'
-    node_id = Column(Integer, nullable=False, index=True)  # ID of the npm/backend/app
+    node_type = Column(String(20), nullable=False)  # 'npm', 'backend', 'app'
+    node_id = Column(Integer, nullable=False)  # ID of the npm/backend/app
 
     # Position
     position_x = Column(Float, nullable=False, default=0)
@@ -32,8 +32,7 @@ class SchemaLayout(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    class Config:
-        # Unique constraint on node_type + node_id + user_id
-        __table_args__ = (
-            # Index for quick lookups
-        )
+    __table_args__ = (
+        # One position per node and user; user_id leads as layouts are loaded per user
+        Index('ix_schema_layout_lookup', 'user_id', 'node_type', 'node_id', unique=True),
+    )
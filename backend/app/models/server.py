@@ -4,6 +4,7 @@ Widgets can reference a server instead of duplicating SSH credentials.
 """
 
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -24,9 +25,10 @@ class Server(Base):
     ssh_port = Column(Integer, default=22)
     ssh_user = Column(String(100), default="root")
 
-    # Authentication (key or password)
-    ssh_key = Column(Text, nullable=True)  # Private key content (PEM format)
-    ssh_password = Column(String(255), nullable=True)  # Password (if no key)
+    # Authentication (key or password). Deferred: loaded together on first access only,
+    # so listings don't fetch key material; stored out of line (see run_migrations)
+    ssh_key = deferred(Column(Text, nullable=True), group="credentials")  # Private key content (PEM format)
+    ssh_password = deferred(Column(String(255), nullable=True), group="credentials")  # Password (if no key)
 
     # Optional features
     has_docker = Column(Boolean, default=False)  # Server has Docker installed
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 from app.core.database import Base
 
@@ -23,7 +24,18 @@ class Tab(Base):
 
     # Content configuration for custom tabs
     # Can contain: widgets, bookmarks, embedded content, etc.
-    content = Column(JSON, nullable=True)
+    # Deferred: only loaded when accessed (or undefer()ed by the endpoints that render it)
+    content = deferred(Column(JSONB, nullable=True))
+    # Number of widgets in content, kept by Postgres so listings don't need content
+    widget_count = Column(
+        Integer,
+        Computed(
+            "CASE WHEN jsonb_typeof(content -> 'widgets') = 'array' "
+            "THEN jsonb_array_length(content -> 'widgets') END",
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     # Visibility
     is_visible = Column(Boolean, default=True)
@@ -32,9 +44,22 @@ class Tab(Base):
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # null = system tab (default)
     is_public = Column(Boolean, default=False)  # If true, visible to all users
 
-    # Relationship to owner
-    owner = relationship("User", backref="tabs")
+    # Relationship to owner (shown with every shared tab, so loaded with the tab)
+    owner = relationship("User", back_populates="tabs", lazy="joined")
+    subscriptions = relationship(
+        "TabSubscription", back_populates="tab", lazy="raise", passive_deletes=True
+    )
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # A user's visible tabs in display order (tab bar, on every page load)
+        Index('ix_tabs_owner_visible_position', 'owner_id', 'is_visible', 'position'),
+        # Shared tabs listing: only public visible tabs, presorted
+        Index(
+            'ix_tabs_public_visible_position', 'position',
+            postgresql_where=text('is_public = true AND is_visible = true'),
+        ),
+    )
@@ -20,8 +20,8 @@ class TabSubscription(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    user = relationship("User", backref="tab_subscriptions")
-    tab = relationship("Tab", backref="subscriptions")
+    user = relationship("User", back_populates="tab_subscriptions", lazy="raise")
+    tab = relationship("Tab", back_populates="subscriptions", lazy="joined")
 
     # Ensure a user can only subscribe to a tab once
     __table_args__ = (
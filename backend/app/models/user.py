@@ -1,3 +1,12 @@
+"""
+User model.
+
+Loader strategies for the User relationships: none of them is needed when
+listing or authenticating users, so all collections are lazy="raise" and a
+route that does need one must ask for it (selectinload). Deletes rely on the
+foreign keys' ON DELETE CASCADE (passive_deletes) instead of loading them.
+"""
+
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -28,5 +37,19 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    notification_channels = relationship("NotificationChannel", back_populates="user", cascade="all, delete-orphan")
-    alert_rules = relationship("AlertRule", back_populates="user", cascade="all, delete-orphan")
+    notification_channels = relationship(
+        "NotificationChannel", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True,
+    )
+    alert_rules = relationship(
+        "AlertRule", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True,
+    )
+    # Collections below are never needed as a whole from a User: lazy loads raise, and
+    # dependents are removed by the database (ON DELETE CASCADE) or explicitly (tabs)
+    tabs = relationship("Tab", back_populates="owner", lazy="raise", passive_deletes="all")
+    tab_subscriptions = relationship(
+        "TabSubscription", back_populates="user", lazy="raise", passive_deletes=True
+    )
+    sessions = relationship("UserSession", back_populates="user", lazy="raise", passive_deletes=True)
+    webhooks = relationship("Webhook", back_populates="user", lazy="raise", passive_deletes=True)
@@ -3,8 +3,9 @@ User Session model for tracking active sessions.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, LargeBinary, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from app.core.database import Base
 
@@ -15,18 +16,28 @@ class UserSession(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    token_hash = Column(String(64), nullable=False, unique=True, index=True)  # SHA256 of JWT
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)  # Raw SHA256 digest of JWT
     device_info = Column(String(255), nullable=True)  # Browser/Device name
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(String(500), nullable=True)
     is_active = Column(Boolean, default=True)
-    last_activity = Column(DateTime, default=datetime.utcnow)
+    last_activity = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     revoked_at = Column(DateTime, nullable=True)
 
     # Relationships
-    user = relationship("User", backref="sessions")
+    user = relationship("User", back_populates="sessions", lazy="raise")
+
+    __table_args__ = (
+        # A user's active sessions, most recent activity first (revoked ones are never listed)
+        Index(
+            'ix_sessions_user_active', user_id, last_activity.desc(),
+            postgresql_where=text('is_active = true'),
+        ),
+        # Expired sessions cleanup (active or not)
+        Index('ix_sessions_expires', expires_at),
+    )
 
     def __repr__(self):
         return f"<UserSession {self.id}: user {self.user_id}>"
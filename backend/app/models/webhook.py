@@ -4,7 +4,8 @@ Webhook model for receiving external notifications.
 
 import secrets
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -86,8 +87,12 @@ class Webhook(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", backref="webhooks")
-    events = relationship("WebhookEvent", back_populates="webhook", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="webhooks", lazy="raise")
+    # Events can number in the thousands: never loaded through the webhook, deleted by the FK cascade
+    events = relationship(
+        "WebhookEvent", back_populates="webhook", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True,
+    )
 
     @staticmethod
     def generate_token() -> str:
@@ -117,8 +122,8 @@ class WebhookEvent(Base):
     source_ip = Column(String(45), nullable=True)
 
     # Raw data
-    headers = Column(JSON, nullable=True)  # Relevant headers (stripped of sensitive data)
-    payload = Column(JSON, nullable=True)  # Request body
+    headers = Column(JSONB, nullable=True)  # Relevant headers (stripped of sensitive data)
+    payload = Column(JSONB, nullable=True)  # Request body
 
     # Processing
     processed = Column(Boolean, default=False)
@@ -132,6 +137,14 @@ class WebhookEvent(Base):
     # Relationships
     webhook = relationship("Webhook", back_populates="events")
 
+    __table_args__ = (
+        # Containment filters on payload fields (payload @> '{"action": "opened"}')
+        Index(
+            'ix_webhook_events_payload_gin', 'payload',
+            postgresql_using='gin', postgresql_ops={'payload': 'jsonb_path_ops'},
+        ),
+    )
+
 
 # Pre-configured webhook templates for common services
 WEBHOOK_TEMPLATES = {
@@ -1,53 +1,60 @@
-from app.schemas.user import (
-    UserBase, UserCreate, UserLogin, UserResponse,
-    Token, TokenWithUser, TOTPSetup, TOTPVerify, LoginWith2FA,
-    UserUpdate, UserCreateByAdmin, RecoveryCodesResponse,
-    PasswordChange, ProfileUpdate
-)
-from app.schemas.category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse
-from app.schemas.application import (
-    ApplicationBase, ApplicationCreate, ApplicationUpdate,
-    ApplicationResponse, ApplicationWithCategory
-)
-from app.schemas.npm_instance import (
-    NpmInstanceBase, NpmInstanceCreate, NpmInstanceUpdate, NpmInstanceResponse
-)
-from app.schemas.widget import (
-    WidgetBase, WidgetCreate, WidgetUpdate, WidgetResponse, WidgetDataResponse
-)
-from app.schemas.tab import (
-    TabBase, TabCreate, TabUpdate, TabResponse, TabWithOwner, TabOwnerInfo
-)
-from app.schemas.server import (
-    ServerBase, ServerCreate, ServerUpdate, ServerResponse, ServerTestResult
-)
-from app.schemas.infrastructure import (
-    BackendBase, BackendCreate, BackendUpdate, BackendResponse,
-    BackendWithApps, ApplicationInSchema, NpmInstanceInSchema, InfrastructureSchema
-)
-from app.schemas.app_dashboard import (
-    AppTemplateBase, AppTemplateCreate, AppTemplateUpdate, AppTemplateResponse,
-    AppTemplateListItem, AppDashboardContent, DashboardBlock, BlockPosition,
-    ExecuteCommandRequest, ExecuteActionRequest, CommandResultResponse,
-    BlockDataRequest, BlockDataResponse, CreateAppDashboardTab, UpdateAppDashboardTab
-)
-
-__all__ = [
-    "UserBase", "UserCreate", "UserLogin", "UserResponse",
-    "Token", "TokenWithUser", "TOTPSetup", "TOTPVerify", "LoginWith2FA",
-    "UserUpdate", "UserCreateByAdmin", "RecoveryCodesResponse",
-    "PasswordChange", "ProfileUpdate",
-    "CategoryBase", "CategoryCreate", "CategoryUpdate", "CategoryResponse",
-    "ApplicationBase", "ApplicationCreate", "ApplicationUpdate",
-    "ApplicationResponse", "ApplicationWithCategory",
-    "NpmInstanceBase", "NpmInstanceCreate", "NpmInstanceUpdate", "NpmInstanceResponse",
-    "WidgetBase", "WidgetCreate", "WidgetUpdate", "WidgetResponse", "WidgetDataResponse",
-    "TabBase", "TabCreate", "TabUpdate", "TabResponse", "TabWithOwner", "TabOwnerInfo",
-    "ServerBase", "ServerCreate", "ServerUpdate", "ServerResponse", "ServerTestResult",
-    "BackendBase", "BackendCreate", "BackendUpdate", "BackendResponse",
-    "BackendWithApps", "ApplicationInSchema", "NpmInstanceInSchema", "InfrastructureSchema",
-    "AppTemplateBase", "AppTemplateCreate", "AppTemplateUpdate", "AppTemplateResponse",
-    "AppTemplateListItem", "AppDashboardContent", "DashboardBlock", "BlockPosition",
-    "ExecuteCommandRequest", "ExecuteActionRequest", "CommandResultResponse",
-    "BlockDataRequest", "BlockDataResponse", "CreateAppDashboardTab", "UpdateAppDashboardTab",
-]
+"""
+Pydantic schemas, re-exported lazily (PEP 562): `from app.schemas import X` only
+imports the submodule defining X, on first access.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "app.schemas.user": (
+        "UserBase", "UserCreate", "UserLogin", "UserResponse",
+        "Token", "TokenWithUser", "TOTPSetup", "TOTPVerify", "LoginWith2FA",
+        "UserUpdate", "UserCreateByAdmin", "RecoveryCodesResponse",
+        "PasswordChange", "ProfileUpdate",
+    ),
+    "app.schemas.category": ("CategoryBase", "CategoryCreate", "CategoryUpdate", "CategoryResponse"),
+    "app.schemas.application": (
+        "ApplicationBase", "ApplicationCreate", "ApplicationUpdate",
+        "ApplicationResponse", "ApplicationWithCategory",
+    ),
+    "app.schemas.npm_instance": (
+        "NpmInstanceBase", "NpmInstanceCreate", "NpmInstanceUpdate", "NpmInstanceResponse",
+    ),
+    "app.schemas.widget": (
+        "WidgetBase", "WidgetCreate", "WidgetUpdate", "WidgetResponse", "WidgetDataResponse",
+    ),
+    "app.schemas.tab": (
+        "TabBase", "TabCreate", "TabUpdate", "TabResponse", "TabWithOwner", "TabOwnerInfo",
+    ),
+    "app.schemas.server": (
+        "ServerBase", "ServerCreate", "ServerUpdate", "ServerResponse", "ServerTestResult",
+    ),
+    "app.schemas.infrastructure": (
+        "BackendBase", "BackendCreate", "BackendUpdate", "BackendResponse",
+        "BackendWithApps", "ApplicationInSchema", "NpmInstanceInSchema", "InfrastructureSchema",
+    ),
+    "app.schemas.app_dashboard": (
+        "AppTemplateBase", "AppTemplateCreate", "AppTemplateUpdate", "AppTemplateResponse",
+        "AppTemplateListItem", "AppTemplateListPage", "AppDashboardContent", "DashboardBlock",
+        "BlockPosition", "ExecuteCommandRequest", "ExecuteActionRequest", "CommandResultResponse",
+        "BlockDataRequest", "BlockDataResponse", "CreateAppDashboardTab", "UpdateAppDashboardTab",
+    ),
+}
+
+# Exported name -> defining submodule
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -2,14 +2,24 @@
 Schemas for App Dashboard feature.
 """
 
-from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional, Union
+import sys
+from functools import lru_cache
+
+import orjson
+from pydantic import AfterValidator, BaseModel, ConfigDict, Discriminator, Field, Tag, TypeAdapter, model_validator
+from pydantic.dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG
+
 
 # ============== Block Position ==============
+# Leaf value types repeated in every block (position, columns, inputs, patterns) are
+# frozen, slotted pydantic dataclasses: validated like models, without a per-instance __dict__.
 
-class BlockPosition(BaseModel):
+@dataclass(frozen=True, slots=True)
+class BlockPosition:
     """Position and size of a block in the grid."""
     x: int = 0
     y: int = 0
@@ -19,7 +29,8 @@ class BlockPosition(BaseModel):
 
 # ============== Block Actions ==============
 
-class ActionInput(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ActionInput:
     """Input field for an action button."""
     id: str
     label: str
@@ -55,7 +66,8 @@ class ActionButton(BaseModel):
 
 # ============== Block Configurations ==============
 
-class TableColumn(BaseModel):
+@dataclass(frozen=True, slots=True)
+class TableColumn:
     """Column definition for table block."""
     key: str
     label: str
@@ -63,16 +75,37 @@ class TableColumn(BaseModel):
     format: Optional[str] = None  # datetime, number, boolean, etc.
 
 
-class HighlightPattern(BaseModel):
+@dataclass(frozen=True, slots=True)
+class HighlightPattern:
     """Pattern for highlighting log lines."""
     pattern: str
     color: str
     bold: bool = False
 
 
-class CounterConfig(BaseModel):
+class HttpRequestConfig(BaseModel):
+    """In-process HTTP request for a block (alternative to a `curl | jq` command)."""
+    method: str = "GET"
+    url: str  # May contain {{variable}} placeholders
+    headers: Dict[str, str] = {}
+    body: Optional[str] = None
+    json_path: Optional[str] = None  # Dotted path into the JSON response (e.g. "users")
+
+
+class DataSourceConfig(BaseModel):
+    """Data source of a block: a shell command run over SSH, or an in-process HTTP request."""
+    command: Optional[str] = None
+    http: Optional[HttpRequestConfig] = None
+
+    @model_validator(mode='after')
+    def validate_source(self):
+        if not self.command and not self.http:
+            raise ValueError("Un bloc doit définir 'command' ou 'http'")
+        return self
+
+
+class CounterConfig(DataSourceConfig):
     """Configuration for counter block."""
-    command: str
     parser: str = "number"
     icon: Optional[str] = None
     color: Optional[str] = None
@@ -81,9 +114,28 @@ class CounterConfig(BaseModel):
     refresh_interval: int = 30
 
 
-class TableConfig(BaseModel):
+class CounterGroupItem(BaseModel):
+    """A single counter inside a counter group, read from one key of the shared result."""
+    key: str
+    title: str
+    icon: Optional[str] = None
+    color: Optional[str] = None
+    suffix: Optional[str] = None
+    prefix: Optional[str] = None
+
+
+class CounterGroupConfig(DataSourceConfig):
+    """
+    Configuration for counter_group block.
+    One command outputs a JSON object; each counter displays one of its keys.
+    """
+    parser: str = "json"
+    counters: List[CounterGroupItem]
+    refresh_interval: int = 30
+
+
+class TableConfig(DataSourceConfig):
     """Configuration for table block."""
-    command: str
     parser: str = "json"
     columns: List[TableColumn]
     refresh_interval: int = 30
@@ -92,9 +144,8 @@ class TableConfig(BaseModel):
     filterable: bool = True
 
 
-class ChartConfig(BaseModel):
+class ChartConfig(DataSourceConfig):
     """Configuration for chart block."""
-    command: str
     parser: str = "json"
     chart_type: str = "line"  # line, bar, pie, doughnut, area
     x_key: Optional[str] = None
@@ -124,12 +175,16 @@ class ActionsConfig(BaseModel):
 class DashboardBlock(BaseModel):
     """A block in the dashboard grid."""
     id: str
-    type: str  # counter, table, chart, logs, actions
+    type: str  # counter, counter_group, table, chart, logs, actions
     title: str
     position: BlockPosition
     config: Dict[str, Any]  # Type-specific config
 
 
+# Validator/serializer for a whole block list, built once (bulk dump of validated blocks)
+DASHBOARD_BLOCKS = TypeAdapter(List[DashboardBlock])
+
+
 # ============== App Template Schemas ==============
 
 class ConfigSchemaField(BaseModel):
@@ -146,7 +201,7 @@ class AppTemplateBase(BaseModel):
     """Base schema for app template."""
     name: str
     slug: str
-    description: Optional[str] = None
+    description: Optional[str] = Field(None, max_length=500)
     icon: Optional[str] = None
     version: str = "1.0.0"
     author: Optional[str] = None
@@ -163,7 +218,7 @@ class AppTemplateCreate(AppTemplateBase):
 class AppTemplateUpdate(BaseModel):
     """Schema for updating a template."""
     name: Optional[str] = None
-    description: Optional[str] = None
+    description: Optional[str] = Field(None, max_length=500)
     icon: Optional[str] = None
     version: Optional[str] = None
     config_schema: Optional[Dict[str, Any]] = None
@@ -180,8 +235,7 @@ class AppTemplateResponse(AppTemplateBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class AppTemplateListItem(BaseModel):
@@ -197,8 +251,99 @@ class AppTemplateListItem(BaseModel):
     is_community: bool
     downloads: int
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
+
+
+class AppTemplateListPage(BaseModel):
+    """One page of the template list, with the cursor of the next page (None on the last one)."""
+    items: List[AppTemplateListItem]
+    next_cursor: Optional[int] = None
+
+
+# ============== Template validation ==============
+
+# Blocks with their type-specific config model. Only used to validate definitions:
+# stored and served blocks keep config as a plain dict (DashboardBlock).
+
+class CounterBlock(DashboardBlock):
+    type: Literal["counter"]
+    config: CounterConfig
+
+
+class CounterGroupBlock(DashboardBlock):
+    type: Literal["counter_group"]
+    config: CounterGroupConfig
+
+
+class TableBlock(DashboardBlock):
+    type: Literal["table"]
+    config: TableConfig
+
+
+class ChartBlock(DashboardBlock):
+    type: Literal["chart"]
+    config: ChartConfig
+
+
+class LogsBlock(DashboardBlock):
+    type: Literal["logs"]
+    config: LogsConfig
+
+
+class ActionsBlock(DashboardBlock):
+    type: Literal["actions"]
+    config: ActionsConfig
+
+
+# Type-specific config models, by block type
+BLOCK_CONFIG_MODELS: Dict[str, type] = {
+    "counter": CounterConfig,
+    "counter_group": CounterGroupConfig,
+    "table": TableConfig,
+    "chart": ChartConfig,
+    "logs": LogsConfig,
+    "actions": ActionsConfig,
+}
+
+
+def _block_type_tag(block: Any) -> str:
+    """Discriminator: the block type, or "other" for types without a config model."""
+    block_type = block.get("type") if isinstance(block, dict) else getattr(block, "type", None)
+    return block_type if block_type in BLOCK_CONFIG_MODELS else "other"
+
+
+# Tagged union: pydantic-core picks the block model from the type in one lookup
+TypedDashboardBlock = Annotated[
+    Union[
+        Annotated[CounterBlock, Tag("counter")],
+        Annotated[CounterGroupBlock, Tag("counter_group")],
+        Annotated[TableBlock, Tag("table")],
+        Annotated[ChartBlock, Tag("chart")],
+        Annotated[LogsBlock, Tag("logs")],
+        Annotated[ActionsBlock, Tag("actions")],
+        Annotated[DashboardBlock, Tag("other")],
+    ],
+    Discriminator(_block_type_tag),
+]
+TYPED_DASHBOARD_BLOCKS = TypeAdapter(List[TypedDashboardBlock])
+
+
+def validate_block_configs(blocks: List[Dict[str, Any]]) -> None:
+    """
+    Validate block dicts including their type-specific config (DashboardBlock only
+    checks that config is a dict). Raises pydantic.ValidationError.
+    """
+    TYPED_DASHBOARD_BLOCKS.validate_python(blocks)
+
+
+def validate_template_definition(data: Dict[str, Any]) -> AppTemplateCreate:
+    """
+    Validate a full template definition, including each block's type-specific config.
+    Raises pydantic.ValidationError.
+    """
+    template = AppTemplateCreate.model_validate(data)
+    validate_block_configs(data.get("blocks") or [])
+    return template
 
 
 # ============== Dashboard Content (stored in Tab.content) ==============
@@ -215,11 +360,20 @@ class AppDashboardContent(BaseModel):
 
 # ============== Command Execution ==============
 
+def _intern_variable_names(variables: Dict[str, str]) -> Dict[str, str]:
+    """Intern variable names: the same few (container_name, host...) come back with every block fetch."""
+    return {sys.intern(name): value for name, value in variables.items()}
+
+
+# Template variables substituted in block commands/URLs: strings only
+TemplateVariables = Annotated[Dict[str, str], AfterValidator(_intern_variable_names)]
+
+
 class ExecuteCommandRequest(BaseModel):
     """Request to execute a command."""
     server_id: int
     command: str
-    variables: Dict[str, Any] = {}
+    variables: TemplateVariables = {}
     row: Optional[Dict[str, Any]] = None  # For row actions
     parser: str = "raw"
 
@@ -228,7 +382,7 @@ class ExecuteActionRequest(BaseModel):
     """Request to execute an action button."""
     server_id: int
     action: ActionButton
-    variables: Dict[str, Any] = {}
+    variables: TemplateVariables = {}
     inputs: Dict[str, str] = {}  # User-provided input values
 
 
@@ -246,7 +400,16 @@ class BlockDataRequest(BaseModel):
     """Request to fetch data for a block."""
     block: DashboardBlock
     server_id: int
-    variables: Dict[str, str] = {}
+    variables: TemplateVariables = {}
+
+    model_config = ConfigDict(frozen=True)
+
+
+class BlockDataBatchRequest(BaseModel):
+    """Request to fetch data for several blocks of the same dashboard."""
+    blocks: List[DashboardBlock]
+    server_id: int
+    variables: TemplateVariables = {}
 
 
 class BlockDataResponse(BaseModel):
@@ -255,7 +418,7 @@ class BlockDataResponse(BaseModel):
     success: bool
     data: Any = None
     error: Optional[str] = None
-    fetched_at: datetime = Field(default_factory=datetime.now)
+    fetched_at: datetime  # Set once per request by the fetch endpoints
 
 
 # ============== Dashboard Creation ==============
@@ -278,3 +441,21 @@ class UpdateAppDashboardTab(BaseModel):
     variables: Optional[Dict[str, str]] = None
     blocks: Optional[List[DashboardBlock]] = None
     layout: Optional[List[Dict[str, Any]]] = None
+
+
+# ============== JSON Schemas ==============
+
+# Models describing a template definition, for template editors and code generators
+DASHBOARD_SCHEMA_MODELS = (
+    BlockPosition, ActionInput, RowAction, ActionButton, TableColumn, HighlightPattern,
+    HttpRequestConfig, CounterConfig, CounterGroupItem, CounterGroupConfig, TableConfig,
+    ChartConfig, LogsConfig, ActionsConfig, DashboardBlock, ConfigSchemaField, AppTemplateCreate,
+)
+
+
+@lru_cache(maxsize=None)
+def get_dashboard_schemas_json() -> bytes:
+    """JSON Schemas of the template definition models, by model name (built once)."""
+    return orjson.dumps({
+        model.__name__: TypeAdapter(model).json_schema() for model in DASHBOARD_SCHEMA_MODELS
+    })
@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
+from app.schemas.category import CategoryResponse
+from app.schemas.base import ORM_CONFIG
+
 
 class ApplicationBase(BaseModel):
     name: str
@@ -44,13 +47,8 @@ class ApplicationResponse(ApplicationBase):
     updated_at: Optional[datetime]
     last_synced_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class ApplicationWithCategory(ApplicationResponse):
-    category: Optional["CategoryResponse"] = None
-
-
-from app.schemas.category import CategoryResponse
-ApplicationWithCategory.model_rebuild()
+    category: Optional[CategoryResponse] = None
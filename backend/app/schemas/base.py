@@ -0,0 +1,41 @@
+"""
+Configuration and helpers shared by the schemas.
+"""
+
+import re
+from typing import Annotated, Any, Type, TypeVar
+
+from pydantic import AfterValidator, BaseModel, ConfigDict
+
+# Response schemas built from ORM objects (response_model / model_validate on rows).
+# One shared (read-only) config instead of an inner `class Config` per model.
+ORM_CONFIG = ConfigDict(from_attributes=True)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)+")
+
+
+def _check_email(value: str) -> str:
+    """Check the address shape and lowercase the domain (as EmailStr normalized it)."""
+    value = value.strip()
+    if not _EMAIL_RE.fullmatch(value):
+        raise ValueError("Adresse email invalide")
+    local, domain = value.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+# Email address: a compiled regex check instead of EmailStr's full RFC parse (email-validator)
+Email = Annotated[str, AfterValidator(_check_email)]
+
+
+def construct_from_orm(model: Type[ModelT], obj: Any, **values: Any) -> ModelT:
+    """
+    Build a response model from a row of our own tables with model_construct, skipping
+    validation: the row was validated on write. Nested models aren't built, so pass them
+    (already constructed) in `values`. Never use it for request data.
+    """
+    for name in model.model_fields:
+        if name not in values:
+            values[name] = getattr(obj, name)
+    return model.model_construct(**values)
@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional
 
+from app.schemas.base import ORM_CONFIG
+
 
 class CategoryBase(BaseModel):
     slug: str
@@ -24,5 +26,4 @@ class CategoryUpdate(BaseModel):
 class CategoryResponse(CategoryBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
@@ -6,6 +6,8 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG
+
 
 class NodePosition(BaseModel):
     """Position of a node in the schema."""
@@ -62,8 +64,7 @@ class BackendResponse(BackendBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class ApplicationInSchema(BaseModel):
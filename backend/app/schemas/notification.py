@@ -3,10 +3,14 @@ Pydantic schemas for notification system.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, EmailStr
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel, Field
 
 from app.models.notification import ChannelType, AlertSeverity, AlertStatus
+from app.schemas.base import ORM_CONFIG, Email
 
 
 # ============== Channel Schemas ==============
@@ -22,7 +26,7 @@ class NotificationChannelBase(BaseModel):
 
 class EmailChannelConfig(BaseModel):
     """Configuration for email channel."""
-    address: EmailStr
+    address: Email
 
 
 class TelegramChannelConfig(BaseModel):
@@ -67,8 +71,7 @@ class NotificationChannelResponse(NotificationChannelBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class NotificationChannelListItem(BaseModel):
@@ -83,8 +86,7 @@ class NotificationChannelListItem(BaseModel):
     success_count: int = 0
     failure_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 # ============== Alert Rule Schemas ==============
@@ -132,8 +134,7 @@ class AlertRuleResponse(AlertRuleBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class AlertRuleListItem(BaseModel):
@@ -147,8 +148,7 @@ class AlertRuleListItem(BaseModel):
     last_triggered_at: Optional[datetime] = None
     trigger_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 # ============== Alert Schemas ==============
@@ -169,8 +169,7 @@ class AlertResponse(BaseModel):
     resolution_note: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class AlertListItem(BaseModel):
@@ -184,8 +183,7 @@ class AlertListItem(BaseModel):
     acknowledged_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class AlertAcknowledge(BaseModel):
@@ -213,8 +211,7 @@ class NotificationLogResponse(BaseModel):
     error_message: Optional[str] = None
     sent_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 # ============== System Config Schemas ==============
@@ -310,3 +307,15 @@ class RuleTypeInfo(BaseModel):
     name: str
     description: str
     config_fields: List[Dict[str, Any]]
+
+
+# RULE_TYPE_INFO as response models, built once (developer-authored data: no validation needed)
+RULE_TYPES: Tuple[RuleTypeInfo, ...] = tuple(
+    RuleTypeInfo.model_construct(key=key, **info) for key, info in RULE_TYPE_INFO.items()
+)
+
+
+@lru_cache(maxsize=None)
+def get_rule_types_json() -> bytes:
+    """GET /notifications/rules/types body, serialized once."""
+    return orjson.dumps([rule_type.model_dump() for rule_type in RULE_TYPES])
@@ -2,6 +2,8 @@ from pydantic import BaseModel, model_validator
 from typing import Optional, Literal
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG
+
 
 class NpmInstanceBase(BaseModel):
     name: str
@@ -18,18 +20,27 @@ class NpmInstanceBase(BaseModel):
     is_active: bool = True
 
 
+# Fields required by each connection mode
+_REQUIRED_CONNECTION_FIELDS = {
+    "database": ("db_host", "db_name", "db_user", "db_password"),
+    "api": ("api_url", "api_email", "api_password"),
+}
+
+
 class NpmInstanceCreate(NpmInstanceBase):
     db_password: Optional[str] = None
     api_password: Optional[str] = None
 
     @model_validator(mode='after')
     def validate_connection_fields(self):
-        if self.connection_mode == "database":
-            if not all([self.db_host, self.db_name, self.db_user, self.db_password]):
-                raise ValueError("Pour le mode database, db_host, db_name, db_user et db_password sont requis")
-        elif self.connection_mode == "api":
-            if not all([self.api_url, self.api_email, self.api_password]):
-                raise ValueError("Pour le mode API, api_url, api_email et api_password sont requis")
+        missing = [
+            field for field in _REQUIRED_CONNECTION_FIELDS[self.connection_mode]
+            if not getattr(self, field)
+        ]
+        if missing:
+            raise ValueError(
+                f"Champs requis manquants pour le mode {self.connection_mode}: {', '.join(missing)}"
+            )
         return self
 
 
@@ -69,5 +80,4 @@ class NpmInstanceResponse(BaseModel):
     created_at: datetime
     last_synced_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from app.models.audit_log import AuditAction
+from app.schemas.base import ORM_CONFIG
 
 
 # ============== Audit Log Schemas ==============
@@ -25,8 +26,7 @@ class AuditLogResponse(BaseModel):
     user_agent: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class AuditLogListParams(BaseModel):
@@ -61,8 +61,7 @@ class UserSessionResponse(BaseModel):
     expires_at: datetime
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class SessionRevokeRequest(BaseModel):
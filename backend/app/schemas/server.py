@@ -6,6 +6,8 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG
+
 
 class ServerBase(BaseModel):
     name: str
@@ -52,8 +54,7 @@ class ServerResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class ServerTestResult(BaseModel):
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from typing import Optional, Any
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG
+
 
 class TabBase(BaseModel):
     name: str
@@ -31,11 +33,11 @@ class TabUpdate(BaseModel):
 class TabResponse(TabBase):
     id: int
     owner_id: Optional[int] = None
+    widget_count: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class TabOwnerInfo(BaseModel):
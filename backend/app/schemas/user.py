@@ -1,10 +1,12 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.base import ORM_CONFIG, Email
+
 
 class UserBase(BaseModel):
-    email: EmailStr
+    email: Email
     username: str
 
 
@@ -13,7 +15,7 @@ class UserCreate(UserBase):
 
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
 
 
@@ -25,8 +27,7 @@ class UserResponse(UserBase):
     totp_enabled: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class Token(BaseModel):
@@ -51,13 +52,13 @@ class TOTPVerify(BaseModel):
 
 
 class LoginWith2FA(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
     totp_code: Optional[str] = None
 
 
 class UserUpdate(BaseModel):
-    email: Optional[EmailStr] = None
+    email: Optional[Email] = None
     username: Optional[str] = None
     password: Optional[str] = None
     is_active: Optional[bool] = None
@@ -66,7 +67,7 @@ class UserUpdate(BaseModel):
 
 
 class UserCreateByAdmin(BaseModel):
-    email: EmailStr
+    email: Email
     username: str
     password: str
     is_admin: bool = False
@@ -82,5 +83,5 @@ class PasswordChange(BaseModel):
 
 
 class ProfileUpdate(BaseModel):
-    email: Optional[EmailStr] = None
+    email: Optional[Email] = None
     username: Optional[str] = None
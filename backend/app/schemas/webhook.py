@@ -4,9 +4,10 @@ Pydantic schemas for webhooks.
 
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.models.webhook import WebhookEventType
+from app.schemas.base import ORM_CONFIG
 
 
 # ============== Webhook Schemas ==============
@@ -56,8 +57,7 @@ class WebhookResponse(WebhookBase):
     # Computed fields
     url: Optional[str] = None  # Full webhook URL
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class WebhookListResponse(BaseModel):
@@ -75,8 +75,7 @@ class WebhookListResponse(BaseModel):
     # Computed fields
     url: Optional[str] = None  # Full webhook URL
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class WebhookWithSecret(WebhookResponse):
@@ -100,8 +99,7 @@ class WebhookEventResponse(BaseModel):
     received_at: datetime
     processed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_CONFIG
 
 
 class WebhookEventList(BaseModel):
@@ -144,3 +142,7 @@ class WebhookTestPayload(BaseModel):
     """Schema for testing webhook."""
     event_type: str = "generic"
     payload: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Body of an incoming webhook: any JSON object, parsed and checked in one pass from the raw bytes
+INCOMING_WEBHOOK_PAYLOAD = TypeAdapter(Dict[str, Any])
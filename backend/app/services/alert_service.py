@@ -10,7 +10,7 @@ import re
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.core.database import SessionLocal
 from app.models import Server
@@ -19,7 +19,7 @@ from app.models.notification import (
     AlertSeverity, AlertStatus
 )
 from app.services.notification_service import NotificationService
-from app.services.command_executor import CommandExecutor
+from app.services.command_executor import CommandExecutor, render_template
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +98,7 @@ class AlertService:
         if not rule.server_id:
             return False, {}
 
-        server = self.db.query(Server).filter(Server.id == rule.server_id).first()
+        server = self.db.query(Server).options(undefer_group("credentials")).filter(Server.id == rule.server_id).first()
         if not server:
             return False, {}
 
@@ -165,7 +165,7 @@ class AlertService:
         if not rule.server_id:
             return False, {}
 
-        server = self.db.query(Server).filter(Server.id == rule.server_id).first()
+        server = self.db.query(Server).options(undefer_group("credentials")).filter(Server.id == rule.server_id).first()
         if not server:
             return False, {}
 
@@ -205,7 +205,7 @@ class AlertService:
         if not rule.server_id:
             return False, {}
 
-        server = self.db.query(Server).filter(Server.id == rule.server_id).first()
+        server = self.db.query(Server).options(undefer_group("credentials")).filter(Server.id == rule.server_id).first()
         if not server:
             return False, {}
 
@@ -254,7 +254,7 @@ class AlertService:
         if not rule.server_id:
             return False, {}
 
-        server = self.db.query(Server).filter(Server.id == rule.server_id).first()
+        server = self.db.query(Server).options(undefer_group("credentials")).filter(Server.id == rule.server_id).first()
         if not server:
             return False, {}
 
@@ -321,7 +321,7 @@ class AlertService:
         if not rule.server_id:
             return False, {}
 
-        server = self.db.query(Server).filter(Server.id == rule.server_id).first()
+        server = self.db.query(Server).options(undefer_group("credentials")).filter(Server.id == rule.server_id).first()
         if not server:
             return False, {}
 
@@ -402,9 +402,8 @@ class AlertService:
         message = rule.message_template or f"Rule '{rule.name}' triggered"
 
         # Substitute context variables
-        for key, value in context.items():
-            title = title.replace(f"{{{{{key}}}}}", str(value))
-            message = message.replace(f"{{{{{key}}}}}", str(value))
+        title = render_template(title, context)
+        message = render_template(message, context)
 
         # Create alert
         alert = Alert(
@@ -432,19 +431,8 @@ class AlertService:
                 NotificationChannel.is_enabled == True,
             ).all()
 
-            # Send notifications
-            results = await self.notification_service.send_alert(alert, channels)
-
-            # Update alert with notification results
-            notifications_sent = []
-            for channel_id, success in results.items():
-                notifications_sent.append({
-                    "channel_id": channel_id,
-                    "sent_at": datetime.utcnow().isoformat(),
-                    "success": success,
-                })
-            alert.notifications_sent = notifications_sent
-            self.db.commit()
+            # Send notifications (each delivery is recorded in notification_logs)
+            await self.notification_service.send_alert(alert, channels)
 
         logger.info(f"Alert triggered: {alert.title} (rule: {rule.name})")
         return alert
@@ -512,19 +500,8 @@ async def trigger_manual_alert(
 
     channels = query.all()
 
-    # Send notifications
+    # Send notifications (each delivery is recorded in notification_logs)
     service = NotificationService(db)
-    results = await service.send_alert(alert, channels)
-
-    # Update alert
-    notifications_sent = []
-    for channel_id, success in results.items():
-        notifications_sent.append({
-            "channel_id": channel_id,
-            "sent_at": datetime.utcnow().isoformat(),
-            "success": success,
-        })
-    alert.notifications_sent = notifications_sent
-    db.commit()
+    await service.send_alert(alert, channels)
 
     return alert
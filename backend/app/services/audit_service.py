@@ -2,17 +2,29 @@
 Audit Service for logging user actions.
 """
 
+import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from fastapi import Request
 
-from app.models.audit_log import AuditLog, AuditAction
+from app.models.audit_log import AuditLog, AuditAction, UserAgentString
 
 logger = logging.getLogger(__name__)
 
+# user agent -> user_agent_strings.id, so repeated agents skip the lookup
+_USER_AGENT_CACHE_SIZE = 1024
+_user_agent_ids: "OrderedDict[str, int]" = OrderedDict()
+
+
+def user_agent_sha(user_agent: str) -> bytes:
+    """Key of a user agent in user_agent_strings (first 16 bytes of its SHA-256)."""
+    return hashlib.sha256(user_agent.encode()).digest()[:16]
+
 
 class AuditService:
     """Service for creating audit log entries."""
@@ -47,6 +59,7 @@ class AuditService:
         Returns:
             Created AuditLog entry
         """
+        user_agent = user_agent[:500] if user_agent else None
         log_entry = AuditLog(
             user_id=user_id,
             action=action,
@@ -55,13 +68,19 @@ class AuditService:
             resource_name=resource_name,
             details=details,
             ip_address=ip_address,
-            user_agent=user_agent,
+            user_agent_id=self._user_agent_id(user_agent) if user_agent else None,
         )
 
         self.db.add(log_entry)
         self.db.commit()
         self.db.refresh(log_entry)
 
+        # Only cache ids of committed rows
+        if user_agent and user_agent not in _user_agent_ids:
+            _user_agent_ids[user_agent] = log_entry.user_agent_id
+            while len(_user_agent_ids) > _USER_AGENT_CACHE_SIZE:
+                _user_agent_ids.popitem(last=False)
+
         logger.info(
             f"Audit: {action.value} by user {user_id} "
             f"on {resource_type}:{resource_id} ({resource_name})"
@@ -69,6 +88,20 @@ class AuditService:
 
         return log_entry
 
+    def _user_agent_id(self, user_agent: str) -> int:
+        """Get (or create) the user_agent_strings row for a user agent."""
+        cached = _user_agent_ids.get(user_agent)
+        if cached is not None:
+            _user_agent_ids.move_to_end(user_agent)
+            return cached
+
+        # Upsert so the id is returned whether the row is new or not
+        stmt = insert(UserAgentString).values(sha=user_agent_sha(user_agent), value=user_agent)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserAgentString.sha], set_={"value": stmt.excluded.value}
+        ).returning(UserAgentString.id)
+        return self.db.execute(stmt).scalar_one()
+
     def log_from_request(
         self,
         request: Request,
@@ -5,7 +5,9 @@ Provides a simple interface for caching widget data with configurable TTL.
 
 import json
 import logging
-from typing import Any, Dict, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
 import redis.asyncio as redis
@@ -14,6 +16,10 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# In-process L1 cache in front of Redis for widget data
+L1_MAX_TTL = 5  # seconds - bounds staleness across workers
+L1_MAX_SIZE = 2048
+
 
 class CacheService:
     """
@@ -25,6 +31,8 @@ class CacheService:
         self._redis: Optional[redis.Redis] = None
         self._connected: bool = False
         self._last_error: Optional[str] = None
+        # widget_id -> (expires_at monotonic, data), kept in LRU order
+        self._widget_l1: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     async def connect(self) -> bool:
         """
@@ -153,9 +161,13 @@ class CacheService:
 
         try:
             deleted = 0
-            async for key in self._redis.scan_iter(match=pattern):
-                await self._redis.delete(key)
-                deleted += 1
+            # Batch the deletes into a single round-trip
+            async with self._redis.pipeline(transaction=False) as pipe:
+                async for key in self._redis.scan_iter(match=pattern):
+                    pipe.delete(key)
+                    deleted += 1
+                if deleted:
+                    await pipe.execute()
             return deleted
         except Exception as e:
             logger.warning(f"Cache delete pattern error for {pattern}: {e}")
@@ -163,12 +175,45 @@ class CacheService:
 
     # Widget-specific cache methods
 
+    def _l1_get(self, widget_id: int) -> Optional[Dict[str, Any]]:
+        """Get widget data from the in-process cache if still fresh."""
+        entry = self._widget_l1.get(widget_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            self._widget_l1.pop(widget_id, None)
+            return None
+        self._widget_l1.move_to_end(widget_id)
+        # Shallow copy: callers annotate the returned dict (e.g. _from_cache)
+        return dict(data)
+
+    def _l1_set(self, widget_id: int, data: Dict[str, Any], ttl: int):
+        """Store widget data in the in-process cache for at most L1_MAX_TTL."""
+        l1_ttl = min(L1_MAX_TTL, ttl)
+        if l1_ttl <= 0:
+            return
+        self._widget_l1[widget_id] = (time.monotonic() + l1_ttl, dict(data))
+        self._widget_l1.move_to_end(widget_id)
+        while len(self._widget_l1) > L1_MAX_SIZE:
+            self._widget_l1.popitem(last=False)
+
     async def get_widget_data(self, widget_id: int) -> Optional[Dict[str, Any]]:
-        """Get cached widget data."""
+        """Get cached widget data (in-process L1 first, then Redis)."""
+        if not self.is_connected:
+            return None
+
+        data = self._l1_get(widget_id)
+        if data is not None:
+            return data
+
         key = self._make_key("widget", widget_id, "data")
         cached = await self.get(key)
         if cached:
-            return cached.get("data")
+            data = cached.get("data")
+            if data:
+                self._l1_set(widget_id, data, cached.get("ttl", settings.REDIS_CACHE_TTL))
+            return data
         return None
 
     async def set_widget_data(
@@ -179,15 +224,20 @@ class CacheService:
     ) -> bool:
         """Cache widget data."""
         key = self._make_key("widget", widget_id, "data")
-        return await self.set(key, data, ttl)
+        stored = await self.set(key, data, ttl)
+        if stored:
+            self._l1_set(widget_id, data, ttl or settings.REDIS_CACHE_TTL)
+        return stored
 
     async def invalidate_widget(self, widget_id: int) -> bool:
         """Invalidate cache for a specific widget."""
+        self._widget_l1.pop(widget_id, None)
         key = self._make_key("widget", widget_id, "data")
         return await self.delete(key)
 
     async def invalidate_widget_type(self, widget_type: str) -> int:
         """Invalidate cache for all widgets of a type."""
+        self._widget_l1.clear()
         pattern = self._make_key("widget", "*", "data")
         # Note: This is a simplified version. For type-based invalidation,
         # we'd need to store widget type info in the cache or use tags
@@ -281,6 +331,109 @@ class CacheService:
         key = self._make_key("crowdsec", widget_id)
         return await self.set(key, data, ttl)
 
+    # App template cache (keyed by slug + updated_at, so updates never hit stale entries)
+    async def get_app_template(self, slug: str, version: int) -> Optional[Dict[str, Any]]:
+        """Get a cached app template."""
+        key = self._make_key("template", slug, version)
+        cached = await self.get(key)
+        if cached:
+            return cached.get("data")
+        return None
+
+    async def set_app_template(
+        self,
+        slug: str,
+        version: int,
+        data: Dict[str, Any],
+        ttl: int = 300  # Templates change rarely
+    ) -> bool:
+        """Cache an app template."""
+        key = self._make_key("template", slug, version)
+        return await self.set(key, data, ttl)
+
+    async def invalidate_app_template(self, slug: str) -> int:
+        """Invalidate all cached versions of an app template."""
+        return await self.delete_pattern(self._make_key("template", slug, "*"))
+
+    # Infrastructure schema saved positions, per user (own positions over shared ones).
+    # Layout writes only touch the user's own rows, so they invalidate that user's entry.
+    async def get_schema_layout(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get a user's cached schema positions."""
+        cached = await self.get(self._make_key("schema_layout", user_id))
+        if cached:
+            return cached.get("data")
+        return None
+
+    async def set_schema_layout(
+        self,
+        user_id: int,
+        data: Dict[str, Any],
+        ttl: int = 3600  # Only changes through the layout endpoints, which invalidate it
+    ) -> bool:
+        """Cache a user's schema positions."""
+        return await self.set(self._make_key("schema_layout", user_id), data, ttl)
+
+    async def invalidate_schema_layout(self, user_id: int) -> bool:
+        """Invalidate a user's cached schema positions."""
+        return await self.delete(self._make_key("schema_layout", user_id))
+
+    # App template download counters (write-behind, flushed to the DB periodically)
+    async def incr_template_downloads(self, template_id: int) -> bool:
+        """Increment the pending download count of a template."""
+        if not self.is_connected:
+            return False
+
+        try:
+            await self._redis.hincrby(self._make_key("template_downloads"), str(template_id), 1)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache incr error for template {template_id} downloads: {e}")
+            return False
+
+    async def get_template_downloads(self) -> Dict[int, int]:
+        """Get pending download counts per template id."""
+        if not self.is_connected:
+            return {}
+
+        try:
+            counts = await self._redis.hgetall(self._make_key("template_downloads"))
+            return {int(k): int(v) for k, v in counts.items()}
+        except Exception as e:
+            logger.warning(f"Cache get error for template downloads: {e}")
+            return {}
+
+    async def pop_template_downloads(self) -> Dict[int, int]:
+        """Atomically read and reset pending download counts."""
+        if not self.is_connected:
+            return {}
+
+        key = self._make_key("template_downloads")
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hgetall(key)
+                pipe.delete(key)
+                counts, _ = await pipe.execute()
+            return {int(k): int(v) for k, v in counts.items()}
+        except Exception as e:
+            logger.warning(f"Cache pop error for template downloads: {e}")
+            return {}
+
+    async def restore_template_downloads(self, counts: Dict[int, int]) -> bool:
+        """Add popped download counts back, e.g. when applying them to the database failed."""
+        if not self.is_connected or not counts:
+            return False
+
+        key = self._make_key("template_downloads")
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for template_id, delta in counts.items():
+                    pipe.hincrby(key, str(template_id), delta)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache restore error for template downloads: {e}")
+            return False
+
     # Cache statistics
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -296,6 +449,7 @@ class CacheService:
             return {
                 "connected": True,
                 "keys_count": keys_count,
+                "l1_widget_entries": len(self._widget_l1),
                 "used_memory": info.get("used_memory_human", "N/A"),
                 "used_memory_peak": info.get("used_memory_peak_human", "N/A"),
                 "redis_version": info.get("redis_version", "N/A"),
@@ -5,15 +5,19 @@ Executes commands on remote servers via SSH with variable substitution and outpu
 
 import asyncio
 import asyncssh
+import hashlib
 import json
 import logging
 import os
 import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.models.server import Server
 
@@ -31,6 +35,43 @@ class CommandResult:
     execution_time: float = 0.0
 
 
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}")
+
+
+@lru_cache(maxsize=1024)
+def compile_command_template(command: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Split a command template into (literal, placeholder name) segments, once per
+    distinct command. The last segment has no placeholder (name is None).
+    Templates are static, so refreshes reuse the compiled form instead of
+    rescanning the command for every variable.
+    """
+    segments = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(command):
+        segments.append((command[position:match.start()], match.group(1)))
+        position = match.end()
+    segments.append((command[position:], None))
+    return tuple(segments)
+
+
+def render_template(template: str, variables: Dict[str, Any]) -> str:
+    """
+    Substitute {{variable}} placeholders from a flat dict, using the compiled template.
+    No escaping (values are used as-is); unknown placeholders are left as-is.
+    """
+    parts = []
+    for literal, name in compile_command_template(template):
+        parts.append(literal)
+        if name is None:
+            continue
+        if name in variables:
+            parts.append(str(variables[name]))
+        else:
+            parts.append(f"{{{{{name}}}}}")
+    return "".join(parts)
+
+
 class CommandExecutor:
     """
     Executes commands on remote servers with variable substitution.
@@ -71,11 +112,13 @@ class CommandExecutor:
         self.ssh_key = ssh_key
         self.ssh_password = ssh_password
         self._connection: Optional[asyncssh.SSHClientConnection] = None
+        # Concurrent execute() calls share one connection
+        self._connect_lock = asyncio.Lock()
 
     @classmethod
     async def from_server(cls, db: Session, server_id: int) -> Optional["CommandExecutor"]:
         """Create executor from a Server model."""
-        server = db.query(Server).filter(Server.id == server_id).first()
+        server = db.query(Server).options(undefer_group("credentials")).filter(Server.id == server_id).first()
         if not server:
             return None
 
@@ -92,6 +135,14 @@ class CommandExecutor:
         if self._connection is not None:
             return self._connection
 
+        async with self._connect_lock:
+            if self._connection is None:
+                self._connection = await self._connect()
+            return self._connection
+
+    async def _connect(self) -> asyncssh.SSHClientConnection:
+        """Open a new SSH connection."""
+
         connect_opts = {
             "host": self.host,
             "port": self.ssh_port,
@@ -115,8 +166,7 @@ class CommandExecutor:
         else:
             raise ValueError("Neither SSH key nor password provided")
 
-        self._connection = await asyncssh.connect(**connect_opts)
-        return self._connection
+        return await asyncssh.connect(**connect_opts)
 
     async def close(self):
         """Close SSH connection."""
@@ -147,34 +197,29 @@ class CommandExecutor:
         - {{row.field}} - from row data (for row actions)
         - {{row.nested.field}} - from nested row data
         - {{input.field}} - from user input (via row.input)
-        """
-        result = command
-
-        # Substitute regular variables
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            result = result.replace(placeholder, self._escape_shell_arg(str(value)))
-
-        # Substitute row variables (including nested paths like row.source.ip or row.input.ip)
-        if row:
-            import re
-            # Find all {{row.xxx}} patterns
-            row_patterns = re.findall(r'\{\{row\.([^}]+)\}\}', result)
-            for path in row_patterns:
-                placeholder = f"{{{{row.{path}}}}}"
-                value = self._get_nested_value(row, path)
-                if value is not None:
-                    result = result.replace(placeholder, self._escape_shell_arg(str(value)))
-
-            # Also handle {{input.xxx}} patterns (they map to row.input.xxx)
-            input_patterns = re.findall(r'\{\{input\.([^}]+)\}\}', result)
-            for field in input_patterns:
-                placeholder = f"{{{{input.{field}}}}}"
-                value = self._get_nested_value(row, f"input.{field}")
-                if value is not None:
-                    result = result.replace(placeholder, self._escape_shell_arg(str(value)))
 
-        return result
+        Placeholders that can't be resolved are left as-is.
+        """
+        parts = []
+        for literal, name in compile_command_template(command):
+            parts.append(literal)
+            if name is None:
+                continue
+
+            if name in variables:
+                value = variables[name]
+            else:
+                value = None
+                if row and name.startswith("row."):
+                    value = self._get_nested_value(row, name[4:])
+                elif row and name.startswith("input."):
+                    # {{input.xxx}} maps to row.input.xxx
+                    value = self._get_nested_value(row, name)
+                if value is None:
+                    parts.append(f"{{{{{name}}}}}")
+                    continue
+            parts.append(self._escape_shell_arg(str(value)))
+        return "".join(parts)
 
     def _escape_shell_arg(self, arg: str) -> str:
         """Escape shell argument to prevent injection."""
@@ -375,6 +420,51 @@ class CommandExecutor:
         return output
 
 
+class CommandResultCache:
+    """
+    In-process cache of successful block command results, keyed by
+    (server, command, parser, variables). Users viewing the same dashboard
+    share one SSH execution per block until the entry expires.
+    """
+
+    MAX_SIZE = 4096
+
+    def __init__(self):
+        # key -> (expires_at, result)
+        self._entries: "OrderedDict[Tuple[int, str, str, str], Tuple[float, CommandResult]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(server_id: int, command: str, parser: str, variables: Dict[str, Any]) -> Tuple[int, str, str, str]:
+        # Hash the variables so credentials aren't kept in the key as-is
+        digest = hashlib.sha256(repr(sorted(variables.items())).encode()).hexdigest()
+        return server_id, command, parser, digest
+
+    def get(self, key: Tuple[int, str, str, str]) -> Optional[CommandResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def set(self, key: Tuple[int, str, str, str], result: CommandResult, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.MAX_SIZE:
+            self._entries.popitem(last=False)
+
+    def invalidate_server(self, server_id: int):
+        """Drop a server's results, e.g. after an action changed its state."""
+        for key in [key for key in self._entries if key[0] == server_id]:
+            del self._entries[key]
+
+
+command_result_cache = CommandResultCache()
+
+
 async def execute_dashboard_command(
     db: Session,
     server_id: int,
@@ -0,0 +1,302 @@
+"""
+HTTP block fetcher for App Dashboard.
+Blocks whose config has an `http` descriptor instead of a `command` are fetched
+in-process with httpx, instead of running `curl ... | jq ...` over SSH
+(two processes and a new TLS handshake per refresh).
+The descriptor is: {"method", "url", "headers", "body", "json_path"}; the URL must
+be reachable from ProxyDash itself (not only from the target server).
+Only http(s) URLs resolving to public addresses are fetched (set
+HTTP_BLOCK_ALLOW_PRIVATE to reach LAN services), and responses are capped in size.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+import orjson
+
+from app.core.config import settings
+from app.core.http_pool import get_http_client
+from app.services.command_executor import CommandResult, render_template
+
+logger = logging.getLogger(__name__)
+
+
+def extract_json_path(data: Any, path: Optional[str]) -> Any:
+    """Walk a dotted path (e.g. "users" or "data.0.name") into parsed JSON; None if missing."""
+    if not path:
+        return data
+    value = data
+    for key in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def _apply_parser(value: Any, parser: str) -> Any:
+    """
+    Shape the extracted value like the command parsers do.
+    For "number", a list is counted (replaces `jq '.items | length'`).
+    """
+    if parser == "number":
+        if isinstance(value, (list, dict)):
+            return len(value)
+        try:
+            return float(value) if "." in str(value) else int(value)
+        except (TypeError, ValueError):
+            return 0
+    if parser in ("json", "lines"):
+        return value if value is not None else []
+    if parser == "raw":
+        return "" if value is None else (value if isinstance(value, str) else str(value))
+    return value
+
+
+class HttpResponseCache:
+    """
+    In-process cache of parsed JSON responses for GET blocks, keyed by (url, headers).
+    Blocks reading the same endpoint (e.g. /api/v1/node for several counters) and
+    users viewing the same dashboard share one upstream call per refresh interval.
+    Expired entries keep their ETag/Last-Modified for a conditional revalidation.
+    """
+
+    MAX_SIZE = 1024
+
+    def __init__(self):
+        # key -> (expires_at, parsed JSON, validators for If-None-Match / If-Modified-Since)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any, Dict[str, str]]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(url: str, headers: Dict[str, str]) -> Tuple[str, str]:
+        # Hash the headers so credentials aren't kept in the key as-is
+        digest = hashlib.sha256(repr(sorted(headers.items())).encode()).hexdigest()
+        return url, digest
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[float, Any, Dict[str, str]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Tuple[str, str], data: Any, ttl: float, validators: Dict[str, str]):
+        self._entries[key] = (time.monotonic() + ttl, data, validators)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.MAX_SIZE:
+            self._entries.popitem(last=False)
+
+
+http_response_cache = HttpResponseCache()
+
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+
+class ResponseTooLarge(Exception):
+    """The upstream response exceeds MAX_RESPONSE_BYTES."""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def check_url_allowed(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Vet `url` before fetching it. Returns (error message, address to connect to):
+    an error if it isn't http(s) or its host resolves to a private, loopback,
+    link-local or otherwise non-public address. The returned address is the one
+    that was checked, and the request must connect to it (see _pin_address): letting
+    httpx resolve the name again would allow DNS rebinding to an internal host.
+    Redirects aren't followed, so only this URL's host needs checking.
+    The address is None when HTTP_BLOCK_ALLOW_PRIVATE disables the check.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return f"URL invalide: {url}", None
+    if settings.HTTP_BLOCK_ALLOW_PRIVATE:
+        return None, None
+
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        return f"Hôte introuvable: {parts.hostname}", None
+    addresses = [info[4][0] for info in infos]
+    if not addresses or not all(_is_public_address(address) for address in addresses):
+        return f"Adresse non autorisée: {parts.hostname}", None
+    return None, addresses[0]
+
+
+def _pin_address(
+    url: str, address: str, headers: Dict[str, str],
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Point `url` at the vetted IP address, keeping the original name in the Host
+    header and as the TLS SNI / certificate hostname.
+    Returns (url, headers, request extensions).
+    """
+    parts = urlsplit(url)
+    userinfo, _, host_port = parts.netloc.rpartition("@")
+    host = f"[{address}]" if ":" in address else address
+    netloc = host if parts.port is None else f"{host}:{parts.port}"
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    headers = {**headers, "Host": host_port}
+    extensions = {"sni_hostname": parts.hostname} if parts.scheme == "https" else {}
+    return urlunsplit(parts._replace(netloc=netloc)), headers, extensions
+
+
+async def _send_capped(
+    client: httpx.AsyncClient, method: str, url: str, headers: Dict[str, str], content: Optional[str],
+    address: Optional[str] = None,
+) -> Tuple[httpx.Response, bytes]:
+    """Send the request (to the pinned `address` if given) and read at most MAX_RESPONSE_BYTES of its body."""
+    extensions: Dict[str, Any] = {}
+    if address is not None:
+        url, headers, extensions = _pin_address(url, address, headers)
+    async with client.stream(method, url, headers=headers, content=content, extensions=extensions) as response:
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) > MAX_RESPONSE_BYTES:
+            raise ResponseTooLarge()
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > MAX_RESPONSE_BYTES:
+                raise ResponseTooLarge()
+            chunks.append(chunk)
+    return response, b"".join(chunks)
+
+
+def _conditional_headers(validators: Dict[str, str]) -> Dict[str, str]:
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last-modified"):
+        headers["If-Modified-Since"] = validators["last-modified"]
+    return headers
+
+
+async def fetch_http_block(
+    http_config: Dict[str, Any],
+    variables: Dict[str, Any],
+    parser: str = "json",
+    client: Optional[httpx.AsyncClient] = None,
+    cache_ttl: float = 0,
+) -> CommandResult:
+    """
+    Execute an `http` block descriptor and return its parsed output.
+    Uses the shared pooled client unless `client` is given.
+    With cache_ttl (usually the block's refresh_interval), GET JSON responses are
+    served from http_response_cache and revalidated with ETag/Last-Modified.
+    """
+    start = time.monotonic()
+    method = http_config.get("method", "GET").upper()
+    url = render_template(http_config.get("url", ""), variables)
+    headers = {
+        key: render_template(value, variables)
+        for key, value in (http_config.get("headers") or {}).items()
+    }
+    body = http_config.get("body")
+    content = render_template(body, variables) if body else None
+    json_path = http_config.get("json_path")
+
+    url_error, address = await check_url_allowed(url)
+    if url_error:
+        return CommandResult(
+            success=False, output=None, raw_output="",
+            error=url_error, exit_code=-1,
+        )
+
+    wants_json = parser != "raw" or bool(json_path)
+    cache_key = None
+    cached = None
+    if cache_ttl > 0 and method == "GET" and wants_json:
+        cache_key = HttpResponseCache.make_key(url, headers)
+        cached = http_response_cache.get(cache_key)
+        if cached is not None and cached[0] > start:
+            return CommandResult(
+                success=True,
+                output=_apply_parser(extract_json_path(cached[1], json_path), parser),
+                raw_output="",
+                execution_time=time.monotonic() - start,
+            )
+        if cached is not None:
+            headers = {**headers, **_conditional_headers(cached[2])}
+
+    if client is None:
+        client = get_http_client()
+
+    try:
+        response, body = await _send_capped(client, method, url, headers, content, address)
+    except ResponseTooLarge:
+        return CommandResult(
+            success=False, output=None, raw_output="",
+            error=f"Réponse trop volumineuse (plus de {MAX_RESPONSE_BYTES // (1024 * 1024)} Mo)", exit_code=-1,
+            execution_time=time.monotonic() - start,
+        )
+    except httpx.HTTPError as e:
+        logger.warning(f"HTTP block fetch failed for {url}: {e}")
+        return CommandResult(
+            success=False, output=None, raw_output="",
+            error=f"Erreur de connexion: {e}", exit_code=-1,
+            execution_time=time.monotonic() - start,
+        )
+
+    if response.status_code == 304 and cached is not None:
+        # Unchanged upstream: keep the parsed data for another interval
+        http_response_cache.set(cache_key, cached[1], cache_ttl, cached[2])
+        return CommandResult(
+            success=True,
+            output=_apply_parser(extract_json_path(cached[1], json_path), parser),
+            raw_output="",
+            execution_time=time.monotonic() - start,
+        )
+
+    text = body.decode(response.encoding or "utf-8", errors="replace")
+    if not response.is_success:
+        return CommandResult(
+            success=False, output=None, raw_output=text,
+            error=f"Erreur HTTP {response.status_code}", exit_code=response.status_code,
+            execution_time=time.monotonic() - start,
+        )
+
+    if not wants_json:
+        output = text
+    else:
+        try:
+            data = orjson.loads(body)
+        except ValueError:
+            return CommandResult(
+                success=False, output=None, raw_output=text,
+                error="Réponse JSON invalide", exit_code=-1,
+                execution_time=time.monotonic() - start,
+            )
+        if cache_key is not None:
+            validators = {
+                name: response.headers[name]
+                for name in ("etag", "last-modified") if name in response.headers
+            }
+            http_response_cache.set(cache_key, data, cache_ttl, validators)
+        output = _apply_parser(extract_json_path(data, json_path), parser)
+
+    return CommandResult(
+        success=True,
+        output=output,
+        raw_output=text,
+        execution_time=time.monotonic() - start,
+    )
@@ -77,6 +77,8 @@ class NotificationService:
         Returns:
             True if notification was sent successfully
         """
+        # Severities read from the database are plain strings
+        severity = AlertSeverity(severity)
         success = False
         error_message = None
         recipient = ""
@@ -8,18 +8,49 @@ import asyncio
 import subprocess
 import re
 import platform
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 import logging
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import Float, and_, case, func, insert, text
 
-from app.models.ping_history import PingHistory, PingTarget
+from app.models.ping_history import PingHistory, PingHistoryHourly, PingTarget
 
 logger = logging.getLogger(__name__)
 
+# History ranges longer than this are served from the hourly rollup
+HOURLY_ROLLUP_THRESHOLD_HOURS = 48
+
+# Aggregate complete hours since the last rolled-up bucket (which is recomputed,
+# as measurements may have landed after the previous run)
+ROLLUP_HOURLY_SQL = text("""
+    INSERT INTO ping_history_hourly (
+        target, widget_id, bucket, measurements, outages,
+        latency_min, latency_avg, latency_max, jitter, packet_loss_percent
+    )
+    SELECT target, COALESCE(widget_id, 0), date_trunc('hour', timestamp),
+           count(*), count(*) FILTER (WHERE is_reachable = false),
+           min(latency_min), avg(latency_avg), max(latency_max),
+           avg(jitter), avg(packet_loss_percent)
+    FROM ping_history
+    WHERE timestamp >= COALESCE(
+              (SELECT max(bucket) FROM ping_history_hourly), '-infinity'::timestamptz
+          )
+      AND timestamp < date_trunc('hour', now())
+    GROUP BY 1, 2, 3
+    ON CONFLICT (target, widget_id, bucket) DO UPDATE SET
+        measurements = EXCLUDED.measurements,
+        outages = EXCLUDED.outages,
+        latency_min = EXCLUDED.latency_min,
+        latency_avg = EXCLUDED.latency_avg,
+        latency_max = EXCLUDED.latency_max,
+        jitter = EXCLUDED.jitter,
+        packet_loss_percent = EXCLUDED.packet_loss_percent
+""")
+
 
 @dataclass
 class PingResult:
@@ -226,6 +257,63 @@ class PingService:
         return await asyncio.gather(*tasks)
 
 
+class AdaptivePingSchedule:
+    """
+    Decides when a widget refresh should take a new measurement of a target.
+    Each (target, widget) keeps an EWMA of its volatility (packet loss + jitter
+    relative to latency); stable targets are measured up to MAX_BACKOFF times
+    less often than the widget's ping_interval, and the last result is reused
+    in between. Unstable or unreachable targets stay at the base interval.
+    """
+
+    EWMA_ALPHA = 0.3
+    MIN_SCORE = 0.01
+    MAX_BACKOFF = 10
+
+    def __init__(self):
+        # key -> (volatility score, monotonic time of the last measurement, last result)
+        self._entries: Dict[Tuple[str, int], Tuple[float, float, PingResult]] = {}
+
+    @staticmethod
+    def volatility(result: PingResult) -> float:
+        if not result.is_reachable:
+            return 1.0
+        loss = (result.packet_loss_percent or 0) / 100
+        jitter = (result.jitter or 0) / max(result.latency_avg or 0, 1.0)
+        return loss + jitter
+
+    def interval(self, score: float, base_interval: float) -> float:
+        backoff = min(max(1 / max(score, self.MIN_SCORE), 1), self.MAX_BACKOFF)
+        return base_interval * backoff
+
+    def get_fresh(self, key: Tuple[str, int], base_interval: float) -> Optional[PingResult]:
+        """Get the last result for key if the next measurement isn't due yet."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        score, measured_at, result = entry
+        if time.monotonic() - measured_at >= self.interval(score, base_interval):
+            return None
+        return result
+
+    def record(self, key: Tuple[str, int], result: PingResult):
+        sample = self.volatility(result)
+        entry = self._entries.get(key)
+        score = sample if entry is None else (
+            self.EWMA_ALPHA * sample + (1 - self.EWMA_ALPHA) * entry[0]
+        )
+        self._entries[key] = (score, time.monotonic(), result)
+
+    def prune(self, widget_id: int, targets=()):
+        """Drop the entries of a widget except `targets` (all of them once it's deleted)."""
+        keep = set(targets)
+        for key in [key for key in self._entries if key[1] == widget_id and key[0] not in keep]:
+            del self._entries[key]
+
+
+ping_schedule = AdaptivePingSchedule()
+
+
 # Database operations
 class PingHistoryService:
     """Service for managing ping history in database."""
@@ -258,27 +346,48 @@ class PingHistoryService:
         result = await self.ping_service.ping(target, count, timeout)
 
         # Save to database
-        history = PingHistory(
-            target=target,
-            target_name=target_name,
-            widget_id=widget_id,
-            timestamp=result.timestamp,
-            latency_min=result.latency_min,
-            latency_avg=result.latency_avg,
-            latency_max=result.latency_max,
-            latency_mdev=result.latency_mdev,
-            jitter=result.jitter,
-            packets_sent=result.packets_sent,
-            packets_received=result.packets_received,
-            packet_loss_percent=result.packet_loss_percent,
-            is_reachable=result.is_reachable,
-            error_message=result.error_message,
-        )
-        self.db.add(history)
-        self.db.commit()
+        self.record_results([result], {target: target_name} if target_name else None, widget_id)
 
         return result
 
+    def record_results(
+        self,
+        results: List[PingResult],
+        target_names: Optional[Dict[str, str]] = None,
+        widget_id: Optional[int] = None,
+    ):
+        """
+        Save ping results to history in a single executemany insert and commit.
+
+        Args:
+            results: Measurements to save
+            target_names: Friendly name per target
+            widget_id: Associated widget ID
+        """
+        if not results:
+            return
+        target_names = target_names or {}
+        self.db.execute(insert(PingHistory), [
+            {
+                "target": result.target,
+                "target_name": target_names.get(result.target),
+                "widget_id": widget_id,
+                "timestamp": result.timestamp,
+                "latency_min": result.latency_min,
+                "latency_avg": result.latency_avg,
+                "latency_max": result.latency_max,
+                "latency_mdev": result.latency_mdev,
+                "jitter": result.jitter,
+                "packets_sent": result.packets_sent,
+                "packets_received": result.packets_received,
+                "packet_loss_percent": result.packet_loss_percent,
+                "is_reachable": result.is_reachable,
+                "error_message": result.error_message,
+            }
+            for result in results
+        ])
+        self.db.commit()
+
     def get_history(
         self,
         target: str,
@@ -298,7 +407,20 @@ class PingHistoryService:
         """
         cutoff = datetime.utcnow() - timedelta(hours=hours)
 
-        query = self.db.query(PingHistory).filter(
+        if hours > HOURLY_ROLLUP_THRESHOLD_HOURS:
+            return self._get_hourly_history(target, cutoff, widget_id)
+
+        # Select plain column tuples: a day of history is thousands of rows and
+        # building full ORM instances for them dominated the request.
+        query = self.db.query(
+            PingHistory.timestamp,
+            PingHistory.latency_min,
+            PingHistory.latency_avg,
+            PingHistory.latency_max,
+            PingHistory.jitter,
+            PingHistory.packet_loss_percent,
+            PingHistory.is_reachable,
+        ).filter(
             PingHistory.target == target,
             PingHistory.timestamp >= cutoff,
         )
@@ -321,6 +443,90 @@ class PingHistoryService:
             for r in records
         ]
 
+    def _get_hourly_history(
+        self,
+        target: str,
+        cutoff: datetime,
+        widget_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get ping history as hourly points (one point per hour) from the rollup table.
+        The rollup only runs once an hour, so hours after its last bucket are
+        aggregated from raw ping_history the same way.
+        """
+        # Without widget_id the rollup has one row per widget and bucket: merge them per
+        # bucket like the raw tail below (averages weighted by their measurement count)
+        measurements = PingHistoryHourly.measurements
+
+        def weighted_avg(column):
+            weight = func.sum(case((column.isnot(None), measurements)))
+            return func.sum(column * measurements) / func.nullif(weight, 0, type_=Float)
+
+        query = self.db.query(
+            PingHistoryHourly.bucket,
+            func.sum(measurements).label("measurements"),
+            func.sum(PingHistoryHourly.outages).label("outages"),
+            func.min(PingHistoryHourly.latency_min).label("latency_min"),
+            weighted_avg(PingHistoryHourly.latency_avg).label("latency_avg"),
+            func.max(PingHistoryHourly.latency_max).label("latency_max"),
+            weighted_avg(PingHistoryHourly.jitter).label("jitter"),
+            weighted_avg(PingHistoryHourly.packet_loss_percent).label("packet_loss_percent"),
+        ).filter(
+            PingHistoryHourly.target == target,
+            PingHistoryHourly.bucket >= cutoff,
+        )
+
+        if widget_id:
+            query = query.filter(PingHistoryHourly.widget_id == widget_id)
+
+        records = query.group_by(PingHistoryHourly.bucket).order_by(PingHistoryHourly.bucket.asc()).all()
+
+        # Raw measurements not rolled up yet
+        tail_start = records[-1].bucket + timedelta(hours=1) if records else cutoff
+        bucket = func.date_trunc("hour", PingHistory.timestamp).label("bucket")
+        tail_query = self.db.query(
+            bucket,
+            func.count(PingHistory.id).label("measurements"),
+            func.count(PingHistory.id).filter(PingHistory.is_reachable == False).label("outages"),
+            func.min(PingHistory.latency_min).label("latency_min"),
+            func.avg(PingHistory.latency_avg).label("latency_avg"),
+            func.max(PingHistory.latency_max).label("latency_max"),
+            func.avg(PingHistory.jitter).label("jitter"),
+            func.avg(PingHistory.packet_loss_percent).label("packet_loss_percent"),
+        ).filter(
+            PingHistory.target == target,
+            PingHistory.timestamp >= tail_start,
+        )
+
+        if widget_id:
+            tail_query = tail_query.filter(PingHistory.widget_id == widget_id)
+
+        records += tail_query.group_by(bucket).order_by(bucket.asc()).all()
+
+        return [
+            {
+                "timestamp": r.bucket.isoformat(),
+                "latency_min": r.latency_min,
+                "latency_avg": r.latency_avg,
+                "latency_max": r.latency_max,
+                "jitter": r.jitter,
+                "packet_loss_percent": r.packet_loss_percent,
+                "is_reachable": r.outages < r.measurements,
+            }
+            for r in records
+        ]
+
+    def rollup_hourly(self) -> int:
+        """
+        Aggregate complete hours of ping_history into ping_history_hourly.
+
+        Returns:
+            Number of hourly buckets written
+        """
+        result = self.db.execute(ROLLUP_HOURLY_SQL)
+        self.db.commit()
+        return result.rowcount
+
     def get_statistics(
         self,
         target: str,
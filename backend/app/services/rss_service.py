@@ -7,12 +7,13 @@ import httpx
 import ssl
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from time import mktime
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
-from app.models.rss_article import RssArticle
+from app.models.rss_article import RssArticle, RssArticleDTO
+from app.models.widget import Widget
 
 logger = logging.getLogger(__name__)
 
@@ -199,9 +200,7 @@ class RssService:
                     author=entry["author"],
                     image_url=entry["image_url"],
                     published_at=entry["published"],
-                    fetched_at=datetime.utcnow(),
-                    is_read=False,
-                    is_archived=False
+                    status=RssArticle.STATUS_UNREAD,
                 )
                 db.add(article)
                 stats["new_articles"] += 1
@@ -220,15 +219,15 @@ class RssService:
         db: Session,
         widget_id: int,
         limit: int = 50
-    ) -> List[RssArticle]:
+    ) -> List[RssArticleDTO]:
         """Get unread, non-archived articles for a widget."""
-        return db.query(RssArticle).filter(
+        rows = db.query(*RssArticleDTO.COLUMNS).filter(
             and_(
                 RssArticle.widget_id == widget_id,
-                RssArticle.is_read == False,
-                RssArticle.is_archived == False
+                RssArticle.status == RssArticle.STATUS_UNREAD
             )
         ).order_by(RssArticle.published_at.desc().nullslast()).limit(limit).all()
+        return [RssArticleDTO.from_row(row) for row in rows]
 
     @staticmethod
     def get_archived_articles(
@@ -236,24 +235,22 @@ class RssService:
         widget_id: int,
         limit: int = 100,
         offset: int = 0
-    ) -> List[RssArticle]:
+    ) -> List[RssArticleDTO]:
         """Get archived articles for a widget."""
-        return db.query(RssArticle).filter(
+        rows = db.query(*RssArticleDTO.COLUMNS).filter(
             and_(
                 RssArticle.widget_id == widget_id,
-                RssArticle.is_archived == True
+                RssArticle.status == RssArticle.STATUS_ARCHIVED
             )
         ).order_by(RssArticle.read_at.desc().nullslast()).offset(offset).limit(limit).all()
+        return [RssArticleDTO.from_row(row) for row in rows]
 
     @staticmethod
-    def mark_as_read(db: Session, article_id: int) -> Optional[RssArticle]:
-        """Mark an article as read and archive it."""
-        article = db.query(RssArticle).filter(RssArticle.id == article_id).first()
-        if article:
-            article.mark_as_read()
-            db.commit()
-            db.refresh(article)
-        return article
+    def mark_as_read(db: Session, article_id: int) -> bool:
+        """Mark an article as read and archive it. Returns False if it doesn't exist."""
+        count = RssArticle.mark_read(db, [article_id])
+        db.commit()
+        return count > 0
 
     @staticmethod
     def mark_all_as_read(db: Session, widget_id: int) -> int:
@@ -262,12 +259,11 @@ class RssService:
         count = db.query(RssArticle).filter(
             and_(
                 RssArticle.widget_id == widget_id,
-                RssArticle.is_read == False
+                RssArticle.status == RssArticle.STATUS_UNREAD
             )
         ).update({
-            "is_read": True,
+            "status": RssArticle.STATUS_ARCHIVED,
             "read_at": now,
-            "is_archived": True,
             "archived_at": now
         })
         db.commit()
@@ -286,9 +282,10 @@ class RssService:
             Number of deleted articles
         """
         cutoff_date = datetime.utcnow() - timedelta(days=months * 30)
+        # status = 2 matches the predicate of ix_rss_articles_archive_purge
         count = db.query(RssArticle).filter(
             and_(
-                RssArticle.is_archived == True,
+                RssArticle.status == RssArticle.STATUS_ARCHIVED,
                 RssArticle.archived_at < cutoff_date
             )
         ).delete()
@@ -298,21 +295,11 @@ class RssService:
 
     @staticmethod
     def get_article_count(db: Session, widget_id: int) -> Dict[str, int]:
-        """Get article counts for a widget."""
-        unread = db.query(RssArticle).filter(
-            and_(
-                RssArticle.widget_id == widget_id,
-                RssArticle.is_read == False,
-                RssArticle.is_archived == False
-            )
-        ).count()
-
-        archived = db.query(RssArticle).filter(
-            and_(
-                RssArticle.widget_id == widget_id,
-                RssArticle.is_archived == True
-            )
-        ).count()
+        """Get article counts for a widget (from the counters kept on the widget row)."""
+        counts = db.query(Widget.rss_unread_count, Widget.rss_archived_count).filter(
+            Widget.id == widget_id
+        ).first()
+        unread, archived = counts if counts else (0, 0)
 
         return {
             "unread": unread,
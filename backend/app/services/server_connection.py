@@ -4,7 +4,7 @@ Provides utilities to get SSH credentials from a Server model.
 """
 
 from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.models.server import Server
 
@@ -63,7 +63,7 @@ def get_server_connection(
 
     if server_id:
         # Get credentials from server
-        server = db.query(Server).filter(Server.id == server_id).first()
+        server = db.query(Server).options(undefer_group("credentials")).filter(Server.id == server_id).first()
         if server:
             return ServerConnectionConfig(
                 host=server.host,
@@ -111,7 +111,7 @@ def merge_server_config(
     if not server_id:
         return config
 
-    server = db.query(Server).filter(Server.id == server_id).first()
+    server = db.query(Server).options(undefer_group("credentials")).filter(Server.id == server_id).first()
     if not server:
         return config
 
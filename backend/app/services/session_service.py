@@ -9,6 +9,7 @@ from typing import List, Optional
 from user_agents import parse as parse_user_agent
 
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
 from app.models.user_session import UserSession
 
@@ -22,9 +23,9 @@ class SessionService:
         self.db = db
 
     @staticmethod
-    def hash_token(token: str) -> str:
-        """Create SHA256 hash of a token."""
-        return hashlib.sha256(token.encode()).hexdigest()
+    def hash_token(token: str) -> bytes:
+        """Create SHA256 hash of a token (raw 32-byte digest)."""
+        return hashlib.sha256(token.encode()).digest()
 
     @staticmethod
     def parse_device_info(user_agent_str: Optional[str]) -> str:
@@ -112,7 +113,7 @@ class SessionService:
             return None
 
         # Update last activity
-        session.last_activity = datetime.utcnow()
+        session.last_activity = func.now()
         self.db.commit()
 
         return session
@@ -0,0 +1,94 @@
+"""
+App template helpers.
+- Query helpers used by the template endpoints (loader options in one place).
+- Builtin template validation, run once per process.
+- Download counter: downloads are counted in Redis (HINCRBY) and flushed to
+  the database periodically, so installing a template doesn't write to app_templates.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, Query, load_only
+
+from app.core.database import SessionLocal
+from app.models import AppTemplate, BUILTIN_TEMPLATE_SLUGS, get_builtin_template
+from app.schemas.app_dashboard import validate_template_definition
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Columns needed by AppTemplateListItem (list views don't need blocks/config_schema)
+TEMPLATE_LIST_COLUMNS = (
+    AppTemplate.id, AppTemplate.name, AppTemplate.slug, AppTemplate.description,
+    AppTemplate.icon, AppTemplate.version, AppTemplate.author,
+    AppTemplate.is_builtin, AppTemplate.is_community, AppTemplate.downloads,
+)
+
+
+def query_templates(db: Session) -> Query:
+    """Query full templates."""
+    return db.query(AppTemplate)
+
+
+def query_template_list(db: Session) -> Query:
+    """Query templates for list views: only the list columns."""
+    return db.query(AppTemplate).options(load_only(*TEMPLATE_LIST_COLUMNS))
+
+
+@lru_cache(maxsize=None)
+def validate_builtin_templates() -> None:
+    """
+    Validate the builtin templates against the template schemas.
+    Cached, so only the first call per process does the work.
+    """
+    for slug in BUILTIN_TEMPLATE_SLUGS:
+        validate_template_definition(get_builtin_template(slug))
+
+
+# ============== Download counter ==============
+
+async def record_template_download(db: Session, template: AppTemplate):
+    """Count one download of a template (write-behind through Redis when available)."""
+    if await cache_service.incr_template_downloads(template.id):
+        return
+
+    # Redis unavailable: fall back to a direct increment
+    db.execute(
+        update(AppTemplate)
+        .where(AppTemplate.id == template.id)
+        .values(downloads=AppTemplate.downloads + 1)
+    )
+    db.commit()
+
+
+async def get_pending_template_downloads() -> Dict[int, int]:
+    """Get downloads counted in Redis but not yet flushed to the database."""
+    return await cache_service.get_template_downloads()
+
+
+async def flush_template_downloads():
+    """Background task to apply pending download counts to the database in one transaction."""
+    pending = await cache_service.pop_template_downloads()
+    if not pending:
+        return
+
+    db = SessionLocal()
+    try:
+        for template_id, delta in pending.items():
+            db.execute(
+                update(AppTemplate)
+                .where(AppTemplate.id == template_id)
+                .values(downloads=AppTemplate.downloads + delta)
+            )
+        db.commit()
+        logger.info(f"Flushed download counts for {len(pending)} templates")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Template downloads flush failed: {e}")
+        # Put the counts back so the next flush retries them
+        await cache_service.restore_template_downloads(pending)
+    finally:
+        db.close()
@@ -8,6 +8,7 @@ import json
 import logging
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
@@ -18,6 +19,64 @@ from app.services.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
+_TEMPLATE_VAR_RE = re.compile(r"\{\{([^}]+)\}\}")
+
+
+def strip_nul(value: Any) -> Any:
+    """
+    Replace NUL characters in the strings (and keys) of a parsed JSON value:
+    PostgreSQL JSONB rejects the \\u0000 escape, which plain JSON accepts.
+    """
+    if isinstance(value, str):
+        return value.replace("\x00", "\ufffd") if "\x00" in value else value
+    if isinstance(value, dict):
+        return {strip_nul(k): strip_nul(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [strip_nul(v) for v in value]
+    return value
+
+
+@lru_cache(maxsize=512)
+def compile_webhook_template(
+    template: str,
+) -> Tuple[Tuple[str, Optional[Tuple[str, ...]], Optional[str]], ...]:
+    """
+    Split a title/message template into (literal, variable path, default) segments,
+    once per distinct template: `{{a.b or 'x'}}` gives (..., ("a", "b"), "x").
+    The last segment has no variable (path is None).
+    """
+    segments = []
+    position = 0
+    for match in _TEMPLATE_VAR_RE.finditer(template):
+        expr = match.group(1).strip()
+        default = None
+        # Handle "or" expressions: {{var or 'default'}}
+        if " or " in expr:
+            expr, default = expr.split(" or ", 1)
+            expr = expr.strip()
+            default = default.strip().strip("'\"")
+        segments.append((template[position:match.start()], tuple(expr.split(".")), default))
+        position = match.end()
+    segments.append((template[position:], None, None))
+    return tuple(segments)
+
+
+def _get_nested_value(obj: Any, path: Tuple[str, ...]) -> Any:
+    """Get value from nested dict following a dotted path."""
+    current = obj
+    for part in path:
+        if isinstance(current, dict):
+            current = current.get(part, "")
+        else:
+            return ""
+    return current if current is not None else ""
+
+
+# The built-in templates are known upfront: compile them at import
+for _template in WEBHOOK_TEMPLATES.values():
+    compile_webhook_template(_template["title_template"])
+    compile_webhook_template(_template["message_template"])
+
 
 class WebhookService:
     """Service for processing incoming webhooks."""
@@ -145,7 +204,7 @@ class WebhookService:
     def render_template(self, template: str, data: Dict[str, Any]) -> str:
         """
         Render a template string with data.
-        Supports {{variable}} and {{nested.variable}} syntax.
+        Supports {{variable}}, {{nested.variable}} and {{variable or 'default'}} syntax.
 
         Args:
             template: Template string
@@ -157,30 +216,17 @@ class WebhookService:
         if not template:
             return ""
 
-        def get_nested_value(obj: Any, path: str) -> Any:
-            """Get value from nested dict using dot notation."""
-            parts = path.split(".")
-            current = obj
-            for part in parts:
-                if isinstance(current, dict):
-                    current = current.get(part, "")
-                else:
-                    return ""
-            return current if current is not None else ""
-
-        def replace_var(match):
-            expr = match.group(1).strip()
-            # Handle "or" expressions: {{var or 'default'}}
-            if " or " in expr:
-                var, default = expr.split(" or ", 1)
-                var = var.strip()
-                default = default.strip().strip("'\"")
-                value = get_nested_value(data, var)
-                return str(value) if value else default
-            return str(get_nested_value(data, expr))
-
-        pattern = r"\{\{([^}]+)\}\}"
-        return re.sub(pattern, replace_var, template)
+        parts = []
+        for literal, path, default in compile_webhook_template(template):
+            parts.append(literal)
+            if path is None:
+                continue
+            value = _get_nested_value(data, path)
+            if default is not None:
+                parts.append(str(value) if value else default)
+            else:
+                parts.append(str(value))
+        return "".join(parts)
 
     async def process_webhook(
         self,
@@ -206,6 +252,10 @@ class WebhookService:
         alert = None
         error_message = None
 
+        # Stored as JSONB, which can't hold NUL characters
+        payload = strip_nul(payload)
+        headers = strip_nul(headers)
+
         # Detect event type
         event_type = self.detect_event_type(webhook, headers, payload)
 
@@ -281,11 +281,13 @@ class WebSocketManager:
             if widget_type in self._type_subscribers:
                 clients_to_notify.update(self._type_subscribers[widget_type])
 
-            # Send to all subscribed clients
-            for client_id in clients_to_notify:
-                client = self._clients.get(client_id)
-                if client:
-                    await self._send_to_client(client, message)
+            # Send to all subscribed clients (serialized once for all of them)
+            if clients_to_notify:
+                payload = self._serialize(message)
+                for client_id in clients_to_notify:
+                    client = self._clients.get(client_id)
+                    if client:
+                        await self._send_text_to_client(client, payload)
 
         if clients_to_notify:
             logger.debug(
@@ -324,10 +326,12 @@ class WebSocketManager:
             if widget_type in self._type_subscribers:
                 clients_to_notify.update(self._type_subscribers[widget_type])
 
-            for client_id in clients_to_notify:
-                client = self._clients.get(client_id)
-                if client:
-                    await self._send_to_client(client, message)
+            if clients_to_notify:
+                payload = self._serialize(message)
+                for client_id in clients_to_notify:
+                    client = self._clients.get(client_id)
+                    if client:
+                        await self._send_text_to_client(client, payload)
 
     async def handle_message(self, client_id: str, message: str):
         """
@@ -372,10 +376,23 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error handling message from {client_id}: {e}")
 
+    @staticmethod
+    def _serialize(message: Dict[str, Any]) -> str:
+        """
+        Serialize a message once so broadcasts don't re-encode it per client.
+        Frame compression is left to permessage-deflate (negotiated by the server),
+        which is transparent to the browser client.
+        """
+        return json.dumps(message, separators=(",", ":"))
+
     async def _send_to_client(self, client: WebSocketClient, message: Dict[str, Any]):
         """Send a message to a specific client."""
+        await self._send_text_to_client(client, self._serialize(message))
+
+    async def _send_text_to_client(self, client: WebSocketClient, payload: str):
+        """Send an already serialized message to a specific client."""
         try:
-            await client.websocket.send_json(message)
+            await client.websocket.send_text(payload)
         except Exception as e:
             logger.warning(f"Failed to send to client {client.client_id}: {e}")
             # Schedule disconnection
@@ -4,7 +4,7 @@ import { useCallback, useState, useMemo, useRef, useEffect } from 'react';
 import dynamic from 'next/dynamic';
 import { Center, Loader, Box } from '@mantine/core';
 import { DashboardBlock } from '@/types';
-import { CounterBlock, TableBlock, LogsBlock, ActionsBlock, ChartBlock } from './blocks';
+import { CounterBlock, CounterGroupBlock, TableBlock, LogsBlock, ActionsBlock, ChartBlock } from './blocks';
 
 interface LayoutItem {
   i: string;
@@ -85,7 +85,7 @@ function DashboardBlockGridInner({
     w: block.position.w,
     h: block.position.h,
     minW: block.type === 'counter' ? 2 : 3,
-    minH: block.type === 'counter' ? 2 : 3,
+    minH: block.type === 'counter' || block.type === 'counter_group' ? 2 : 3,
     maxW: 12,
     static: !editable,
   })), [blocks, editable]);
@@ -116,6 +116,8 @@ function DashboardBlockGridInner({
     switch (block.type) {
       case 'counter':
         return <CounterBlock key={blockKey} {...commonProps} />;
+      case 'counter_group':
+        return <CounterGroupBlock key={blockKey} {...commonProps} />;
       case 'table':
         return <TableBlock key={blockKey} {...commonProps} />;
       case 'logs':
@@ -61,7 +61,8 @@ export function CounterBlock({ block, serverId, variables }: CounterBlockProps)
 
   // Stabilize references for useCallback
   const blockId = block.id;
-  const command = config.command;
+  // HTTP blocks have no command: their URL identifies the data source instead
+  const command = config.command || config.http?.url;
   const variablesJson = JSON.stringify(variables);
 
   const fetchData = useCallback(async () => {
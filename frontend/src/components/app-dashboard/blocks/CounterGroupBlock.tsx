@@ -0,0 +1,149 @@
+'use client';
+
+import { useEffect, useState, useCallback } from 'react';
+import { Paper, Text, Group, Stack, ThemeIcon, Loader, Tooltip, SimpleGrid } from '@mantine/core';
+import {
+  IconBan,
+  IconAlertTriangle,
+  IconShield,
+  IconShieldCheck,
+  IconShieldOff,
+  IconServer,
+  IconPackage,
+  IconRefresh,
+  IconAlertCircle,
+} from '@tabler/icons-react';
+import { DashboardBlock, CounterGroupItem } from '@/types';
+import { appDashboardApi } from '@/lib/api';
+
+interface CounterGroupBlockProps {
+  block: DashboardBlock;
+  serverId: number;
+  variables: Record<string, string>;
+}
+
+const ICON_MAP: Record<string, React.ComponentType<{ size?: number }>> = {
+  IconBan,
+  IconAlertTriangle,
+  IconShield,
+  IconShieldCheck,
+  IconShieldOff,
+  IconServer,
+  IconPackage,
+};
+
+/**
+ * Several counters fed by a single command.
+ * The command outputs one JSON object; each counter reads its own key.
+ */
+export function CounterGroupBlock({ block, serverId, variables }: CounterGroupBlockProps) {
+  const [values, setValues] = useState<Record<string, unknown> | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+  const [lastRefresh, setLastRefresh] = useState<Date | null>(null);
+
+  const config = block.config;
+  const counters = config.counters || [];
+  const refreshInterval = config.refresh_interval || 30;
+
+  // Stabilize references for useCallback
+  const blockId = block.id;
+  // HTTP blocks have no command: their URL identifies the data source instead
+  const command = config.command || config.http?.url;
+  const variablesJson = JSON.stringify(variables);
+
+  const fetchData = useCallback(async () => {
+    if (!command) return;
+
+    setLoading(true);
+    setError(null);
+
+    try {
+      const vars = JSON.parse(variablesJson);
+      const result = await appDashboardApi.fetchBlockData(block, serverId, vars);
+
+      if (result.success && result.data && typeof result.data === 'object' && !Array.isArray(result.data)) {
+        setValues(result.data as Record<string, unknown>);
+        setLastRefresh(new Date());
+      } else {
+        setError(result.error || 'Réponse invalide');
+      }
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erreur de connexion');
+    } finally {
+      setLoading(false);
+    }
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [blockId, serverId, variablesJson, command]);
+
+  useEffect(() => {
+    fetchData();
+
+    const interval = setInterval(fetchData, refreshInterval * 1000);
+    return () => clearInterval(interval);
+  }, [fetchData, refreshInterval]);
+
+  const renderValue = (counter: CounterGroupItem) => {
+    const color = counter.color || 'blue';
+    if (loading && values === null) {
+      return <Loader size="sm" color={color} />;
+    }
+    if (error) {
+      return (
+        <Tooltip label={error} withArrow>
+          <IconAlertCircle size={20} color="var(--mantine-color-red-6)" />
+        </Tooltip>
+      );
+    }
+    const raw = values?.[counter.key];
+    const value = typeof raw === 'number' ? raw : parseFloat(String(raw));
+    return (
+      <Text size="2rem" fw={700} c={color} style={{ lineHeight: 1 }}>
+        {counter.prefix || ''}
+        {Number.isNaN(value) ? '—' : value.toLocaleString()}
+        {counter.suffix || ''}
+      </Text>
+    );
+  };
+
+  return (
+    <Paper p="md" radius="md" withBorder h="100%">
+      <Stack h="100%" justify="space-between" gap="xs">
+        <SimpleGrid cols={{ base: 2, sm: 3, lg: Math.max(counters.length, 1) }} spacing="md" style={{ flex: 1 }}>
+          {counters.map((counter) => {
+            const IconComponent = counter.icon ? ICON_MAP[counter.icon] || IconServer : IconServer;
+            return (
+              <Stack key={counter.key} gap={4} justify="space-between">
+                <Group justify="space-between" align="flex-start" wrap="nowrap">
+                  <Text size="sm" c="dimmed" fw={500}>
+                    {counter.title}
+                  </Text>
+                  <ThemeIcon variant="light" color={counter.color || 'blue'} size="md" radius="md">
+                    <IconComponent size={16} />
+                  </ThemeIcon>
+                </Group>
+                <Group justify="center" align="center">
+                  {renderValue(counter)}
+                </Group>
+              </Stack>
+            );
+          })}
+        </SimpleGrid>
+
+        <Group justify="space-between" align="center">
+          <Text size="xs" c="dimmed">
+            {lastRefresh ? `Màj: ${lastRefresh.toLocaleTimeString('fr-FR', { hour: '2-digit', minute: '2-digit' })}` : ''}
+          </Text>
+          <Tooltip label="Actualiser">
+            <IconRefresh
+              size={14}
+              style={{ cursor: 'pointer', opacity: loading ? 0.5 : 1 }}
+              onClick={() => !loading && fetchData()}
+              color="var(--mantine-color-dimmed)"
+            />
+          </Tooltip>
+        </Group>
+      </Stack>
+    </Paper>
+  );
+}
@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useState, useCallback, useRef } from 'react';
+import { useEffect, useState, useCallback, useRef, useMemo } from 'react';
 import {
   Paper,
   Text,
@@ -36,6 +36,23 @@ export function LogsBlock({ block, serverId, variables }: LogsBlockProps) {
   const maxLines = config.max_lines || 100;
   const refreshInterval = config.refresh_interval || 10;
   const highlightPatterns = (config.highlight_patterns as HighlightPattern[]) || [];
+  const highlightPatternsJson = JSON.stringify(highlightPatterns);
+
+  // Compile highlight patterns once per config instead of once per line and refresh.
+  // Order is kept: the first matching pattern styles the line.
+  const compiledPatterns = useMemo(() => {
+    const patterns = JSON.parse(highlightPatternsJson) as HighlightPattern[];
+    const compiled: { regex: RegExp; pattern: HighlightPattern }[] = [];
+    for (const pattern of patterns) {
+      try {
+        // No 'g' flag: test() on a global regex is stateful (lastIndex) across lines
+        compiled.push({ regex: new RegExp(pattern.pattern, 'i'), pattern });
+      } catch {
+        // Invalid regex, skip
+      }
+    }
+    return compiled;
+  }, [highlightPatternsJson]);
 
   // Stabilize references for useCallback
   const blockId = block.id;
@@ -85,29 +102,22 @@ export function LogsBlock({ block, serverId, variables }: LogsBlockProps) {
   }, [lines, autoScroll]);
 
   const highlightLine = (line: string): React.ReactNode => {
-    let result: React.ReactNode = line;
-
-    for (const pattern of highlightPatterns) {
-      try {
-        const regex = new RegExp(`(${pattern.pattern})`, 'gi');
-        if (regex.test(line)) {
-          return (
-            <Text
-              component="span"
-              c={pattern.color}
-              fw={pattern.bold ? 700 : 400}
-              style={{ display: 'block' }}
-            >
-              {line}
-            </Text>
-          );
-        }
-      } catch {
-        // Invalid regex, skip
+    for (const { regex, pattern } of compiledPatterns) {
+      if (regex.test(line)) {
+        return (
+          <Text
+            component="span"
+            c={pattern.color}
+            fw={pattern.bold ? 700 : 400}
+            style={{ display: 'block' }}
+          >
+            {line}
+          </Text>
+        );
       }
     }
 
-    return result;
+    return line;
   };
 
   return (
@@ -1,6 +1,6 @@
 'use client';
 
-import { useEffect, useState, useCallback } from 'react';
+import { useEffect, useState, useCallback, useMemo } from 'react';
 import {
   Paper,
   Text,
@@ -62,6 +62,28 @@ const ACTION_ICONS: Record<string, React.ComponentType<{ size?: number }>> = {
   IconShieldPlus,
 };
 
+// Resolve a column key already split into path segments (e.g. ["decisions", "0", "value"])
+function getPathValue(obj: Record<string, unknown>, keys: string[]): unknown {
+  let value: unknown = obj;
+  for (const key of keys) {
+    if (value === null || value === undefined) return undefined;
+    if (Array.isArray(value)) {
+      // Handle array index access (e.g., "decisions.0")
+      const index = parseInt(key, 10);
+      if (!isNaN(index)) {
+        value = value[index];
+      } else {
+        return undefined;
+      }
+    } else if (typeof value === 'object' && value !== null) {
+      value = (value as Record<string, unknown>)[key];
+    } else {
+      return undefined;
+    }
+  }
+  return value;
+}
+
 export function TableBlock({ block, serverId, variables }: TableBlockProps) {
   const [data, setData] = useState<Record<string, unknown>[]>([]);
   const [loading, setLoading] = useState(true);
@@ -88,14 +110,17 @@ export function TableBlock({ block, serverId, variables }: TableBlockProps) {
   });
 
   const config = block.config;
-  const columns = config.columns || [];
+  const columns = useMemo(() => config.columns || [], [config.columns]);
+  // Column keys are split once per config, not once per cell on every render
+  const columnPaths = useMemo(() => columns.map((col) => col.key.split('.')), [columns]);
   const rowActions = config.row_actions || [];
   const headerAction = config.header_action;
   const refreshInterval = config.refresh_interval || 30;
 
   // Stabilize references for useCallback
   const blockId = block.id;
-  const command = config.command;
+  // HTTP blocks have no command: their URL identifies the data source instead
+  const command = config.command || config.http?.url;
   const variablesJson = JSON.stringify(variables);
 
   const fetchData = useCallback(async () => {
@@ -329,28 +354,6 @@ export function TableBlock({ block, serverId, variables }: TableBlockProps) {
   };
 
   // Get nested value from object using dot notation (e.g., "source.ip" or "decisions.0.value")
-  const getNestedValue = (obj: Record<string, unknown>, path: string): unknown => {
-    const keys = path.split('.');
-    let value: unknown = obj;
-    for (const key of keys) {
-      if (value === null || value === undefined) return undefined;
-      if (Array.isArray(value)) {
-        // Handle array index access (e.g., "decisions.0")
-        const index = parseInt(key, 10);
-        if (!isNaN(index)) {
-          value = value[index];
-        } else {
-          return undefined;
-        }
-      } else if (typeof value === 'object' && value !== null) {
-        value = (value as Record<string, unknown>)[key];
-      } else {
-        return undefined;
-      }
-    }
-    return value;
-  };
-
   const formatCellValue = (value: unknown, format?: string): string => {
     if (value === null || value === undefined) return '—';
 
@@ -377,8 +380,8 @@ export function TableBlock({ block, serverId, variables }: TableBlockProps) {
   const filteredData = data.filter((row) => {
     if (!search.trim()) return true;
     const searchLower = search.toLowerCase();
-    return columns.some((col) => {
-      const value = getNestedValue(row, col.key);
+    return columnPaths.some((path) => {
+      const value = getPathValue(row, path);
       return String(value).toLowerCase().includes(searchLower);
     });
   });
@@ -473,10 +476,10 @@ export function TableBlock({ block, serverId, variables }: TableBlockProps) {
             <Table.Tbody>
               {filteredData.map((row, index) => (
                 <Table.Tr key={index}>
-                  {columns.map((col) => (
+                  {columns.map((col, colIndex) => (
                     <Table.Td key={col.key}>
                       <Text size="xs" truncate>
-                        {formatCellValue(getNestedValue(row, col.key), col.format)}
+                        {formatCellValue(getPathValue(row, columnPaths[colIndex]), col.format)}
                       </Text>
                     </Table.Td>
                   ))}
@@ -1,4 +1,5 @@
 export { CounterBlock } from './CounterBlock';
+export { CounterGroupBlock } from './CounterGroupBlock';
 export { TableBlock } from './TableBlock';
 export { LogsBlock } from './LogsBlock';
 export { ActionsBlock } from './ActionsBlock';
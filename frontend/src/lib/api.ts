@@ -1318,11 +1318,50 @@ import type {
   ActionButton,
 } from '@/types';
 
+// Block data requests issued within the same short window (dashboard load, blocks
+// sharing a refresh interval) are coalesced into one /block-data/batch call per
+// server and variables, which also shares a single SSH connection server-side.
+const BLOCK_BATCH_DELAY_MS = 10;
+
+interface PendingBlockRequest {
+  block: DashboardBlock;
+  resolve: (data: BlockData) => void;
+  reject: (error: unknown) => void;
+}
+
+const pendingBlockBatches = new Map<string, PendingBlockRequest[]>();
+
+async function flushBlockBatch(key: string, serverId: number, variables: Record<string, string>) {
+  const pending = pendingBlockBatches.get(key) || [];
+  pendingBlockBatches.delete(key);
+
+  try {
+    if (pending.length === 1) {
+      const response = await api.post('/app-dashboard/block-data', {
+        block: pending[0].block,
+        server_id: serverId,
+        variables,
+      });
+      pending[0].resolve(response.data);
+      return;
+    }
+
+    const response = await api.post<BlockData[]>('/app-dashboard/block-data/batch', {
+      blocks: pending.map((request) => request.block),
+      server_id: serverId,
+      variables,
+    });
+    pending.forEach((request, index) => request.resolve(response.data[index]));
+  } catch (error) {
+    pending.forEach((request) => request.reject(error));
+  }
+}
+
 export const appDashboardApi = {
   // Templates
   listTemplates: async (): Promise<AppTemplateListItem[]> => {
     const response = await api.get('/app-dashboard/templates');
-    return response.data;
+    return response.data.items;
   },
 
   getTemplate: async (id: number): Promise<AppTemplate> => {
@@ -1409,12 +1448,16 @@ export const appDashboardApi = {
     serverId: number,
     variables: Record<string, string> = {}
   ): Promise<BlockData> => {
-    const response = await api.post('/app-dashboard/block-data', {
-      block,
-      server_id: serverId,
-      variables,
+    const key = `${serverId}:${JSON.stringify(variables)}`;
+    return new Promise<BlockData>((resolve, reject) => {
+      const pending = pendingBlockBatches.get(key);
+      if (pending) {
+        pending.push({ block, resolve, reject });
+        return;
+      }
+      pendingBlockBatches.set(key, [{ block, resolve, reject }]);
+      setTimeout(() => flushBlockBatch(key, serverId, variables), BLOCK_BATCH_DELAY_MS);
     });
-    return response.data;
   },
 
   // Dashboard Tabs
@@ -150,13 +150,31 @@ export interface HeaderAction {
   confirm_message?: string;
 }
 
+export interface HttpRequestConfig {
+  method?: string;
+  url: string;
+  headers?: Record<string, string>;
+  body?: string;
+  json_path?: string;
+}
+
+export interface CounterGroupItem {
+  key: string;
+  title: string;
+  icon?: string;
+  color?: string;
+  suffix?: string;
+  prefix?: string;
+}
+
 export interface DashboardBlock {
   id: string;
-  type: 'counter' | 'table' | 'chart' | 'logs' | 'actions';
+  type: 'counter' | 'counter_group' | 'table' | 'chart' | 'logs' | 'actions';
   title: string;
   position: BlockPosition;
   config: {
     command?: string;
+    http?: HttpRequestConfig;
     parser?: 'raw' | 'json' | 'number' | 'lines' | 'table';
     refresh_interval?: number;
     icon?: string;
@@ -167,6 +185,7 @@ export interface DashboardBlock {
     row_actions?: RowAction[];
     header_action?: HeaderAction;
     buttons?: ActionButton[];
+    counters?: CounterGroupItem[];
     max_lines?: number;
     highlight_patterns?: HighlightPattern[];
     chart_type?: 'line' | 'bar' | 'pie' | 'doughnut' | 'area';